@@ -28,3 +28,11 @@ keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', '2'))
 
 forwarded_allow_ips = '*'  # pylint: disable=invalid-name
 secure_scheme_headers = {'X-Forwarded-Proto': 'https'}  # pylint: disable=invalid-name
+
+
+def post_fork(server, worker):  # pylint: disable=unused-argument
+    """Let the database waits of the gevent workers yield to their other requests"""
+    if worker_class == 'gevent':
+        from api.utils.gevent_support import patch_psycopg  # pylint: disable=import-outside-toplevel
+
+        patch_psycopg()
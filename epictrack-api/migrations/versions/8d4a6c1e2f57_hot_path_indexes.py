@@ -0,0 +1,43 @@
+"""indexes for the hot filter paths
+
+Revision ID: 8d4a6c1e2f57
+Revises: 5b2d8e4f9a13
+Create Date: 2026-10-17 15:22:09.118374
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d4a6c1e2f57'
+down_revision = '5b2d8e4f9a13'
+branch_labels = None
+depends_on = None
+
+# Written the way the queries filter, the planner does not match 'is_active' with 'is_active IS TRUE'
+ACTIVE = sa.text('is_active IS TRUE AND is_deleted IS FALSE')
+
+# (name, table, columns, partial index predicate). A partial index on the same columns as a full one
+# would only save the filter of a few rows per work, while every write pays for both.
+INDEXES = [
+    ('ix_works_active_work_state', 'works', ['work_state'], ACTIVE),
+    ('ix_events_work_id', 'events', ['work_id'], None),
+    ('ix_events_date', 'events', [sa.text('COALESCE(actual_date, anticipated_date)')], None),
+    ('ix_event_configurations_work_phase_id', 'event_configurations', ['work_phase_id', 'event_category_id'], None),
+    ('ix_event_configurations_event_type_id', 'event_configurations', ['event_type_id'], None),
+    ('ix_work_phases_work_id', 'work_phases', ['work_id', 'sort_order'], None),
+    ('ix_staff_work_roles_work_id', 'staff_work_roles', ['work_id'], None),
+    ('ix_staff_work_roles_staff_id', 'staff_work_roles', ['staff_id'], None),
+    ('ix_work_statuses_work_id', 'work_statuses', ['work_id', 'posted_date'], None),
+]
+
+
+def upgrade():
+    for name, table, columns, where in INDEXES:
+        op.create_index(name, table, columns, unique=False, postgresql_where=where)
+
+
+def downgrade():
+    for name, table, _, _ in INDEXES:
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,31 @@
+"""index for the keyset pagination of the work plan dashboard
+
+Revision ID: c3e7a9b1d5f2
+Revises: 8d4a6c1e2f57
+Create Date: 2026-10-17 18:04:51.327615
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e7a9b1d5f2'
+down_revision = '8d4a6c1e2f57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Matches the default order of the dashboard, so each page seeks to its cursor
+    op.create_index(
+        'ix_works_start_date_id',
+        'works',
+        [sa.text('start_date DESC NULLS LAST'), sa.text('id DESC')],
+        unique=False,
+        postgresql_where=sa.text('is_deleted IS FALSE'),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_works_start_date_id', table_name='works')
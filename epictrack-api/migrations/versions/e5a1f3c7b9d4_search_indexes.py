@@ -0,0 +1,58 @@
+"""full text search indexes and the normalized work title
+
+Revision ID: e5a1f3c7b9d4
+Revises: c3e7a9b1d5f2
+Create Date: 2026-10-17 19:12:36.480273
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a1f3c7b9d4'
+down_revision = 'c3e7a9b1d5f2'
+branch_labels = None
+depends_on = None
+
+# The expressions must match api.models.search.search_document for the planner to use the indexes
+# (name, table, search document)
+SEARCH_INDEXES = [
+    ('ix_projects_search', 'projects', "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(abbreviation, ''))"),
+    ('ix_works_search', 'works', "to_tsvector('simple', coalesce(normalized_title, ''))"),
+    ('ix_proponents_search', 'proponents', "to_tsvector('simple', coalesce(name, ''))"),
+    (
+        'ix_staffs_search',
+        'staffs',
+        "to_tsvector('simple', coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || coalesce(email, ''))",
+    ),
+]
+
+
+def upgrade():
+    op.add_column('works', sa.Column('normalized_title', sa.String(), nullable=True))
+    op.add_column('works_history', sa.Column('normalized_title', sa.String(), nullable=True))
+    op.execute(
+        """
+        UPDATE works SET normalized_title = lower(trim(concat(p.name, ' - ', wt.name, ' - ', works.simple_title)))
+        FROM projects p, work_types wt
+        WHERE p.id = works.project_id AND wt.id = works.work_type_id
+        """
+    )
+    op.create_index(
+        'ix_works_normalized_title',
+        'works',
+        ['normalized_title'],
+        unique=False,
+        postgresql_where=sa.text('is_deleted IS FALSE'),
+    )
+    for name, table, document in SEARCH_INDEXES:
+        op.create_index(name, table, [sa.text(document)], unique=False, postgresql_using='gin')
+
+
+def downgrade():
+    for name, table, _ in SEARCH_INDEXES:
+        op.drop_index(name, table_name=table)
+    op.drop_index('ix_works_normalized_title', table_name='works')
+    op.drop_column('works_history', 'normalized_title')
+    op.drop_column('works', 'normalized_title')
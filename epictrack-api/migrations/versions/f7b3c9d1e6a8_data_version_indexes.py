@@ -0,0 +1,41 @@
+"""indexes for the data version of the reports and insights
+
+Revision ID: f7b3c9d1e6a8
+Revises: e5a1f3c7b9d4
+Create Date: 2026-10-17 21:04:52.613907
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7b3c9d1e6a8'
+down_revision = 'e5a1f3c7b9d4'
+branch_labels = None
+depends_on = None
+
+# The data version reads the latest updated_at of each source table on every report and
+# insight request, the tables growing with the works are indexed so it reads one entry of each
+TABLES = [
+    'works',
+    'events',
+    'event_configurations',
+    'work_phases',
+    'projects',
+    'staffs',
+    'staff_work_roles',
+    'work_statuses',
+    'work_issues',
+    'special_fields',
+    'indigenous_works',
+]
+
+
+def upgrade():
+    for table in TABLES:
+        op.create_index(f'ix_{table}_updated_at', table, ['updated_at'], unique=False)
+
+
+def downgrade():
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_updated_at', table_name=table)
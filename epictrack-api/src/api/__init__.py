@@ -33,7 +33,9 @@ from api.utils.auth import jwt
 from api.utils.caching import AppCache
 from api.utils.json_encoder import CustomJSONEncoder
 from api.utils.logging import setup_logging
+from api.utils.metrics import setup_metrics
 from api.utils.run_version import get_run_version
+from api.utils.statement_timeout import statement_timeout_session
 
 
 setup_logging(os.path.join(_Config.PROJECT_ROOT, 'logging.conf'))
@@ -47,11 +49,16 @@ def create_app(run_mode=os.getenv('FLASK_ENV', 'production')):
     app.json_provider_class = CustomJSONEncoder
 
     db.init_app(app)
+    statement_timeout_session(db.session)
+    setup_metrics(app)
 
     if run_mode != 'migration':
         AppCache.configure_cache(run_mode, app)
         # pylint: disable=import-outside-toplevel
         from api.resources import API_BLUEPRINT, OPS_BLUEPRINT
+        from api.services.work_phase_summary import work_phase_summary_session
+
+        work_phase_summary_session(db.session)
 
         app.register_blueprint(API_BLUEPRINT)
         app.register_blueprint(OPS_BLUEPRINT)
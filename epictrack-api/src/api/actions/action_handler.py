@@ -1,35 +1,38 @@
 """Handles action handlers"""
+from functools import lru_cache
 from importlib import import_module
+from typing import Dict, Type
 
 from api.actions.base import ACTION_HANDLER_CLASS_MAPS, ActionFactory
-from api.exceptions import UnprocessableEntityError
+from api.actions.context import ActionContext
 from api.models.action import ActionEnum
 from api.models.event import Event
 
 
+@lru_cache(maxsize=None)
+def get_action_handler_classes() -> Dict[ActionEnum, Type[ActionFactory]]:
+    """Return the handler classes of the actions, imported on first use and resolved only once"""
+    action_module = import_module("api.actions")
+    return {
+        action: getattr(action_module, action_class_name)
+        for action, action_class_name in ACTION_HANDLER_CLASS_MAPS.items()
+    }
+
+
 class ActionHandler:  # pylint: disable=too-few-public-methods
     """Handles action handlers"""
 
     def __init__(self, action_class_enum: ActionEnum) -> None:
         """Initialize and configure the action handler class"""
-        action_classes_path = "api.actions"
-        try:
-            action_class_name = ACTION_HANDLER_CLASS_MAPS[action_class_enum]
-            action_module = import_module(action_classes_path)
-            self.action_class: ActionFactory = getattr(action_module, action_class_name)
-        except (ModuleNotFoundError, KeyError):
+        self.action_class = get_action_handler_classes().get(action_class_enum)
+        if self.action_class is None:
             print(f"{action_class_enum.name} action handler module not found")
-            self.action_class = None
-        except AttributeError as e:
-            raise UnprocessableEntityError(
-                f"Action class {action_class_name} not configured properly."
-            ) from e
-
-    def apply(self, source_event: Event, params: dict = None) -> None:
-        """Perform the action"""
+
+    def apply(self, source_event: Event, params: dict = None, context: ActionContext = None) -> None:
+        """Perform the action, within the context shared by the actions of the outcome if given"""
         # So that actions not done yet won't raise errors
         if self.action_class:
-            self.action_class().run(source_event, params)
+            self.action_class(context).run(source_event, params)
 
     def get_additional_params(self, params: dict) -> None:
         """
@@ -1,10 +1,8 @@
 """Disable work start date action handler"""
 from api.actions.base import ActionFactory
-from api.models import Event, db
+from api.models import Event
 from api.models.event_configuration import EventConfiguration
 from api.models.event_template import EventTemplateVisibilityEnum
-from api.models.phase_code import PhaseCode
-from api.models.work_phase import WorkPhase
 from api.schemas.response.event_configuration_response import (
     EventConfigurationResponseSchema,
 )
@@ -35,7 +33,9 @@ class AddEvent(ActionFactory):
             new_event = EventService.create_event(
                 event_data, work_phase_id=work_phase_id, push_events=True, commit=False
             )
-            set_event_date: SetEventDate = SetEventDate()
+            # So that the actions find the new configuration and event
+            self.context.reload()
+            set_event_date: SetEventDate = SetEventDate(self.context)
             # Setting the event date from here cz, otherwise the event won't get pushed
             set_event_date.run(source_event, param)
             source_event = new_event
@@ -44,30 +44,11 @@ class AddEvent(ActionFactory):
         """Returns additional parameter"""
         from api.services.work import WorkService
 
-        work_phase = (
-            db.session.query(WorkPhase)
-            .join(PhaseCode, WorkPhase.phase_id == PhaseCode.id)
-            .filter(
-                WorkPhase.work_id == source_event.work_id,
-                PhaseCode.name == params.get("phase_name"),
-                PhaseCode.work_type_id == params.get("work_type_id"),
-                PhaseCode.ea_act_id == params.get("ea_act_id"),
-                WorkPhase.is_active.is_(True),
-                PhaseCode.is_active.is_(True),
-            )
-            .order_by(WorkPhase.sort_order.desc())
-            .first()
-        )
-        old_event_config = (
-            db.session.query(EventConfiguration)
-            .filter(
-                EventConfiguration.work_phase_id == work_phase.id,
-                EventConfiguration.name == params.get("event_name"),
-                EventConfiguration.is_active.is_(True),
-            )
-            .order_by(EventConfiguration.repeat_count.desc())
-            .first()
+        context = self.work_context(source_event)
+        work_phase = context.find_work_phase(
+            params, by_phase_code_name=True, regular=False
         )
+        old_event_config = context.find_configuration(params, work_phase)
 
         event_configuration = EventConfigurationResponseSchema().dump(old_event_config)
         event_configuration["start_at"] = params["start_at"]
@@ -79,7 +60,6 @@ class AddEvent(ActionFactory):
         WorkService.copy_outcome_and_actions(
             old_event_config.as_dict(recursive=False),
             event_configuration,
-            from_template=False,
         )
         event_data = {
             "event_configuration_id": event_configuration.id,
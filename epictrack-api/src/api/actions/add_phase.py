@@ -3,18 +3,16 @@
 from datetime import timedelta
 from typing import List
 from operator import attrgetter
-from sqlalchemy import and_
 
 from api.actions.base import ActionFactory
-from api.models import Event, EventConfiguration, WorkPhase, Work, db
+from api.actions.context import ActionContext
+from api.models import Event, EventConfiguration, WorkPhase, db
 from api.models.phase_code import PhaseCode, PhaseVisibilityEnum
 from api.models.event_template import (
     EventTemplateVisibilityEnum,
     EventPositionEnum,
 )
 from api.models.event_category import PRIMARY_CATEGORIES
-from api.services.event_template import EventTemplateService
-from api.schemas import response as res
 
 
 # pylint: disable= import-outside-toplevel, too-many-locals
@@ -24,7 +22,7 @@ class AddPhase(ActionFactory):
     def run(self, source_event: Event, params) -> None:
         """Adds a new phase based on params"""
         # Importing here to avoid circular imports
-        from api.services.work import WorkService
+        from api.services.template_instantiation import TemplateInstantiation
         from api.services.work_phase import WorkPhaseService
 
         number_of_phases = len(params)
@@ -36,6 +34,8 @@ class AddPhase(ActionFactory):
         )
         sort_order = source_event.event_configuration.work_phase.sort_order + 1
         total_number_of_days = 0
+        instantiation = TemplateInstantiation()
+        work_phase = None
         for param in params:
             work_phase_data = self.get_additional_params(source_event, param)
             total_number_of_days = total_number_of_days + work_phase_data.get(
@@ -52,28 +52,24 @@ class AddPhase(ActionFactory):
                     "sort_order": sort_order,
                 }
             )
-            event_templates_for_the_phase = EventTemplateService.find_by_phase_id(
-                work_phase_data.get("phase_id")
-            )
-            event_templates_for_the_phase_json = res.EventTemplateResponseSchema(
-                many=True
-            ).dump(event_templates_for_the_phase)
-            work_phase = WorkService.create_events_by_template(
-                work_phase_data, event_templates_for_the_phase_json
+            work_phase = instantiation.add_phase(
+                work_phase_data, self.find_phase(param).event_templates
             )
             sort_order = sort_order + 1
             phase_start_date = end_date + timedelta(days=1)
+        instantiation.save()
+        # So that the actions find the new phases and their events
+        context = self.work_context(source_event)
+        context.reload()
         # update the current work phase
         current_work_phase = WorkPhaseService.find_current_work_phase(
             source_event.work_id
         )
 
-        work = Work.find_by_id(source_event.work_id)
-        work.current_work_phase_id = current_work_phase.id
-        work.update(work.as_dict(recursive=False), commit=False)
+        context.work.current_work_phase_id = current_work_phase.id
 
         if work_phase:
-            self.update_susequent_work_phases(work_phase)
+            self.update_susequent_work_phases(context, work_phase)
 
     def _get_number_of_days_to_be_added(self, source_event) -> int:
         """Returns the phase start date"""
@@ -96,8 +92,8 @@ class AddPhase(ActionFactory):
                 filtered_configurations, key=attrgetter("sort_order")
             )
             return (
-                int(last_mandatory_configuration.start_at)
-                - int(source_event.event_configuration.start_at)
+                last_mandatory_configuration.compiled_start_at.days()
+                - source_event.event_configuration.compiled_start_at.days()
             ) + 1
         return 1
 
@@ -113,46 +109,36 @@ class AddPhase(ActionFactory):
 
     def update_susequent_work_phases(
         self,
+        context: ActionContext,
         latest_work_phase_added: WorkPhase,
     ):
         """Update subsequent work phases with the number of additional days added by the phases"""
         from api.services.event import EventService
 
         # Find the next work phase after the new work phases
-        next_work_phase = (
-            db.session.query(WorkPhase)
-            .filter(
-                WorkPhase.work_id == latest_work_phase_added.work_id,
-                WorkPhase.sort_order > latest_work_phase_added.sort_order,
-                WorkPhase.visibility == PhaseVisibilityEnum.REGULAR.value,
-                WorkPhase.is_active.is_(True),
-            )
-            .order_by(WorkPhase.sort_order)
-            .first()
+        next_work_phase = next(
+            (
+                work_phase
+                for work_phase in context.regular_work_phases()
+                if work_phase.sort_order > latest_work_phase_added.sort_order
+            ),
+            None,
         )
 
         # Find the start event of the work phase
         if next_work_phase:
-            start_event = (
-                db.session.query(Event)
-                .join(
-                    EventConfiguration,
-                    and_(
-                        Event.event_configuration_id == EventConfiguration.id,
-                        EventConfiguration.is_active.is_(True),
-                        EventConfiguration.visibility
-                        == EventTemplateVisibilityEnum.MANDATORY.value,
-                        EventConfiguration.event_position == EventPositionEnum.START,
-                    ),
-                )
-                .join(
-                    WorkPhase,
-                    and_(
-                        EventConfiguration.work_phase_id == WorkPhase.id,
-                        WorkPhase.id == next_work_phase.id,
-                    ),
-                )
-                .first()
+            start_event = next(
+                (
+                    event
+                    for event in context.events
+                    if event.event_configuration.work_phase_id == next_work_phase.id
+                    and event.event_configuration.is_active
+                    and EventTemplateVisibilityEnum(event.event_configuration.visibility)
+                    == EventTemplateVisibilityEnum.MANDATORY
+                    and EventPositionEnum(event.event_configuration.event_position)
+                    == EventPositionEnum.START
+                ),
+                None,
             )
 
             # Update the start event anticipated date by the number of total days added by all the new phases
@@ -165,19 +151,18 @@ class AddPhase(ActionFactory):
                 start_event_dict, start_event.id, True, commit=False
             )
 
-    def get_additional_params(self, source_event, params):
-        """Returns additional parameter"""
-        query_params = {
-            "name": params.get("phase_name"),
-            "work_type_id": params.get("work_type_id"),
-            "ea_act_id": params.get("ea_act_id"),
-        }
-        phase = (
-            db.session.query(PhaseCode)
-            .filter_by(**query_params, is_active=True)
-            .first()
+    def find_phase(self, params):
+        """Find the phase to add in the compiled templates"""
+        from api.services.template_graph import TemplateGraphService
+
+        graph = TemplateGraphService.find_graph(
+            params.get("ea_act_id"), params.get("work_type_id")
         )
+        return graph.find_phase_by_name(params.get("phase_name"))
 
+    def get_additional_params(self, source_event, params):
+        """Returns additional parameter"""
+        phase = self.find_phase(params)
         work_phase_data = {
             "phase_id": phase.id,
             "name": params.get("new_name"),
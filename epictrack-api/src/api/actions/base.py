@@ -1,6 +1,7 @@
 """Base for all action handlers"""
 from abc import ABC, abstractmethod
 
+from api.actions.context import ActionContext
 from api.models.action import ActionEnum
 from api.models.event import Event
 
@@ -8,6 +9,16 @@ from api.models.event import Event
 class ActionFactory(ABC):  # pylint: disable=too-few-public-methods
     """Base class for action handlers"""
 
+    def __init__(self, context: ActionContext = None) -> None:
+        """Run within the context shared by the actions of the outcome, if any"""
+        self.context = context
+
+    def work_context(self, source_event: Event) -> ActionContext:
+        """Return the shared context, or one of its own for the work of the event"""
+        if self.context is None:
+            self.context = ActionContext(source_event.work_id)
+        return self.context
+
     @abstractmethod
     def run(self, source_event: Event, params: dict) -> None:
         """Perform the action"""
@@ -0,0 +1,139 @@
+"""Work graph shared by the actions of an outcome"""
+from typing import List, Optional
+
+from sqlalchemy.orm import contains_eager, joinedload
+
+from api.models import PRIMARY_CATEGORIES, Event, EventConfiguration, Work, WorkPhase, db
+from api.models.phase_code import PhaseVisibilityEnum
+
+
+class ActionContext:
+    """Phases, event configurations and events of a work, shared by the actions run for an outcome
+
+    The graph is loaded once, on first use, and the actions change the loaded objects
+    instead of reloading and updating the rows on their own. The combined changes are
+    written by a single flush once all the actions have run. Actions adding phases or
+    events reload the graph so that the next actions find the new rows.
+    """
+
+    def __init__(self, work_id: int):
+        """Start with nothing loaded for the work"""
+        self.work_id = work_id
+        self._work_phases: Optional[List[WorkPhase]] = None
+        self._configurations: Optional[List[EventConfiguration]] = None
+        self._events: Optional[List[Event]] = None
+
+    @property
+    def work(self) -> Work:
+        """The work, from the session when already loaded"""
+        return Work.find_by_id(self.work_id)
+
+    @property
+    def work_phases(self) -> List[WorkPhase]:
+        """All the work phases of the work, with their phase codes, in their sort order"""
+        if self._work_phases is None:
+            self._work_phases = (
+                db.session.query(WorkPhase)
+                .options(joinedload(WorkPhase.phase))
+                .filter(WorkPhase.work_id == self.work_id)
+                .order_by(WorkPhase.sort_order, WorkPhase.id)
+                .all()
+            )
+        return self._work_phases
+
+    @property
+    def configurations(self) -> List[EventConfiguration]:
+        """All the event configurations of the work phases, in the order of their ids"""
+        if self._configurations is None:
+            self._configurations = (
+                db.session.query(EventConfiguration)
+                .join(WorkPhase, WorkPhase.id == EventConfiguration.work_phase_id)
+                .filter(WorkPhase.work_id == self.work_id)
+                .order_by(EventConfiguration.id)
+                .all()
+            )
+        return self._configurations
+
+    @property
+    def events(self) -> List[Event]:
+        """All the events of the work with their configurations, in the order of their ids"""
+        if self._events is None:
+            self._events = (
+                db.session.query(Event)
+                .join(EventConfiguration, Event.event_configuration_id == EventConfiguration.id)
+                .options(contains_eager(Event.event_configuration))
+                .filter(Event.work_id == self.work_id)
+                .order_by(Event.id)
+                .all()
+            )
+        return self._events
+
+    def reload(self) -> None:
+        """Load the graph again on next use, once rows have been added to it"""
+        self._work_phases = None
+        self._configurations = None
+        self._events = None
+
+    def flush(self) -> None:
+        """Write the changes made by the actions"""
+        db.session.flush()
+
+    def regular_work_phases(self, include_completed: bool = True) -> List[WorkPhase]:
+        """Active regular work phases in their sort order"""
+        return [
+            work_phase
+            for work_phase in self.work_phases
+            if work_phase.is_active
+            and not work_phase.is_deleted
+            and work_phase.visibility == PhaseVisibilityEnum.REGULAR
+            and (include_completed or not work_phase.is_completed)
+        ]
+
+    def find_work_phase(self, params: dict, by_phase_code_name: bool = False, regular: bool = True) -> WorkPhase:
+        """Latest active work phase matching the phase name, work type and EA act of the params"""
+        candidates = [
+            work_phase
+            for work_phase in self.work_phases
+            if (work_phase.phase.name if by_phase_code_name else work_phase.name) == params.get("phase_name")
+            and work_phase.phase.work_type_id == params.get("work_type_id")
+            and work_phase.phase.ea_act_id == params.get("ea_act_id")
+            and (not regular or work_phase.visibility == PhaseVisibilityEnum.REGULAR)
+            and work_phase.is_active
+            and work_phase.phase.is_active
+        ]
+        return max(candidates, key=lambda work_phase: work_phase.sort_order, default=None)
+
+    def find_configuration(self, params: dict, work_phase: WorkPhase = None) -> EventConfiguration:
+        """Latest active configuration of the event of the params, by default in the regular work phase of the params"""
+        work_phase = work_phase or self.find_work_phase(params)
+        candidates = [
+            configuration
+            for configuration in self.configurations
+            if configuration.work_phase_id == work_phase.id
+            and configuration.name == params.get("event_name")
+            and configuration.is_active
+        ]
+        return max(candidates, key=lambda configuration: configuration.repeat_count, default=None)
+
+    def phase_events(self, work_phase_id: int) -> List[Event]:
+        """Active milestone events of the work phase with active configurations, by actual then anticipated date"""
+        category_ids = [category.value for category in PRIMARY_CATEGORIES]
+        events = [
+            event
+            for event in self.events
+            if event.is_active
+            and event.event_configuration.is_active
+            and event.event_configuration.work_phase_id == work_phase_id
+            and event.event_configuration.event_category_id in category_ids
+        ]
+        return sorted(events, key=_date_order)
+
+
+def _date_order(event: Event) -> tuple:
+    """Order of the events by actual then anticipated date, the missing dates last as in the database"""
+    return (
+        event.actual_date is None,
+        event.actual_date or 0,
+        event.anticipated_date is None,
+        event.anticipated_date or 0,
+    )
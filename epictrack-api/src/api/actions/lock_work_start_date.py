@@ -14,4 +14,3 @@ class LockWorkStartDate(ActionFactory):  # pylint: disable=too-few-public-method
         work.start_date_locked = params.get("start_date_locked")
         start_at = params.get("start_at") if params.get("start_at") else 0
         work.start_date = source_event.actual_date + timedelta(days=start_at)
-        work.update(work.as_dict(recursive=False), commit=False)
@@ -1,10 +1,8 @@
 """Set events status action handler"""
 
 from api.actions.base import ActionFactory
-from api.models import db, PRIMARY_CATEGORIES
-from api.models.event import Event
 
-from .common import find_configuration, deactivate_calendar_events_by_configuration_ids
+from .common import deactivate_calendar_events_by_configuration_ids
 
 
 class SetEventsStatus(ActionFactory):
@@ -14,19 +12,18 @@ class SetEventsStatus(ActionFactory):
         """Sets all future events to INACTIVE"""
         from api.services import EventService  # pylint: disable=import-outside-toplevel
 
+        context = self.work_context(source_event)
         event_configuration_ids = []
         if isinstance(params, list):
             for event_params in params:
-                event_configuration = find_configuration(source_event, event_params)
+                event_configuration = context.find_configuration(event_params)
                 event_configuration_ids.append(event_configuration.id)
-                db.session.query(Event).filter(
-                    Event.event_configuration_id == event_configuration.id
-                ).update({Event.is_active: event_params.get("is_active")})
+                for event in context.events:
+                    if event.event_configuration_id == event_configuration.id:
+                        event.is_active = event_params.get("is_active")
         elif params.get("all_future_events") is not None:
-            events = EventService.find_events(
-                source_event.work_id,
-                source_event.event_configuration.work_phase_id,
-                PRIMARY_CATEGORIES,
+            events = context.phase_events(
+                source_event.event_configuration.work_phase_id
             )
             event_index = EventService.find_event_index(
                 events, source_event, source_event.event_configuration.work_phase
@@ -35,6 +32,5 @@ class SetEventsStatus(ActionFactory):
             for event in events_to_be_updated:
                 event_configuration_ids.append(event.event_configuration_id)
                 event.is_active = False
-                event.update(event.as_dict(recursive=False), commit=False)
         # Deactivate all child events (Calendar events at this point) of the main event
-        deactivate_calendar_events_by_configuration_ids(event_configuration_ids)
+        deactivate_calendar_events_by_configuration_ids(context, event_configuration_ids)
@@ -11,4 +11,3 @@ class SetProjectState(ActionFactory):
         """Sets the federal involvement field to None"""
         project = Project.find_by_id(source_event.work.project_id)
         project.project_state = ProjectStateEnum(params.get("project_state"))
-        project.update(project.as_dict(recursive=False), commit=False)
@@ -19,4 +19,3 @@ class SetWorkDecisionMaker(ActionFactory):  # pylint: disable=too-few-public-met
         work = Work.find_by_id(source_event.work_id)
         work.decision_by_id = staff[0].id
         work.decision_maker_position_id = params.get("position_id")
-        work.update(work.as_dict(recursive=False), commit=False)
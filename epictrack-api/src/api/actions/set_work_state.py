@@ -1,8 +1,7 @@
 """Set work state action handler"""
 
 from api.actions.base import ActionFactory
-from api.models import db
-from api.models.work import Work, WorkStateEnum, EndingWorkStateEnum
+from api.models.work import WorkStateEnum, EndingWorkStateEnum
 from .change_phase_end_event import ChangePhaseEndEvent
 
 
@@ -16,7 +15,7 @@ class SetWorkState(ActionFactory):
             WorkStateEnum.TERMINATED.value,
             WorkStateEnum.WITHDRAWN.value,
         ]:
-            change_phase_end_event = ChangePhaseEndEvent()
+            change_phase_end_event = ChangePhaseEndEvent(self.work_context(source_event))
             change_phase_end_event_param = {
                 "phase_name": source_event.event_configuration.work_phase.name,
                 "work_type_id": source_event.work.work_type_id,
@@ -27,6 +26,6 @@ class SetWorkState(ActionFactory):
         is_active = True
         if work_state in [state.value for state in EndingWorkStateEnum]:
             is_active = False
-        db.session.query(Work).filter(Work.id == source_event.work_id).update(
-            {Work.work_state: work_state, Work.is_active: is_active}
-        )
+        work = self.work_context(source_event).work
+        work.work_state = WorkStateEnum(work_state)
+        work.is_active = is_active
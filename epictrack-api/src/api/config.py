@@ -90,6 +90,27 @@ class _Config():  # pylint: disable=too-few-public-methods
     SQLALCHEMY_DATABASE_URI = f'postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{int(DB_PORT)}/{DB_NAME}'
     SQLALCHEMY_ECHO = _get_config('SQLALCHEMY_ECHO', default='False').lower() == 'true'
 
+    # Connection pool of each worker process. Under gevent every greenlet of the worker shares it,
+    # so pool_size + max_overflow bounds the concurrent queries of a worker, not its connections.
+    DB_POOL_SIZE = int(_get_config('DATABASE_POOL_SIZE', default=5))
+    DB_MAX_OVERFLOW = int(_get_config('DATABASE_MAX_OVERFLOW', default=10))
+    # Seconds a request waits for a connection before failing, rather than piling up behind a saturated pool
+    DB_POOL_TIMEOUT = int(_get_config('DATABASE_POOL_TIMEOUT', default=10))
+    # Seconds after which a connection is replaced, to stay under the idle timeouts of proxies and firewalls
+    DB_POOL_RECYCLE = int(_get_config('DATABASE_POOL_RECYCLE', default=1800))
+    DB_POOL_PRE_PING = _get_config('DATABASE_POOL_PRE_PING', default='True').lower() == 'true'
+    # Milliseconds a statement of a request may run before the database cancels it, 0 to disable.
+    # The default cancels the queries of a request before the worker timeout of gunicorn kills it,
+    # the report jobs are bounded by REPORT_JOB_TIMEOUT instead.
+    DB_STATEMENT_TIMEOUT = int(_get_config('DATABASE_STATEMENT_TIMEOUT', default=55000))
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_pre_ping': DB_POOL_PRE_PING,
+    }
+
     # JWT_OIDC Settings
     JWT_OIDC_WELL_KNOWN_CONFIG = _get_config('JWT_OIDC_WELL_KNOWN_CONFIG')
     JWT_OIDC_ALGORITHMS = _get_config('JWT_OIDC_ALGORITHMS')
@@ -109,8 +130,30 @@ class _Config():  # pylint: disable=too-few-public-methods
     TESTING = False
     DEBUG = True
 
-    CACHE_TYPE = constants.CACHE_TYPE
+    # Use a shared backend (RedisCache or FileSystemCache) when running more than one worker
+    CACHE_TYPE = _get_config('CACHE_TYPE', default=constants.CACHE_TYPE)
     CACHE_DEFAULT_TIMEOUT = constants.CACHE_DEFAULT_TIMEOUT
+    CACHE_KEY_PREFIX = _get_config('CACHE_KEY_PREFIX', default='epictrack_')
+    CACHE_REDIS_URL = _get_config('CACHE_REDIS_URL', default=None)
+    CACHE_DIR = _get_config('CACHE_DIR', default=None)
+
+    # Number of times a statement can run with different parameters in a request before it is flagged as N+1
+    METRICS_N_PLUS_ONE_THRESHOLD = int(_get_config('METRICS_N_PLUS_ONE_THRESHOLD', default=5))
+
+    # Report files generated in the background. With no workers the jobs run in the request.
+    REPORT_JOB_WORKERS = int(_get_config('REPORT_JOB_WORKERS', default=2))
+    # Seconds after which an unfinished job is considered lost and no longer shared
+    REPORT_JOB_TIMEOUT = int(_get_config('REPORT_JOB_TIMEOUT', default=900))
+    # Seconds a generated report file is kept
+    REPORT_JOB_RETENTION = int(_get_config('REPORT_JOB_RETENTION', default=86400))
+    # Seconds a generated report is kept in the cache. Entries are keyed by data version so they never go stale.
+    REPORT_CACHE_TIMEOUT = int(_get_config('REPORT_CACHE_TIMEOUT', default=3600))
+    # Seconds the combined work insights are kept in the cache, keyed by data version like the reports
+    INSIGHT_CACHE_TIMEOUT = int(_get_config('INSIGHT_CACHE_TIMEOUT', default=3600))
+    # Seconds the work memberships of a user are reused across requests, with a Redis or Memcached cache
+    # only. Changes to the staff roles of works invalidate them at once, this only bounds how long a
+    # changed staff email goes unnoticed.
+    MEMBERSHIP_CACHE_TIMEOUT = int(_get_config('MEMBERSHIP_CACHE_TIMEOUT', default=60))
 
     MIN_WORK_START_DATE = _get_config('MIN_WORK_START_DATE', default='1995-06-30')
 
@@ -200,6 +243,7 @@ NrQw+2OdQACBJiEHsdZzAkBcsTk7frTH4yGx0VfHxXDPjfTj4wmD6gZIlcIr9lZg
 4H8UZcVFN95vEKxJiLRjAmj6g273pu9kK4ymXNEjWWJn
 -----END RSA PRIVATE KEY-----"""
     CACHE_TYPE = constants.NULL_CACHE_TYPE
+    REPORT_JOB_WORKERS = 0
 
 
 class ProdConfig(_Config):  # pylint: disable=too-few-public-methods
@@ -7,6 +7,7 @@ from api.insights.project_type_insight import ProjectByTypeInsightGenerator
 from api.insights.work_assessment_phase_insight import AssessmentWorksByPhaseInsightGenerator
 from api.insights.work_federal_involvement_insight import WorkFederalInvolvementInsightGenerator
 from api.insights.work_first_nation_insight import WorkFirstNationInsightGenerator
+from api.insights.work_insight_engine import WorkInsightEngine
 from api.insights.work_lead_insight import WorkLeadInsightGenerator
 from api.insights.work_ministry_insight import WorkMinistryInsightGenerator
 from api.insights.work_staff_insight import WorkStaffInsightGenerator
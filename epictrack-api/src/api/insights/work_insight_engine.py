@@ -0,0 +1,162 @@
+"""Insight engine computing every grouping of the active works and projects in one statement"""
+
+from typing import Dict, List
+
+from sqlalchemy import func, literal, select, union_all
+
+from api.models import db
+from api.models.eao_team import EAOTeam
+from api.models.federal_involvement import FederalInvolvement
+from api.models.indigenous_nation import IndigenousNation
+from api.models.indigenous_work import IndigenousWork
+from api.models.ministry import Ministry
+from api.models.phase_code import PhaseCode
+from api.models.project import Project
+from api.models.region import Region
+from api.models.role import RoleEnum
+from api.models.staff import Staff
+from api.models.staff_work_role import StaffWorkRole
+from api.models.sub_types import SubType
+from api.models.types import Type
+from api.models.work import Work
+from api.models.work_phase import WorkPhase
+from api.models.work_type import WorkType, WorkTypeEnum
+
+
+# Name and id keys of each grouping, as returned by the per grouping insight generators
+WORK_GROUPINGS = {
+    "team": ("eao_team", "eao_team_id"),
+    "lead": ("work_lead", "work_lead_id"),
+    "staff": ("staff", "staff_id"),
+    "ministry": ("ministry", "ministry_id"),
+    "federal_involvement": ("federal_involvement", "federal_involvement_id"),
+    "first_nation": ("first_nation", "first_nation_id"),
+    "type": ("work_type", "work_type_id"),
+    "assessment_by_phase": ("phase", "phase_id"),
+}
+PROJECT_GROUPINGS = {
+    "project_region": ("region", "region_id"),
+    "project_type": ("type", "type_id"),
+    "project_subtype": ("sub_type", "sub_type_id"),
+}
+GROUPINGS = {**WORK_GROUPINGS, **PROJECT_GROUPINGS}
+
+
+class WorkInsightEngine:
+    """Insight engine computing every grouping of the active works and projects in one statement
+
+    The active works are selected once. Each grouping contributes the (group, id, name)
+    rows of its dimension and a single GROUP BY counts them all. The project groupings
+    count the active projects, as the project insight generators do, and the subtypes
+    of every type are counted at once.
+    """
+
+    # Models whose rows the grouping query reads
+    source_models = (
+        Work,
+        WorkPhase,
+        StaffWorkRole,
+        Staff,
+        IndigenousWork,
+        IndigenousNation,
+        EAOTeam,
+        Ministry,
+        FederalInvolvement,
+        WorkType,
+        PhaseCode,
+        Project,
+        Region,
+        Type,
+        SubType,
+    )
+
+    def generate_grouping_query(self):
+        """Generates the query counting the works or projects of every group of every grouping."""
+        active_works = (
+            select(
+                Work.id,
+                Work.eao_team_id,
+                Work.ministry_id,
+                Work.federal_involvement_id,
+                Work.work_type_id,
+                Work.current_work_phase_id,
+            )
+            .where(
+                Work.is_active.is_(True),
+                Work.is_deleted.is_(False),
+                Work.is_completed.is_(False),
+            )
+            .cte("active_works")
+        )
+        dimensions = [
+            self._work_dimension("team", active_works, EAOTeam, active_works.c.eao_team_id),
+            self._work_dimension("ministry", active_works, Ministry, active_works.c.ministry_id),
+            self._work_dimension(
+                "federal_involvement", active_works, FederalInvolvement, active_works.c.federal_involvement_id
+            ),
+            self._work_dimension("type", active_works, WorkType, active_works.c.work_type_id),
+            select(literal("assessment_by_phase").label("grouping"), PhaseCode.id, PhaseCode.name)
+            .select_from(active_works)
+            .join(WorkPhase, WorkPhase.id == active_works.c.current_work_phase_id)
+            .join(PhaseCode, PhaseCode.id == WorkPhase.phase_id)
+            .where(active_works.c.work_type_id == WorkTypeEnum.ASSESSMENT.value),
+            self._staff_dimension("lead", active_works, [RoleEnum.TEAM_CO_LEAD.value, RoleEnum.TEAM_LEAD.value]),
+            self._staff_dimension("staff", active_works, [RoleEnum.OFFICER_ANALYST.value]),
+            select(literal("first_nation").label("grouping"), IndigenousNation.id, IndigenousNation.name)
+            .select_from(active_works)
+            .join(IndigenousWork, IndigenousWork.work_id == active_works.c.id)
+            .join(IndigenousNation, IndigenousNation.id == IndigenousWork.indigenous_nation_id)
+            .where(IndigenousWork.is_active.is_(True)),
+            self._project_dimension("project_region", Region, Project.region_id_env),
+            self._project_dimension("project_type", Type, Project.type_id),
+            self._project_dimension("project_subtype", SubType, Project.sub_type_id),
+        ]
+        groups = union_all(*dimensions).subquery()
+        return (
+            select(groups.c.grouping, groups.c.id, groups.c.name, func.count().label("count"))
+            .group_by(groups.c.grouping, groups.c.id, groups.c.name)
+            .order_by(groups.c.grouping, func.count().desc())
+        )
+
+    def fetch_data(self) -> Dict[str, List[dict]]:
+        """Fetch data from db"""
+        rows = db.session.execute(self.generate_grouping_query()).all()
+        return self._format_data(rows)
+
+    def _format_data(self, data) -> Dict[str, List[dict]]:
+        """Format data to the response format"""
+        insights = {grouping: [] for grouping in GROUPINGS}
+        for row in data:
+            name_key, id_key = GROUPINGS[row.grouping]
+            insights[row.grouping].append({name_key: row.name, id_key: row.id, "count": row.count})
+        return insights
+
+    @staticmethod
+    def _work_dimension(grouping: str, active_works, model, column):
+        """Rows of a grouping by a lookup referenced from the work"""
+        return (
+            select(literal(grouping).label("grouping"), model.id, model.name)
+            .select_from(active_works)
+            .join(model, model.id == column)
+        )
+
+    @staticmethod
+    def _staff_dimension(grouping: str, active_works, role_ids: List[int]):
+        """Rows of a grouping by the staff holding one of the roles on the work"""
+        return (
+            select(literal(grouping).label("grouping"), Staff.id, Staff.full_name)
+            .select_from(active_works)
+            .join(StaffWorkRole, StaffWorkRole.work_id == active_works.c.id)
+            .join(Staff, Staff.id == StaffWorkRole.staff_id)
+            .where(StaffWorkRole.is_active.is_(True), StaffWorkRole.role_id.in_(role_ids))
+        )
+
+    @staticmethod
+    def _project_dimension(grouping: str, model, column):
+        """Rows of a grouping of the active projects by a lookup referenced from the project"""
+        return (
+            select(literal(grouping).label("grouping"), model.id, model.name)
+            .select_from(Project)
+            .join(model, model.id == column)
+            .where(Project.is_active.is_(True), Project.is_deleted.is_(False))
+        )
@@ -52,6 +52,7 @@ from .project import Project
 from .proponent import Proponent
 from .region import Region
 from .reminder_configuration import ReminderConfiguration
+from .report_job import ReportJob, ReportJobStatusEnum
 from .responsibility import Responsibility
 from .role import Role
 from .special_field import SpecialField
@@ -70,6 +71,7 @@ from .work_calendar_event import WorkCalendarEvent
 from .work_issue_updates import WorkIssueUpdates
 from .work_issues import WorkIssues
 from .work_phase import WorkPhase
+from .work_phase_summary import WorkPhaseSummary
 from .work_status import WorkStatus
 from .work_type import WorkType
 from .indigenous_consultation_levels import IndigenousConsultationLevel
@@ -18,6 +18,7 @@ from api.models.history import Versioned
 from api.utils.utcnow import utcnow
 
 from .db import db
+from .serializer import column_fields, compile_serializer
 
 
 class BaseModel(db.Model):
@@ -99,15 +100,8 @@ class BaseModel(db.Model):
 
     def as_dict(self, recursive=True):
         """Return JSON Representation."""
-        mapper = self.__mapper__
-        columns = mapper.columns
-        result = {c: getattr(self, c) for c in dict(columns).keys()}
-        if recursive:
-            for rel in mapper.relationships:
-                relationship = rel.key
-                relational_data = getattr(self, relationship, None)
-                result[relationship] = relational_data.as_dict() if relational_data else None
-        return result
+        model = type(self)
+        return compile_serializer(model, None if recursive else column_fields(model)).dump(self)
 
 
 class BaseModelVersioned(Versioned, BaseModel):
@@ -18,11 +18,19 @@ from api.models.history import Versioned
 from api.utils.utcnow import utcnow
 
 from .db import db
+from .serializer import compile_serializer
+
+
+# Cache tag of the code tables and the other lookup data served from cached endpoints
+LOOKUP_CACHE_TAG = "lookups"
 
 
 class CodeTable():  # pylint: disable=too-few-public-methods
     """This class provides base methods for Code Table."""
 
+    __cache_tag__ = LOOKUP_CACHE_TAG
+    __serialized_fields__ = ('id', 'name')
+
     id = Column(Integer(), primary_key=True, autoincrement=True)
     name = Column(String(250))
 
@@ -114,10 +122,7 @@ class CodeTable():  # pylint: disable=too-few-public-methods
 
     def as_dict(self):
         """Return Json representation."""
-        return {
-            'id': self.id,
-            'name': self.name
-        }
+        return compile_serializer(type(self)).dump(self)
 
 
 class CodeTableVersioned(Versioned, CodeTable):
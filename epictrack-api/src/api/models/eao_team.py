@@ -27,10 +27,3 @@ class EAOTeam(db.Model, CodeTableVersioned):
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(), nullable=False)
     sort_order = Column(Integer, nullable=False)
-
-    def as_dict(self):
-        """Return Json representation."""
-        return {
-            'id': self.id,
-            'name': self.name
-        }
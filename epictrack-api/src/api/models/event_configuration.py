@@ -17,6 +17,7 @@ import sqlalchemy as sa
 from sqlalchemy.orm import relationship
 
 from api.models.event_template import EventPositionEnum, EventTemplateVisibilityEnum
+from api.utils.start_at import StartAt, compile_start_at
 
 from .base_model import BaseModelVersioned
 from .db import db
@@ -47,6 +48,11 @@ class EventConfiguration(BaseModelVersioned):
     event_template = relationship('EventTemplate', foreign_keys=[template_id], lazy='select')
     work_phase = relationship('WorkPhase', foreign_keys=[work_phase_id], lazy='select')
 
+    @property
+    def compiled_start_at(self) -> StartAt:
+        """Return the compiled start_at, shared by the configurations with the same expression"""
+        return compile_start_at(self.start_at)
+
     @classmethod
     def find_by_work_phase_id(cls, _work_phase_id):
         """Returns the event configurations based on phase id"""
@@ -1,9 +1,11 @@
 """Versioned mixin class and other utilities."""
 
 import datetime
+from collections import defaultdict
 
 from psycopg2.extras import DateTimeTZRange
-from sqlalchemy import Column, ForeignKeyConstraint, Integer, PrimaryKeyConstraint, event, func, inspect, util
+from sqlalchemy import (
+    Column, ForeignKeyConstraint, Integer, PrimaryKeyConstraint, event, func, insert, inspect, update, util)
 from sqlalchemy.dialects.postgresql import TSTZRANGE
 from sqlalchemy.orm import attributes, object_mapper
 from sqlalchemy.orm.exc import UnmappedColumnError
@@ -188,44 +190,50 @@ def versioned_objects(iter_):
             yield obj
 
 
-def create_version(obj, session, new=False, deleted=False):
-    """Creates a new entry in the history table"""
-    obj_mapper = object_mapper(obj)
-    history_mapper = obj.__history_mapper__
-    history_cls = history_mapper.class_
-
+def _has_tracked_changes(obj):
+    """Checks if the object has changes in any field not excluded from tracking"""
     obj_state = attributes.instance_state(obj)
-
-    attr = {}
+    exclude_from_tracking = getattr(obj.__class__, '__exclude_from_tracking_history__', set())
 
     # Get the names of fields that are being updated
-    updated_fields = set()
+    updated_fields = {
+        modified_attrs.key for modified_attrs in obj_state.attrs if modified_attrs.history.has_changes()
+    }
 
-    # Get the names of fields that should be excluded from version tracking
-    exclude_from_tracking = getattr(obj.__class__, '__exclude_from_tracking_history__', set())
+    # Skip when all the updated fields are excluded from tracking
+    return not updated_fields or bool(updated_fields - exclude_from_tracking)
 
-    # Get the names of fields that are being updated
-    updated_fields = set()
 
-    # Check which attributes of the object have been modified
-    for modified_attrs in obj_state.attrs:
-        if modified_attrs.history.has_changes():
-            updated_fields.add(modified_attrs.key)
+def _refresh_unloaded(session, objects):
+    """Loads the expired attributes of the given objects with one query per class.
 
-    # Print the updated fields
+    Server generated values such as updated_at are expired by the flush and would
+    otherwise be loaded one object at a time.
+    """
+    unloaded_by_class = defaultdict(list)
+    for obj in objects:
+        obj_state = attributes.instance_state(obj)
+        column_keys = object_mapper(obj).column_attrs.keys()
+        if obj_state.unloaded.intersection(column_keys):
+            unloaded_by_class[obj.__class__].append(obj.id)
+    for cls, ids in unloaded_by_class.items():
+        session.query(cls).filter(cls.id.in_(ids)).all()
 
-    # Check if all updated fields are excluded from tracking
-    if updated_fields and not updated_fields - exclude_from_tracking:
-        print("All updated fields are excluded from tracking. Skipping version creation.")
-        return
 
+def _history_values(obj):
+    """Returns the values to be copied to the history table for the object"""
+    obj_mapper = object_mapper(obj)
+    history_mapper = obj.__history_mapper__
+    obj_state = attributes.instance_state(obj)
+
+    # Get the names of fields that should be excluded from version tracking
+    exclude_from_tracking = getattr(obj.__class__, '__exclude_from_tracking_history__', set())
+
+    attr = {}
     for om, hm in zip(obj_mapper.iterate_to_root(), history_mapper.iterate_to_root()):
         if hm.single:
             continue
 
-        # Accessing __exclude_from_tracking_history__ attribute of the class
-        exclude_from_tracking = getattr(obj.__class__, '__exclude_from_tracking_history__', set())
-
         for hist_col in hm.local_table.c:
             if _is_versioning_col(hist_col):
                 continue
@@ -254,36 +262,50 @@ def create_version(obj, session, new=False, deleted=False):
             if prop.key not in obj_state.dict:
                 getattr(obj, prop.key)
             attr[prop.key] = getattr(obj, prop.key)
-
-    hist = history_cls()
-    for key, value in attr.items():
-        setattr(hist, key, value)
-
-    if not new:
-        prev_history = history_cls.query.filter(
-            history_cls.id == obj.id, func.upper(history_cls.during).is_(None)
+    return attr
+
+
+def create_versions(session, new_objects, changed_objects):
+    """Creates the entries in the history tables for the given objects.
+
+    The open ranges of the changed objects are closed with one UPDATE per history
+    table and the new history rows are written with one multi-row INSERT per table.
+    """
+    now = datetime.datetime.utcnow()
+    _refresh_unloaded(session, new_objects + [obj for obj, deleted in changed_objects if not deleted])
+
+    history_rows = defaultdict(list)
+    closing_ids = defaultdict(list)
+    for obj in new_objects:
+        history_rows[obj.__history_mapper__.class_].append(_history_values(obj))
+    for obj, _ in changed_objects:
+        history_cls = obj.__history_mapper__.class_
+        history_rows[history_cls].append(_history_values(obj))
+        closing_ids[history_cls].append(obj.id)
+
+    for history_cls, ids in closing_ids.items():
+        session.execute(
+            update(history_cls)
+            .where(history_cls.id.in_(ids), func.upper(history_cls.during).is_(None))
+            .values(during=func.tstzrange(func.lower(history_cls.during), now, "[)"))
+            .execution_options(synchronize_session=False)
         )
-        print(prev_history.statement.compile(compile_kwargs={"literal_binds": True}))
-        prev = prev_history.first()
-        if prev:
-            new_range = DateTimeTZRange(prev.during.lower, datetime.datetime.utcnow(), "[)")
-            history_cls.query.filter(history_cls.pk == prev.pk).update(
-                {"during": new_range}
-            )
 
-    new_range = DateTimeTZRange(datetime.datetime.utcnow(), None, "[)")
-    setattr(hist, "during", new_range)
-    session.add(hist)
-    # obj.version += 1
+    for history_cls, rows in history_rows.items():
+        for row in rows:
+            row["during"] = DateTimeTZRange(now, None, "[)")
+        session.execute(insert(history_cls), rows)
 
 
 def versioned_session(session):
     """Creates entries in history tables"""
     @event.listens_for(session, "after_flush")
     def after_flush(session, *args, **kwargs):
-        for obj in versioned_objects(session.new):
-            create_version(obj, session, new=True)
-        for obj in versioned_objects(session.dirty):
-            create_version(obj, session)
-        for obj in versioned_objects(session.deleted):
-            create_version(obj, session, deleted=True)
+        new_objects = list(versioned_objects(session.new))
+        changed_objects = [
+            (obj, False) for obj in versioned_objects(session.dirty) if _has_tracked_changes(obj)
+        ] + [
+            (obj, True) for obj in versioned_objects(session.deleted) if _has_tracked_changes(obj)
+        ]
+        if new_objects or changed_objects:
+            create_versions(session, new_objects, changed_objects)
@@ -29,14 +29,7 @@ class IndigenousCategory(db.Model, CodeTableVersioned):
     sort_order = Column(Integer, nullable=False)
     is_active = Column(Boolean(), default=True, nullable=False)
 
-    def as_dict(self):
-        """Return Json representation."""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'sort_order': self.sort_order,
-            'is_active': self.is_active
-        }
+    __serialized_fields__ = ('id', 'name', 'sort_order', 'is_active')
 
     @classmethod
     def find_all_active_categories(cls):
@@ -30,11 +30,4 @@ class IndigenousConsultationLevel(db.Model, CodeTableVersioned):
     sort_order = Column(Integer, nullable=False)
     is_active = Column(Boolean(), default=True, nullable=False)
 
-    def as_dict(self):
-        """Return Json representation."""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'sort_order': self.sort_order,
-            'is_active': self.is_active
-        }
+    __serialized_fields__ = ('id', 'name', 'sort_order', 'is_active')
@@ -44,16 +44,14 @@ class IndigenousNation(db.Model, CodeTableVersioned):
         "PIPOrgType", foreign_keys=[pip_org_type_id], lazy="select"
     )
 
-    def as_dict(self):
-        """Return JSON Representation."""
-        result = CodeTableVersioned.as_dict(self)
-        result["is_active"] = self.is_active
-        result["pip_link"] = self.pip_link
-        result["relationship_holder_id"] = self.relationship_holder_id
-        result["relationship_holder"] = (
-            self.relationship_holder.as_dict() if self.relationship_holder else None
-        )
-        return result
+    __serialized_fields__ = (
+        "id",
+        "name",
+        "is_active",
+        "pip_link",
+        "relationship_holder_id",
+        "relationship_holder",
+    )
 
     @classmethod
     def find_all_active_groups(cls):
@@ -46,15 +46,13 @@ class IndigenousWork(BaseModelVersioned):
         "IndigenousConsultationLevel", foreign_keys=[indigenous_consultation_level_id], lazy="select"
     )
 
-    def as_dict(self):  # pylint:disable=arguments-differ
-        """Return Json representation."""
-        return {
-            "id": self.id,
-            "work_id": self.work_id,
-            "indigenous_nation": self.indigenous_nation.as_dict(),
-            "indigenous_category": self.indigenous_category.as_dict(),
-            "indigenous_consultation_level": self.indigenous_consultation_level.as_dict(),
-        }
+    __serialized_fields__ = (
+        "id",
+        "work_id",
+        "indigenous_nation",
+        "indigenous_category",
+        "indigenous_consultation_level",
+    )
 
     @classmethod
     def find_by_work_id(cls, work_id: int):
@@ -32,10 +32,9 @@ class Ministry(db.Model, CodeTableVersioned):
 
     minister = relationship('Staff', foreign_keys=[minister_id], lazy='select')
 
-    def as_dict(self):
-        """Return JSON representation."""
-        result = CodeTableVersioned.as_dict(self)
-        result['abbreviation'] = self.abbreviation
-        result['combined'] = "-".join([self.name, self.abbreviation])
-        result['minister'] = self.minister.as_dict() if self.minister else None
-        return result
+    __serialized_fields__ = ('id', 'name', 'abbreviation', 'combined', 'minister')
+
+    @property
+    def combined(self):
+        """Return the name followed by the abbreviation."""
+        return "-".join([self.name, self.abbreviation])
@@ -19,10 +19,15 @@ from sqlalchemy.orm import relationship
 from .base_model import BaseModelVersioned, db
 
 
+# Cache tag of the outcome configurations served by the outcome configuration endpoint
+OUTCOME_CONFIGURATION_CACHE_TAG = "outcome_configurations"
+
+
 class OutcomeConfiguration(BaseModelVersioned):
     """Model class for Outcome."""
 
     __tablename__ = 'outcome_configurations'
+    __cache_tag__ = OUTCOME_CONFIGURATION_CACHE_TAG
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String, nullable=False)
@@ -17,12 +17,14 @@ from sqlalchemy import Column, ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
 
 from .base_model import BaseModelVersioned, db
+from .code_table import LOOKUP_CACHE_TAG
 
 
 class OutcomeTemplate(BaseModelVersioned):
     """Model class for Outcome."""
 
     __tablename__ = 'outcome_templates'
+    __cache_tag__ = LOOKUP_CACHE_TAG
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String, nullable=False)
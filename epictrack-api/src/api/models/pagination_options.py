@@ -1,5 +1,7 @@
 """This module holds data classes."""
 
+from typing import Optional
+
 from attr import dataclass
 
 
@@ -9,5 +11,9 @@ class PaginationOptions:  # pylint: disable=too-many-instance-attributes
 
     page: int
     size: int
-    sort_key: int
-    sort_order: str
+    sort_key: Optional[str]
+    sort_order: Optional[str]
+    # Cursor of the page to fetch by keyset, empty for the first page
+    cursor: Optional[str] = None
+    # Whether the total is estimated by the planner instead of counted
+    approximate_total: bool = False
@@ -48,18 +48,16 @@ class PhaseCode(db.Model, CodeTableVersioned):
     work_type = relationship("WorkType", foreign_keys=[work_type_id], lazy="select")
     ea_act = relationship("EAAct", foreign_keys=[ea_act_id], lazy="select")
 
-    def as_dict(self):
-        """Return Json representation."""
-        return {
-            "id": self.id,
-            "name": self.name,
-            "sort_order": self.sort_order,
-            "number_of_days": self.number_of_days,
-            "legislated": self.legislated,
-            "work_type": self.work_type.as_dict(),
-            "ea_act": self.ea_act.as_dict(),
-            "color": self.color,
-        }
+    __serialized_fields__ = (
+        "id",
+        "name",
+        "sort_order",
+        "number_of_days",
+        "legislated",
+        "work_type",
+        "ea_act",
+        "color",
+    )
 
     @classmethod
     def find_by_ea_act_and_work_type(cls, _ea_act_id, _work_type_id):
@@ -38,15 +38,13 @@ class Proponent(db.Model, CodeTableVersioned):
         "Staff", foreign_keys=[relationship_holder_id], lazy="select"
     )
 
-    def as_dict(self):
-        """Return JSON Representation."""
-        result = CodeTableVersioned.as_dict(self)
-        result["is_active"] = self.is_active
-        result["relationship_holder_id"] = self.relationship_holder_id
-        result["relationship_holder"] = (
-            self.relationship_holder.as_dict() if self.relationship_holder else None
-        )
-        return result
+    __serialized_fields__ = (
+        "id",
+        "name",
+        "is_active",
+        "relationship_holder_id",
+        "relationship_holder",
+    )
 
     @classmethod
     def check_existence(cls, name, proponent_id):
@@ -33,8 +33,4 @@ class Region(db.Model, CodeTableVersioned):
         """Find all regions by region type."""
         return cls.query.filter_by(entity=region_type).all()
 
-    def as_dict(self):
-        """Return Json representation."""
-        result = CodeTableVersioned.as_dict(self)
-        result['entity'] = self.entity
-        return result
+    __serialized_fields__ = ('id', 'name', 'entity')
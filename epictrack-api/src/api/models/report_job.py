@@ -0,0 +1,53 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Model to handle all operations related to ReportJob."""
+import enum
+
+from sqlalchemy import Column, Date, DateTime, Enum, Integer, LargeBinary, String
+from sqlalchemy.dialects.postgresql import JSONB
+
+from api.utils.utcnow import utcnow
+
+from .db import db
+
+
+class ReportJobStatusEnum(enum.Enum):
+    """Enum for the status of a report job"""
+
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+IN_FLIGHT_STATUSES = [ReportJobStatusEnum.PENDING, ReportJobStatusEnum.RUNNING]
+
+
+class ReportJob(db.Model):  # pylint: disable=too-few-public-methods
+    """Report file generated in the background and kept until it is downloaded or expires."""
+
+    __tablename__ = "report_jobs"
+
+    id = Column(String(32), primary_key=True)
+    job_key = Column(String(64), nullable=False, index=True)
+    report_type = Column(String, nullable=False)
+    report_date = Column(Date, nullable=False)
+    filters = Column(JSONB)
+    color_intensity = Column(Integer)
+    status = Column(Enum(ReportJobStatusEnum), nullable=False, default=ReportJobStatusEnum.PENDING)
+    file_name = Column(String)
+    content = Column(LargeBinary)
+    error = Column(String)
+    created_at = Column(DateTime(timezone=True), server_default=utcnow())
+    completed_at = Column(DateTime(timezone=True))
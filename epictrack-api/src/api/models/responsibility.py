@@ -16,12 +16,14 @@
 import sqlalchemy as sa
 
 from .base_model import BaseModelVersioned
+from .code_table import LOOKUP_CACHE_TAG
 
 
 class Responsibility(BaseModelVersioned):
     """Model class for responsibilities"""
 
     __tablename__ = 'responsibilities'
+    __cache_tag__ = LOOKUP_CACHE_TAG
 
     id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)  # TODO check how it can be inherited from parent
     name = sa.Column(sa.String)
@@ -39,13 +39,6 @@ class Role(db.Model, CodeTableVersioned):
     name = Column(String(), nullable=False)
     sort_order = Column(Integer, nullable=False)
 
-    def as_dict(self):
-        """Return Json representation."""
-        return {
-            'id': self.id,
-            'name': self.name
-        }
-
     @classmethod
     def find_by_name(cls, name):
         """Find role by name."""
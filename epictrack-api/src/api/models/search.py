@@ -0,0 +1,56 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Full text search over the names of the searchable models.
+
+The search documents are indexed by GIN expression indexes, which the migrations
+create from the same expressions as search_document. The planner only uses an index
+when the query repeats its expression exactly, so both must change together.
+"""
+import re
+from typing import Optional
+
+from sqlalchemy import func
+
+
+# Names are matched word by word, without stemming or stop words
+SEARCH_CONFIGURATION = "simple"
+
+# Characters of a search term, leaving out the operators of tsquery
+SEARCH_TERM = re.compile(r"[\w.@-]+")
+
+
+def search_document(*columns):
+    """Return the tsvector of the columns, joined by spaces"""
+    document = func.coalesce(columns[0], "")
+    for column in columns[1:]:
+        document = document + " " + func.coalesce(column, "")
+    return func.to_tsvector(SEARCH_CONFIGURATION, document)
+
+
+def search_query(text: str) -> Optional[object]:
+    """Return the tsquery matching the documents with a word starting with each term of the text"""
+    terms = SEARCH_TERM.findall(text.lower()) if text else []
+    if not terms:
+        return None
+    return func.to_tsquery(SEARCH_CONFIGURATION, " & ".join(f"{term}:*" for term in terms))
+
+
+def normalize_title(title: str) -> str:
+    """Return the title in the form stored to find duplicates"""
+    return title.strip(" ").lower()
+
+
+def normalized_title_expression(project_name, work_type_name, simple_title):
+    """SQL expression of the normalized title of a work, as the title expression of Work builds it"""
+    return func.lower(func.trim(func.concat(project_name, " - ", work_type_name, " - ", simple_title)))
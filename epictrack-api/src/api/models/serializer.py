@@ -0,0 +1,133 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Serializers of the models, compiled once per model and set of fields.
+
+A field is the name of a column, a property or a relationship of the model, or a
+column of a relationship, as in "work_type.name", in which case only the named
+columns of the related rows are emitted. Models list the fields of their JSON
+representation in __serialized_fields__, the others are represented by all their
+columns and relationships, the related rows being serialized by their own as_dict.
+"""
+from functools import lru_cache
+from operator import attrgetter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import selectinload
+
+
+class CompiledSerializer:
+    """Serializer of a model resolved against its mapper up front
+
+    Dumping a row reads all its columns with one getter and each relationship with its own.
+    """
+
+    def __init__(self, model, fields: Tuple[str, ...]):
+        """Resolve the fields against the mapper of the model"""
+        self.model = model
+        self.fields = fields
+        relationships = inspect(model).relationships
+        projections: Dict[str, Optional[List[str]]] = {}
+        for field in fields:
+            name, _, column = field.partition(".")
+            if column:
+                projections.setdefault(name, []).append(column)
+            elif name in relationships:
+                projections.setdefault(name, None)
+        self._nested = {
+            name: (relationships[name], _nested_serializer(relationships[name].mapper.class_, columns))
+            for name, columns in projections.items()
+        }
+        names = list(dict.fromkeys(field.partition(".")[0] for field in fields))
+        self._columns = tuple(name for name in names if name not in self._nested)
+        self._get_columns = _columns_getter(self._columns)
+        self._getters: List[Tuple[str, Callable]] = [
+            (name, _relationship_getter(name, relationship.uselist, serializer))
+            for name, (relationship, serializer) in self._nested.items()
+        ]
+
+    def dump(self, obj) -> dict:
+        """Return the JSON representation of the row"""
+        result = dict(zip(self._columns, self._get_columns(obj))) if self._get_columns else {}
+        for key, getter in self._getters:
+            result[key] = getter(obj)
+        return result
+
+    def dump_many(self, rows) -> List[dict]:
+        """Return the JSON representation of each row"""
+        return [self.dump(row) for row in rows]
+
+    def loader_options(self) -> list:
+        """Loader options eagerly loading every relationship the serializer reads"""
+        options = []
+        for name, (_, serializer) in self._nested.items():
+            nested_options = serializer.loader_options() if serializer is not None else []
+            options.append(selectinload(getattr(self.model, name)).options(*nested_options))
+        return options
+
+
+@lru_cache(maxsize=None)
+def column_fields(model) -> Tuple[str, ...]:
+    """Fields of all the columns of the model"""
+    return tuple(inspect(model).columns.keys())
+
+
+@lru_cache(maxsize=None)
+def compile_serializer(model, fields: Optional[Tuple[str, ...]] = None) -> CompiledSerializer:
+    """Return the serializer of the model for the fields, defaulting to those of its JSON representation"""
+    if fields is None:
+        fields = getattr(model, "__serialized_fields__", None) or (
+            column_fields(model)
+            # Dynamic relationships are queries rather than rows
+            + tuple(name for name, rel in inspect(model).relationships.items() if rel.lazy != "dynamic")
+        )
+    return CompiledSerializer(model, fields)
+
+
+def _columns_getter(columns: Tuple[str, ...]) -> Optional[Callable]:
+    """Getter reading every column of the row at once, as a tuple"""
+    if not columns:
+        return None
+    getter = attrgetter(*columns)
+    if len(columns) == 1:
+        return lambda obj: (getter(obj),)
+    return getter
+
+
+def _nested_serializer(model, columns: Optional[List[str]]) -> Optional[CompiledSerializer]:
+    """Serializer of the related rows, or None when they are serialized by their as_dict"""
+    if columns:
+        return compile_serializer(model, tuple(columns))
+    if hasattr(model, "__serialized_fields__"):
+        return compile_serializer(model)
+    return None
+
+
+def _relationship_getter(name: str, uselist: bool, serializer: Optional[CompiledSerializer]) -> Callable:
+    """Getter serializing the related rows, by their as_dict unless the columns are projected"""
+    get_related = attrgetter(name)
+    dump = serializer.dump if serializer is not None else _as_dict
+
+    def getter(obj):
+        related = get_related(obj)
+        if not related:
+            return None
+        return [dump(item) for item in related] if uselist else dump(related)
+
+    return getter
+
+
+def _as_dict(obj) -> dict:
+    """Return the JSON representation of the row"""
+    return obj.as_dict()
@@ -44,19 +44,17 @@ class Staff(BaseModelVersioned):
     # Define the excluded fields from versioning
     __exclude_from_tracking_history__ = {'last_active_at'}
 
-    def as_dict(self):  # pylint: disable=arguments-differ
-        """Return Json representation."""
-        return {
-            "id": self.id,
-            "first_name": self.first_name,
-            "last_name": self.last_name,
-            "full_name": self.full_name,
-            "phone": self.phone,
-            "email": self.email,
-            "is_active": self.is_active,
-            "position_id": self.position_id,
-            "position": self.position.as_dict(),
-        }
+    __serialized_fields__ = (
+        "id",
+        "first_name",
+        "last_name",
+        "full_name",
+        "phone",
+        "email",
+        "is_active",
+        "position_id",
+        "position",
+    )
 
     @classmethod
     def find_active_staff_by_position(cls, position_id: int):
@@ -13,10 +13,17 @@
 # limitations under the License.
 """Model to handle all operations related to StaffWorkRole."""
 
+from typing import Dict, Set
+
 from sqlalchemy import Boolean, Column, ForeignKey, Integer
 from sqlalchemy.orm import relationship
 
 from .base_model import BaseModelVersioned
+from .staff import Staff
+
+
+# Cache tag of the work memberships resolved for the authorisation checks
+STAFF_WORK_ROLE_CACHE_TAG = "staff_work_roles"
 
 
 class StaffWorkRole(BaseModelVersioned):
@@ -34,14 +41,21 @@ class StaffWorkRole(BaseModelVersioned):
     role = relationship('Role', foreign_keys=[role_id], lazy='select')
     staff = relationship('Staff', foreign_keys=[staff_id], lazy='select')
 
-    def as_dict(self):  # pylint:disable=arguments-differ
-        """Return Json representation."""
-        return {
-            'id': self.id,
-            'work_id': self.work_id,
-            'role': self.role.as_dict(),
-            'staff': self.staff.as_dict()
-        }
+    __cache_tag__ = STAFF_WORK_ROLE_CACHE_TAG
+    __serialized_fields__ = ('id', 'work_id', 'role', 'staff')
+
+    @classmethod
+    def find_memberships_by_email(cls, email: str) -> Dict[int, Set[int]]:
+        """Return the ids of the active roles of the staff with the email, by work id"""
+        rows = cls.query.with_entities(cls.work_id, cls.role_id).join(Staff, Staff.id == cls.staff_id).filter(
+            Staff.email == email,
+            cls.is_active.is_(True),
+            cls.is_deleted.is_(False),
+        )
+        memberships: Dict[int, Set[int]] = {}
+        for work_id, role_id in rows:
+            memberships.setdefault(work_id, set()).add(role_id)
+        return memberships
 
     @classmethod
     def find_by_work_id(cls, work_id: int):
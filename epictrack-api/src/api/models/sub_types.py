@@ -31,12 +31,7 @@ class SubType(db.Model, CodeTableVersioned):
     type = relationship("Type", foreign_keys=[type_id], lazy="select")
     sort_order = Column(Integer, nullable=False)
 
-    def as_dict(self):  # pylint:disable=arguments-differ
-        """Return Json representation."""
-        result = CodeTableVersioned.as_dict(self)
-        result["short_name"] = self.short_name
-        result["type"] = self.type.as_dict()
-        return result
+    __serialized_fields__ = ("id", "name", "short_name", "type")
 
     @classmethod
     def find_by_type_id(cls, type_id):
@@ -17,12 +17,14 @@ import sqlalchemy as sa
 from sqlalchemy.orm import relationship
 
 from .base_model import BaseModelVersioned
+from .task_template import TASK_TEMPLATE_CACHE_TAG
 
 
 class Task(BaseModelVersioned):
     """Model class for Tasks."""
 
     __tablename__ = 'tasks'
+    __cache_tag__ = TASK_TEMPLATE_CACHE_TAG
 
     id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)  # TODO check how it can be inherited from parent
     name = sa.Column(sa.String)
@@ -18,10 +18,15 @@ from sqlalchemy.orm import relationship
 from .base_model import BaseModelVersioned
 
 
+# Cache tag of the task templates and their tasks served by the task template endpoints
+TASK_TEMPLATE_CACHE_TAG = "task_templates"
+
+
 class TaskTemplate(BaseModelVersioned):
     """Model class for Tasks."""
 
     __tablename__ = 'task_templates'
+    __cache_tag__ = TASK_TEMPLATE_CACHE_TAG
 
     id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)  # TODO check how it can be inherited from parent
     name = sa.Column(sa.String)
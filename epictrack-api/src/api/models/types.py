@@ -28,8 +28,4 @@ class Type(db.Model, CodeTableVersioned):
     short_name = Column(String())
     sort_order = Column(Integer, nullable=False)
 
-    def as_dict(self):
-        """Return JSON Representation."""
-        result = CodeTableVersioned.as_dict(self)
-        result['short_name'] = self.short_name
-        return result
+    __serialized_fields__ = ('id', 'name', 'short_name')
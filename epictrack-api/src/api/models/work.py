@@ -16,7 +16,7 @@
 from __future__ import annotations
 
 import enum
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from sqlalchemy import (
     Boolean,
@@ -28,18 +28,32 @@ from sqlalchemy import (
     String,
     Text,
     and_,
+    event,
     exists,
     func,
-    or_
+    inspect,
+    or_,
+    select,
+    update
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
 
 from api.models.dashboard_seach_options import WorkplanDashboardSearchOptions
 from api.models.project import Project
+from api.models.search import normalize_title, normalized_title_expression, search_document, search_query
 from api.models.staff_work_role import StaffWorkRole
 
+from api.exceptions import BadRequestError
 from api.utils import util
+from api.utils.pagination import (
+    decode_cursor,
+    encode_cursor,
+    estimate_count,
+    keyset_filter,
+    keyset_null_tail,
+    keyset_order_by
+)
 from .base_model import BaseModelVersioned
 from .pagination_options import PaginationOptions
 
@@ -55,6 +69,10 @@ class WorkStateEnum(enum.Enum):
     COMPLETED = "COMPLETED"
 
 
+# Columns the work plan dashboard can be sorted by
+WORK_PLAN_SORT_KEYS = ("start_date", "simple_title", "id")
+
+
 class EndingWorkStateEnum(enum.Enum):
     """Ending states for work"""
 
@@ -71,6 +89,8 @@ class Work(BaseModelVersioned):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     simple_title = Column(String(), nullable=True)
+    # Title in lower case, kept up to date by the listeners below to find duplicate titles by index
+    normalized_title = Column(String(), nullable=True)
     report_description = Column(String(2000))
     epic_description = Column(Text)
     is_cac_recommended = Column(Boolean, default=False, nullable=False)
@@ -144,13 +164,8 @@ class Work(BaseModelVersioned):
     @classmethod
     def check_existence(cls, title: str, work_id=None):
         """Checks if a work exists for a given title"""
-        from api.models.work_type import WorkType  # pylint:disable=import-outside-toplevel
-        query = (
-            Work.query.join(Project, Work.project_id == Project.id)
-            .join(WorkType, Work.work_type_id == WorkType.id)
-            .filter(
-                func.trim(func.lower(Work.title)) == func.trim(func.lower(title)), Work.is_deleted.is_(False)
-            )
+        query = Work.query.filter(
+            Work.normalized_title == normalize_title(title), Work.is_deleted.is_(False)
         )
         if work_id:
             query = query.filter(Work.id != work_id)
@@ -162,21 +177,69 @@ class Work(BaseModelVersioned):
     def fetch_all_works(
         cls,
         pagination_options: PaginationOptions,
-        search_filters: WorkplanDashboardSearchOptions = None
-    ) -> Tuple[List[Work], int]:
-        """Fetch all active works."""
-        query = cls.query.filter_by(is_deleted=False)
+        search_filters: WorkplanDashboardSearchOptions = None,
+        loader_options=(),
+    ) -> Tuple[List[Work], Optional[int], Optional[str]]:
+        """Fetch all active works, loaded with the given loader options.
+
+        Returns the works, their total and the cursor of the next page. The works
+        are paged by the cursor when one is given, empty for the first page, and by
+        the page number otherwise.
+        """
+        query = cls.query.filter(cls.is_deleted.is_(False))
         query = cls.filter_by_search_criteria(query, search_filters)
-        query = query.order_by(Work.start_date.desc())
+        query = query.options(*loader_options)
+        sort_column, descending = cls._sort_column(pagination_options)
+        query = query.order_by(*keyset_order_by(sort_column, cls.id, descending))
+
+        if pagination_options and pagination_options.cursor is not None and pagination_options.size:
+            return cls._fetch_keyset_page(query, pagination_options, sort_column, descending)
 
         no_pagination_options = not pagination_options or not pagination_options.page or not pagination_options.size
         if no_pagination_options:
             items = query.all()
-            return items, len(items)
+            return items, len(items), None
 
         page = query.paginate(page=pagination_options.page, per_page=pagination_options.size)
 
-        return page.items, page.total
+        return page.items, page.total, None
+
+    @classmethod
+    def _sort_column(cls, pagination_options: PaginationOptions):
+        """Return the column to sort by and whether the sort is descending"""
+        sort_key = pagination_options.sort_key if pagination_options else None
+        sort_order = pagination_options.sort_order if pagination_options else None
+        if not sort_key:
+            # The most recent works first unless a sort is requested
+            return cls.start_date, sort_order != "asc"
+        if sort_key not in WORK_PLAN_SORT_KEYS:
+            raise BadRequestError(f"Works cannot be sorted by {sort_key}")
+        if sort_order not in (None, "asc", "desc"):
+            raise BadRequestError(f"Invalid sort order {sort_order}")
+        return getattr(cls, sort_key), sort_order == "desc"
+
+    @classmethod
+    def _fetch_keyset_page(cls, query, pagination_options: PaginationOptions, sort_column, descending: bool):
+        """Return the page of works following the cursor, with their total and the cursor of the next page"""
+        if pagination_options.approximate_total:
+            total = estimate_count(query)
+        else:
+            total = query.order_by(None).count()
+        # One more row tells whether there is a next page
+        limit = pagination_options.size + 1
+        if not pagination_options.cursor:
+            items = query.limit(limit).all()
+        else:
+            value, last_id = decode_cursor(pagination_options.cursor, sort_column)
+            items = query.filter(keyset_filter(sort_column, cls.id, descending, value, last_id)).limit(limit).all()
+            if value is not None and len(items) < limit:
+                items += query.filter(keyset_null_tail(sort_column)).limit(limit - len(items)).all()
+        next_cursor = None
+        if len(items) > pagination_options.size:
+            items = items[:pagination_options.size]
+            last = items[-1]
+            next_cursor = encode_cursor(getattr(last, sort_column.key), last.id)
+        return items, total, next_cursor
 
     @classmethod
     def filter_by_search_criteria(cls, query, search_filters: WorkplanDashboardSearchOptions):
@@ -219,8 +282,14 @@ class Work(BaseModelVersioned):
 
     @classmethod
     def _filter_by_search_text(cls, query, search_text):
-        if search_text:
-            subquery = exists().where(and_(Work.project_id == Project.id, Project.name.ilike(f'%{search_text}%')))
+        text_query = search_query(search_text)
+        if text_query is not None:
+            subquery = exists().where(
+                and_(
+                    Work.project_id == Project.id,
+                    search_document(Project.name, Project.abbreviation).op("@@")(text_query),
+                )
+            )
             query = query.filter(subquery)
         return query
 
@@ -260,27 +329,57 @@ class Work(BaseModelVersioned):
                 for work_state in work_states
                 if work_state not in ending_states
             ]
-            ending_state_query = None
+            # The works in an ending state are listed whether they are active or not
+            conditions = []
             if filtered_ending_states:
-                ending_state_query = query.filter(
-                    and_(
-                        Work.work_state.in_(filtered_ending_states),
-                    )
-                )
+                conditions.append(Work.work_state.in_(filtered_ending_states))
             if filtered_non_ending_states:
-                query = query.filter(
+                conditions.append(
                     and_(
                         Work.work_state.in_(filtered_non_ending_states),
                         Work.is_active.is_(True),
                     )
                 )
-            if ending_state_query:
-                if (
-                    not filtered_non_ending_states
-                ):  # if non ending state query is not pressent
-                    query = ending_state_query
-                else:  # if both state queries are present
-                    query = query.union(ending_state_query)
+            query = query.filter(or_(*conditions))
         else:
-            query = query.filter_by(is_active=True, is_deleted=False)
+            query = query.filter(cls.is_active.is_(True), cls.is_deleted.is_(False))
         return query
+
+
+def _normalized_title_expression(project_id, work_type_id, simple_title):
+    """SQL expression of the normalized title of a work with the given project, work type and title"""
+    from api.models.work_type import WorkType  # pylint:disable=import-outside-toplevel
+    return normalized_title_expression(
+        select(Project.name).where(Project.id == project_id).scalar_subquery(),
+        select(WorkType.name).where(WorkType.id == work_type_id).scalar_subquery(),
+        simple_title,
+    )
+
+
+@event.listens_for(Work, "before_insert")
+@event.listens_for(Work, "before_update")
+def _set_normalized_title(mapper, connection, work: Work):  # pylint: disable=unused-argument
+    """Write the normalized title along with the work when a part of its title changes"""
+    state = inspect(work)
+    if state.persistent and not any(
+        state.attrs[key].history.has_changes() for key in ("project_id", "work_type_id", "simple_title")
+    ):
+        return
+    work.normalized_title = _normalized_title_expression(work.project_id, work.work_type_id, work.simple_title)
+
+
+def refresh_normalized_titles(connection, *criteria) -> None:
+    """Recompute the normalized title of the works matching the criteria"""
+    connection.execute(
+        update(Work)
+        .where(*criteria)
+        .values(normalized_title=_normalized_title_expression(Work.project_id, Work.work_type_id, Work.simple_title))
+        .execution_options(synchronize_session=False)
+    )
+
+
+@event.listens_for(Project, "after_update")
+def _refresh_project_work_titles(mapper, connection, project: Project):  # pylint: disable=unused-argument
+    """Refresh the normalized titles of the works of a renamed project"""
+    if inspect(project).attrs.name.history.has_changes():
+        refresh_normalized_titles(connection, Work.project_id == project.id)
@@ -35,10 +35,4 @@ class WorkIssueUpdates(BaseModelVersioned):
     work_issue = relationship('WorkIssues', back_populates='updates')
     posted_date = Column(DateTime(timezone=True), nullable=False, server_default=utcnow())
 
-    def as_dict(self):  # pylint:disable=arguments-differ
-        """Return Json representation."""
-        return {
-            'id': self.id,
-            'description': self.description,
-            'work_issue_id': self.work_issue_id,
-        }
+    __serialized_fields__ = ('id', 'description', 'work_issue_id')
@@ -0,0 +1,39 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Model to handle all operations related to WorkPhaseSummary."""
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String
+
+from api.utils.utcnow import utcnow
+
+from .db import db
+
+
+class WorkPhaseSummary(db.Model):  # pylint: disable=too-few-public-methods
+    """Precomputed status of a work phase shown on the dashboard."""
+
+    __tablename__ = "work_phase_summaries"
+
+    work_phase_id = Column(ForeignKey("work_phases.id"), primary_key=True)
+    work_id = Column(ForeignKey("works.id"), nullable=False, index=True)
+    total_days = Column(Integer, nullable=False)
+    suspended_days = Column(Integer, nullable=False, default=0)
+    current_milestone = Column(String)
+    next_milestone = Column(String)
+    next_milestone_date = Column(DateTime(timezone=True))
+    decision_milestone = Column(String)
+    decision = Column(String)
+    decision_milestone_date = Column(DateTime(timezone=True))
+    milestone_progress = Column(Float, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=utcnow(), onupdate=utcnow())
@@ -50,9 +50,4 @@ class WorkType(db.Model, CodeTableVersioned):
     sort_order = Column(Integer())
     report_title = Column(String())
 
-    def as_dict(self):
-        """Return Json representation."""
-        result = CodeTableVersioned.as_dict(self)
-        result['sort_order'] = self.sort_order
-        result['report_title'] = self.report_title
-        return result
+    __serialized_fields__ = ('id', 'name', 'sort_order', 'report_title')
@@ -4,12 +4,13 @@ from .resource_forecast_report import EAResourceForeCastReport
 from .thirty_sixty_ninety_report import ThirtySixtyNinetyReport
 
 
+REPORT_CLASSES = {
+    'ea_anticipated_schedule': EAAnticipatedScheduleReport,
+    'ea_resource_forecast': EAResourceForeCastReport,
+    '30-60-90': ThirtySixtyNinetyReport
+}
+
+
 def get_report_generator(report_type='ea_anticipated_schedule', filters=None, color_intensity=None):
     """Returns the report generator for the given report type"""
-    report_classes = {
-        'ea_anticipated_schedule': EAAnticipatedScheduleReport,
-        'ea_resource_forecast': EAResourceForeCastReport,
-        '30-60-90': ThirtySixtyNinetyReport
-    }
-
-    return report_classes[report_type](filters=filters, color_intensity=color_intensity)
+    return REPORT_CLASSES[report_type](filters=filters, color_intensity=color_intensity)
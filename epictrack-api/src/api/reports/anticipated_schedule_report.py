@@ -45,6 +45,11 @@ class StalenessEnum(Enum):
 class EAAnticipatedScheduleReport(ReportFactory):
     """EA Anticipated Schedule Report Generator"""
 
+    source_models = (
+        EAAct, Event, EventConfiguration, Ministry, PhaseCode, Project, Proponent, Region, SpecialField, Staff,
+        SubstitutionAct, Work, WorkPhase, WorkStatus,
+    )
+
     def __init__(self, filters, color_intensity):
         """Initialize the ReportFactory"""
         data_keys = [
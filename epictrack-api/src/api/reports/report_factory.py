@@ -10,6 +10,9 @@ from pathlib import Path
 class ReportFactory(ABC):
     """Basic representation of report generator."""
 
+    # Models of the tables the report is generated from, a change to any of them changes its data version
+    source_models: tuple = ()
+
     def __init__(self, data_keys, group_by=None, template_name=None, filters=None, color_intensity=None):
         """Constructor"""
         self.data_keys = data_keys
@@ -7,6 +7,7 @@ from functools import partial
 from io import BytesIO
 from typing import IO, Dict, List, Tuple
 
+import numpy as np
 from dateutil import rrule
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
@@ -46,6 +47,11 @@ daterange = partial(func.daterange, type_=DATERANGE)
 class EAResourceForeCastReport(ReportFactory):
     """EA Resource Forecast Report Generator"""
 
+    source_models = (
+        EAAct, EAOTeam, Event, EventConfiguration, FederalInvolvement, PhaseCode, Project, Region, SpecialField,
+        Staff, StaffWorkRole, SubType, Type, Work, WorkPhase, WorkType,
+    )
+
     def __init__(self, filters, color_intensity):
         """Initialize the ReportFactory"""
         data_keys = [
@@ -130,10 +136,6 @@ class EAResourceForeCastReport(ReportFactory):
         }
         self.end_date = None
 
-    def _filter_work_events(self, work_id: int, events: List[Event]) -> List[Event]:
-        """Filter the events based on given work id"""
-        return [event for event in events if event["work_id"] == work_id]
-
     def _get_pdf_output_layout(self, report_date: datetime, available_width: float):
         """Returns the pdf output layout"""
         section_headings = []
@@ -340,9 +342,12 @@ class EAResourceForeCastReport(ReportFactory):
         response = []
         data = data.values()
         data = self._filter_data(data)
+        work_ids = [values[0]["work_id"] for values in data]
+        team_members = self._get_works_team_members(work_ids)
+        referral_timings = self._get_referral_timings(work_ids)
         for values in data:
             work_data = values[0]
-            staffs, cairt_lead, responsible_epd, work_lead = self._get_work_team_members(work_data["work_id"])
+            staffs, cairt_lead, responsible_epd, work_lead = team_members[work_data["work_id"]]
             work_data["cairt_lead"] = cairt_lead
             work_data["responsible_epd"] = responsible_epd
             work_data["work_lead"] = work_lead
@@ -351,7 +356,7 @@ class EAResourceForeCastReport(ReportFactory):
                 work_data["capital_investment"] = (
                     f"{work_data['capital_investment']:,.0f}"
                 )
-            work_data = self._handle_months(work_data)
+            work_data = self._handle_months(work_data, referral_timings.get(work_data["work_id"]))
             response.append(work_data)
         return response
 
@@ -363,7 +368,6 @@ class EAResourceForeCastReport(ReportFactory):
         works = super()._format_data(works)
         events = self._get_events(work_ids)
         start_events = self._filter_start_events(events)
-        start_events = {y: self._filter_work_events(y, start_events) for y in work_ids}
         work_data = self._update_month_labels(works, start_events)
         special_histories = self._fetch_works_special_history(work_ids, report_date)
         work_data = self._update_special_history(work_data, special_histories)
@@ -382,38 +386,61 @@ class EAResourceForeCastReport(ReportFactory):
 
     def _update_month_labels(self, works, start_events):
         """Update month labels in the work result"""
+        phase_colors = {
+            color: color_with_opacity(color, self.color_intensity)
+            for color in {event["phase_color"] for event in start_events}
+        }
+        start_events = [
+            (event["work_id"], event["start_date"], event["event_phase"], phase_colors[event["phase_color"]])
+            for event in start_events
+        ]
+        return self._set_month_phases(works, start_events)
+
+    def _set_month_phases(self, works, start_events) -> dict:
+        """Set the phase label and color of every month in the work result
+
+        start_events holds (work_id, start_date, phase, color) tuples. The phase of a
+        month is the one of the latest start event on or before the end of the month.
+        """
+        work_ids = list(works.keys())
+        labels, month_colors = self._month_phase_grid(work_ids, start_events)
         results = defaultdict(list)
-        for work_id, work_data in works.items():
+        for row, work_id in enumerate(work_ids):
+            work_data = works[work_id]
             work = work_data[0]
-            for index, month in enumerate(self.months[1:]):
-                month_events = list(
-                    filter(
-                        lambda x: x["start_date"].date() <= month,
-                        start_events[work_id],
-                    )
-                )
-                if month_events:
-                    month_events = sorted(month_events, key=lambda x: x["start_date"])
-                    latest_event = month_events[-1]
-                    work.update(
-                        {
-                            self.month_labels[index]: latest_event["event_phase"],
-                            f"{self.month_labels[index]}_color": color_with_opacity(
-                                latest_event["phase_color"], self.color_intensity
-                            ),
-                        }
-                    )
-                else:
-                    work.update(
-                        {
-                            self.month_labels[index]: "",
-                            f"{self.month_labels[index]}_color": "#FFFFFF",
-                        }
-                    )
-            work_data[0] = work
+            for index, month_label in enumerate(self.month_labels):
+                work[month_label] = labels[row, index]
+                work[f"{month_label}_color"] = month_colors[row, index]
             results[work_id] = work_data
         return results
 
+    def _month_phase_grid(self, work_ids: List[int], start_events) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the phase labels and colors of the works (rows) at the end of each month (columns)"""
+        month_ordinals = np.array([month.toordinal() for month in self.months[1:]], dtype=np.int64)
+        labels = np.full((len(work_ids), len(month_ordinals)), "", dtype=object)
+        month_colors = np.full((len(work_ids), len(month_ordinals)), "#FFFFFF", dtype=object)
+        work_positions = {work_id: position for position, work_id in enumerate(work_ids)}
+        start_events = [event for event in start_events if event[0] in work_positions]
+        if not start_events or month_ordinals.size == 0:
+            return labels, month_colors
+        event_positions = np.array([work_positions[event[0]] for event in start_events], dtype=np.int64)
+        event_ordinals = np.array([event[1].date().toordinal() for event in start_events], dtype=np.int64)
+        phases = np.array([event[2] for event in start_events], dtype=object)
+        event_colors = np.array([event[3] for event in start_events], dtype=object)
+        # Events are keyed by work position then date, so a single sorted array covers
+        # all the works. The sort is stable so that ties keep their original order.
+        base = min(event_ordinals.min(), month_ordinals.min())
+        span = max(event_ordinals.max(), month_ordinals.max()) - base + 1
+        keys = event_positions * span + (event_ordinals - base)
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        rows = np.arange(len(work_ids), dtype=np.int64)[:, None]
+        indexes = np.searchsorted(keys, rows * span + (month_ordinals - base)[None, :], side="right") - 1
+        found = (indexes >= 0) & (event_positions[order][indexes.clip(0)] == rows)
+        labels[found] = phases[order][indexes[found]]
+        month_colors[found] = event_colors[order][indexes[found]]
+        return labels, month_colors
+
     def _filter_start_events(self, events: [Event]) -> [Event]:
         """Filter the start events of each phase per work"""
         start_events = [
@@ -613,40 +640,23 @@ class EAResourceForeCastReport(ReportFactory):
 
     def _prepare_fetch_results(self, works, events) -> dict:
         """Matches events with corresponding works and returns formatted data"""
-        results = defaultdict(list)
-        for work_id, work_data in works.items():
-            work = work_data[0]
-            for index, month in enumerate(self.months[1:]):
-                month_events = list(
-                    filter(
-                        lambda x: x.start_date.date() <= month,
-                        events[work_id],
-                    )
-                )
-                if month_events:
-                    month_events = sorted(month_events, key=lambda x: x.start_date)
-                    latest_event = month_events[-1]
-                    work.update(
-                        {
-                            self.month_labels[index]: latest_event.event_phase,
-                            f"{self.month_labels[index]}_color": latest_event.phase_color,
-                        }
-                    )
-                else:
-                    work.update(
-                        {
-                            self.month_labels[index]: "",
-                            f"{self.month_labels[index]}_color": "#FFFFFF",
-                        }
-                    )
-            work_data[0] = work
-            results[work_id] = work_data
-        return results
+        start_events = [
+            (work_id, event.start_date, event.event_phase, event.phase_color)
+            for work_id, work_events in events.items()
+            for event in work_events
+        ]
+        return self._set_month_phases(works, start_events)
 
-    def _get_referral_timing(self, work_id) -> Event:
-        """Find the referral event for given work id"""
-        referral_date = (
-            db.session.query(func.coalesce(Event.actual_date, Event.anticipated_date))
+    def _get_referral_timings(self, work_ids: List[int]) -> Dict[int, datetime]:
+        """Find the referral date of the latest open regular phase of each given work"""
+        referral_dates = (
+            db.session.query(
+                WorkPhase.work_id.label("work_id"),
+                func.coalesce(Event.actual_date, Event.anticipated_date).label("referral_date"),
+                func.row_number()
+                .over(partition_by=WorkPhase.work_id, order_by=WorkPhase.sort_order.desc())
+                .label("row_number"),
+            )
             .join(
                 EventConfiguration,
                 and_(
@@ -664,35 +674,35 @@ class EAResourceForeCastReport(ReportFactory):
                     WorkPhase.is_deleted.is_(False),
                     WorkPhase.visibility == PhaseVisibilityEnum.REGULAR.value,
                     WorkPhase.is_completed.is_(False),
-                    WorkPhase.work_id == work_id,
+                    WorkPhase.work_id.in_(work_ids),
                 ),
             )
-            .order_by(WorkPhase.sort_order.desc())
-            .limit(1)
-            .scalar()
+            .subquery()
         )
-        return referral_date
-
-    def _get_work_team_members(self, work_id) -> Tuple[List[str], str]:
-        """Fetch and return team members by work id"""
-        staffs = []
-        cairt_lead = ""
-        responsible_epd = ""
-        work_lead = ""
+        return dict(
+            db.session.query(referral_dates.c.work_id, referral_dates.c.referral_date)
+            .filter(referral_dates.c.row_number == 1)
+            .all()
+        )
+
+    def _get_works_team_members(self, work_ids: List[int]) -> Dict[int, Tuple[List[str], str, str, str]]:
+        """Fetch and return team members, cairt lead, responsible epd and work lead by work id"""
+        team_members = defaultdict(lambda: ([], "", "", ""))
         work_team_members = (
             db.session.query(StaffWorkRole)
-            .filter(StaffWorkRole.work_id == work_id)
+            .filter(StaffWorkRole.work_id.in_(work_ids))
             .join(Staff, Staff.id == StaffWorkRole.staff_id)
-            .add_columns(
+            .with_entities(
+                StaffWorkRole.work_id.label("work_id"),
                 Staff.first_name.label("first_name"),
                 Staff.last_name.label("last_name"),
                 Staff.full_name.label("full_name"),
                 StaffWorkRole.role_id.label("role_id"),
             )
+            .order_by(Staff.last_name, StaffWorkRole.id)
         )
         for work_team_member in work_team_members:
-            first_name = work_team_member.first_name
-            last_name = work_team_member.last_name
+            staffs, cairt_lead, responsible_epd, work_lead = team_members[work_team_member.work_id]
             if work_team_member.role_id == RoleEnum.FN_CAIRT.value:
                 cairt_lead = work_team_member.full_name
             if work_team_member.role_id == RoleEnum.TEAM_LEAD.value:
@@ -700,10 +710,9 @@ class EAResourceForeCastReport(ReportFactory):
             if work_team_member.role_id == RoleEnum.RESPONSIBLE_EPD.value:
                 responsible_epd = work_team_member.full_name
             elif work_team_member.role_id in [RoleEnum.OFFICER_ANALYST.value, RoleEnum.OTHER.value]:
-                staffs.append({"first_name": first_name, "last_name": last_name})
-        staffs = sorted(staffs, key=lambda x: x["last_name"])
-        staffs = [f"{x['last_name']}, {x['first_name']}" for x in staffs]
-        return staffs, cairt_lead, responsible_epd, work_lead
+                staffs.append(f"{work_team_member.last_name}, {work_team_member.first_name}")
+            team_members[work_team_member.work_id] = (staffs, cairt_lead, responsible_epd, work_lead)
+        return team_members
 
     def _get_styles(self) -> Tuple[dict, dict]:
         """Returns basic styles needed for the PDF report."""
@@ -776,9 +785,8 @@ class EAResourceForeCastReport(ReportFactory):
                 row_index += 1
         return table_data, styles
 
-    def _handle_months(self, work_data) -> dict:
+    def _handle_months(self, work_data, referral_date: datetime) -> dict:
         """Update the work data to include relevant month information."""
-        referral_date = self._get_referral_timing(work_data["work_id"])
         work_data["referral_timing"] = f"{referral_date:%B %d, %Y}"
         months = []
         referral_month_index = len(self.month_labels)
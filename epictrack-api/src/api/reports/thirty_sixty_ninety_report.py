@@ -20,7 +20,7 @@ from api.models import Event, Project, Work, WorkStatus, WorkType, db
 from api.models.event_category import EventCategoryEnum
 from api.models.event_configuration import EventConfiguration
 from api.models.event_type import EventTypeEnum
-from api.models.special_field import EntityEnum
+from api.models.special_field import EntityEnum, SpecialField
 from api.models.work import WorkStateEnum
 from api.models.work_issues import WorkIssues
 from api.services.special_field import SpecialFieldService
@@ -36,6 +36,8 @@ from .report_factory import ReportFactory
 class ThirtySixtyNinetyReport(ReportFactory):
     """EA 30-60-90 Report Generator"""
 
+    source_models = (Event, EventConfiguration, Project, SpecialField, Work, WorkIssues, WorkStatus, WorkType)
+
     def __init__(self, filters, color_intensity):
         """Initialize the ReportFactory"""
         data_keys = [
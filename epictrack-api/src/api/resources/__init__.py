@@ -53,6 +53,7 @@ from .reminder_configuration import API as REMINDER_CONFIGURATION_API
 from .reports import API as REPORTS_API
 from .responsibility import API as RESPONSIBILITY_API
 from .role import API as ROLES_API
+from .search import API as SEARCH_API
 from .special_field import API as SPECIAL_FIELD_API
 from .staff import API as STAFF_API
 from .sub_types import API as SUB_TYPES_API
@@ -132,6 +133,7 @@ API.add_namespace(EAO_TEAM_API, path='/eao-teams')
 API.add_namespace(INDIGENOUS_CONSULTATION_LEVEL_API, path='/indigenous-nations-consultation-levels')
 API.add_namespace(MINISTRY_API, path='/ministries')
 API.add_namespace(EA_ACT_API, path='/ea-acts')
+API.add_namespace(SEARCH_API, path='/search')
 API.add_namespace(TYPES_API, path='/types')
 API.add_namespace(FEDERAL_INVOLVEMENT_API, path='/federal-involvements')
 API.add_namespace(ROLES_API, path='/roles')
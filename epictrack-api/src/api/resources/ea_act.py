@@ -36,7 +36,7 @@ class EAActs(Resource):
     @cors.crossdomain(origin="*")
     @auth.require
     @profiletime
-    @AppCache.cache.cached(timeout=constants.CACHE_DAY_TIMEOUT)
+    @AppCache.cached(timeout=constants.CACHE_DAY_TIMEOUT)
     def get():
         """Return all EA Acts."""
         ea_acts = EAActService.find_all()
@@ -36,7 +36,7 @@ class EAOTEAM(Resource):
     @cors.crossdomain(origin="*")
     @auth.require
     @profiletime
-    @AppCache.cache.cached(timeout=constants.CACHE_DAY_TIMEOUT)
+    @AppCache.cached(timeout=constants.CACHE_DAY_TIMEOUT)
     def get():
         """Return all eao teams."""
         eao_teams = EAOTeamService.find_all_teams()
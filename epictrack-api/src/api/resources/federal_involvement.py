@@ -35,7 +35,7 @@ class FederalInvolvements(Resource):
     @staticmethod
     @cors.crossdomain(origin='*')
     @auth.require
-    @AppCache.cache.cached(timeout=constants.CACHE_DAY_TIMEOUT, query_string=True)
+    @AppCache.cached(timeout=constants.CACHE_DAY_TIMEOUT, query_string=True)
     @profiletime
     def get():
         """Return all federal involvements."""
@@ -34,7 +34,7 @@ class ConsultationLevel(Resource):
     @cors.crossdomain(origin="*")
     @auth.require
     @profiletime
-    @AppCache.cache.cached(timeout=constants.CACHE_DAY_TIMEOUT, query_string=True)
+    @AppCache.cached(timeout=constants.CACHE_DAY_TIMEOUT, query_string=True)
     def get():
         """Return all consultation levels."""
         levels = IndigenousConsultationLevelService.find_all_consultation_levels(is_active=True)
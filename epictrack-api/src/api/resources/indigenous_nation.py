@@ -147,4 +147,6 @@ class ImportIndigenousNations(Resource):
         """Import indigenous nations"""
         file = request.files["file"]
         response = IndigenousNationService.import_indigenous_nations(file)
+        if response["errors"]:
+            return response, HTTPStatus.UNPROCESSABLE_ENTITY
         return response, HTTPStatus.CREATED
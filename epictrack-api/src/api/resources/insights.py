@@ -42,6 +42,21 @@ class Works(Resource):
         return jsonify(work_insights), HTTPStatus.OK
 
 
+@cors_preflight("GET")
+@API.route("/works/all", methods=["GET", "OPTIONS"])
+class AllWorks(Resource):
+    """Endpoint resource to return every work and project insight grouping"""
+
+    @staticmethod
+    @cors.crossdomain(origin="*")
+    @auth.require
+    @profiletime
+    def get():
+        """Return work and project insights for every group by param."""
+        work_insights = InsightService.fetch_all_work_insights()
+        return jsonify(work_insights), HTTPStatus.OK
+
+
 @cors_preflight("GET")
 @API.route("/works/assessment", methods=["GET", "OPTIONS"])
 class AssessmentWorks(Resource):
@@ -12,10 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Endpoints to check and manage the health of the service."""
+from flask import current_app, make_response
 from flask_restx import Namespace, Resource
 from sqlalchemy import exc, text
 
 from api.models import db
+from api.utils.metrics import REGISTRY, render_pool
 
 
 API = Namespace('OPS', description='Service - OPS checks')
@@ -51,3 +53,17 @@ class Readyz(Resource):
         """Return a JSON object that identifies if the service is setupAnd ready to work."""
         # TODO: add a poll to the DB when called
         return {'message': 'api is ready'}, 200
+
+
+@API.route('metrics')
+class Metrics(Resource):
+    """Exposes the request metrics of this worker."""
+
+    @staticmethod
+    def get():
+        """Return the request, query, serialization and connection pool metrics in Prometheus text format."""
+        pool_metrics = render_pool(db.engine.pool, current_app.config['DB_MAX_OVERFLOW'])
+        response = make_response(REGISTRY.render() + pool_metrics)
+        response.mimetype = 'text/plain'
+        response.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+        return response
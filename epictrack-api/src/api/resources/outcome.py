@@ -34,7 +34,7 @@ class Outcomes(Resource):
     @staticmethod
     @cors.crossdomain(origin='*')
     @auth.require
-    @AppCache.cache.cached(timeout=constants.CACHE_DAY_TIMEOUT)
+    @AppCache.cached(timeout=constants.CACHE_DAY_TIMEOUT)
     @profiletime
     def get(milestone_id):
         """Return all outcomes based on milestone_id."""
@@ -51,7 +51,7 @@ class ActiveOutcomes(Resource):
     @staticmethod
     @cors.crossdomain(origin='*')
     @auth.require
-    @AppCache.cache.cached(timeout=constants.CACHE_DAY_TIMEOUT)
+    @AppCache.cached(timeout=constants.CACHE_DAY_TIMEOUT)
     @profiletime
     def get():
         """Return single milestone based on the milestone id given"""
@@ -17,6 +17,7 @@ from http import HTTPStatus
 from flask import jsonify, request
 from flask_restx import Namespace, Resource, cors
 
+from api.models.outcome_configuration import OUTCOME_CONFIGURATION_CACHE_TAG
 from api.schemas import request as req
 from api.schemas import response as res
 from api.services.outcome_configuration import OutcomeConfigurationService
@@ -36,7 +37,7 @@ class OutcomeConfigurations(Resource):
     @staticmethod
     @cors.crossdomain(origin='*')
     @auth.require
-    @AppCache.cache.cached(timeout=constants.CACHE_DAY_TIMEOUT, query_string=True)
+    @AppCache.cached(timeout=constants.CACHE_DAY_TIMEOUT, query_string=True, tag=OUTCOME_CONFIGURATION_CACHE_TAG)
     @profiletime
     def get():
         """Return all outcomes based on milestone_id."""
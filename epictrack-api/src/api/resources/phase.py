@@ -36,7 +36,7 @@ class PhasesByEaActWorkType(Resource):
     @staticmethod
     @cors.crossdomain('*')
     @auth.require
-    @AppCache.cache.cached(timeout=constants.CACHE_DAY_TIMEOUT)
+    @AppCache.cached(timeout=constants.CACHE_DAY_TIMEOUT)
     @profiletime
     def get(ea_act_id, work_type_id):
         """Return all phase codes based on ea_act_id and work_type_id."""
@@ -52,7 +52,7 @@ class Phases(Resource):
     @staticmethod
     @cors.crossdomain('*')
     @auth.require
-    @AppCache.cache.cached(timeout=constants.CACHE_DAY_TIMEOUT)
+    @AppCache.cached(timeout=constants.CACHE_DAY_TIMEOUT)
     @profiletime
     def get():
         """Returns all the phase codes regardless of act or work type"""
@@ -36,7 +36,7 @@ class PIPOrgTypes(Resource):
     @cors.crossdomain(origin="*")
     @auth.require
     @profiletime
-    @AppCache.cache.cached(timeout=constants.CACHE_DAY_TIMEOUT, query_string=True)
+    @AppCache.cached(timeout=constants.CACHE_DAY_TIMEOUT, query_string=True)
     def get():
         """Return all PIP Org Types."""
         pip_org_types = PIPOrgTypeService.find_all()
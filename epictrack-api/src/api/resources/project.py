@@ -195,6 +195,8 @@ class ImportProjects(Resource):
         """Import projects"""
         file = request.files["file"]
         response = ProjectService.import_projects(file)
+        if response["errors"]:
+            return response, HTTPStatus.UNPROCESSABLE_ENTITY
         return response, HTTPStatus.CREATED
 
 
@@ -225,7 +227,7 @@ class ProjectTypes(Resource):
     @cors.crossdomain(origin="*")
     @auth.require
     @profiletime
-    @AppCache.cache.cached(timeout=constants.CACHE_DAY_TIMEOUT, query_string=True)
+    @AppCache.cached(timeout=constants.CACHE_DAY_TIMEOUT, query_string=True)
     def get():
         """Return all project types."""
         project_types = ProjectService.find_all_project_types()
@@ -123,4 +123,6 @@ class ImportProponents(Resource):
         """Import proponents"""
         file = request.files["file"]
         response = ProponentService.import_proponents(file)
+        if response["errors"]:
+            return response, HTTPStatus.UNPROCESSABLE_ENTITY
         return response, HTTPStatus.CREATED
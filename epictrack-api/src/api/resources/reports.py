@@ -19,8 +19,12 @@ from io import BytesIO
 from flask import jsonify, send_file
 from flask_restx import Namespace, Resource, cors
 
+from api.exceptions import UnprocessableEntityError
+from api.models import ReportJobStatusEnum
+from api.models.report_job import IN_FLIGHT_STATUSES
 from api.schemas.event_calendar import EventCalendarSchema
-from api.services import ReportService
+from api.schemas.response import ReportJobResponseSchema
+from api.services import ReportJobService, ReportService
 from api.services.event import EventService
 from api.utils import auth, profiletime
 from api.utils.util import cors_preflight
@@ -99,3 +103,62 @@ class FileReport(Resource):
                 BytesIO(report), as_attachment=True, download_name=file_name
             )
         return report, HTTPStatus.NO_CONTENT
+
+
+@cors_preflight("POST")
+@API.route("/jobs/<string:report_type>", methods=["POST", "OPTIONS"])
+class ReportJobs(Resource):
+    """Endpoint resource to queue the generation of report files"""
+
+    @staticmethod
+    @cors.crossdomain(origin="*")
+    @auth.require
+    @profiletime
+    def post(report_type):
+        """Queue the generation of the report file for the given date."""
+        report_date = datetime.strptime(API.payload["report_date"], "%Y-%m-%d").date()
+        job = ReportJobService.submit_job(
+            report_type,
+            report_date,
+            filters=API.payload.get("filters", None),
+            color_intensity=API.payload.get("color_intensity", None),
+        )
+        return ReportJobResponseSchema().dump(job), HTTPStatus.ACCEPTED
+
+
+@cors_preflight("GET")
+@API.route("/jobs/<string:job_id>", methods=["GET", "OPTIONS"])
+class ReportJob(Resource):
+    """Endpoint resource to follow a report job"""
+
+    @staticmethod
+    @cors.crossdomain(origin="*")
+    @auth.require
+    @profiletime
+    def get(job_id):
+        """Return the status of the report job."""
+        job = ReportJobService.find_job(job_id)
+        return ReportJobResponseSchema().dump(job), HTTPStatus.OK
+
+
+@cors_preflight("GET")
+@API.route("/jobs/<string:job_id>/file", methods=["GET", "OPTIONS"])
+class ReportJobFile(Resource):
+    """Endpoint resource to download the file of a report job"""
+
+    @staticmethod
+    @cors.crossdomain(origin="*")
+    @auth.require
+    @profiletime
+    def get(job_id):
+        """Return the generated report file, or the job status while it is being generated."""
+        job = ReportJobService.find_job(job_id)
+        if job.status in IN_FLIGHT_STATUSES:
+            return ReportJobResponseSchema().dump(job), HTTPStatus.ACCEPTED
+        if job.status == ReportJobStatusEnum.FAILED:
+            raise UnprocessableEntityError(f"Report job '{job_id}' failed")
+        if job.content is None:
+            return {}, HTTPStatus.NO_CONTENT
+        return send_file(
+            BytesIO(job.content), as_attachment=True, download_name=job.file_name
+        )
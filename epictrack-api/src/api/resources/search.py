@@ -0,0 +1,42 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Resource for Search endpoints."""
+from http import HTTPStatus
+
+from flask import jsonify, request
+from flask_restx import Namespace, Resource, cors
+
+from api.schemas import request as req
+from api.services import SearchService
+from api.utils import auth, profiletime
+from api.utils.util import cors_preflight
+
+
+API = Namespace("search", description="Search")
+
+
+@cors_preflight("GET")
+@API.route("", methods=["GET", "OPTIONS"])
+class Search(Resource):
+    """Endpoint resource to search works, projects, proponents and staff"""
+
+    @staticmethod
+    @cors.crossdomain(origin="*")
+    @auth.require
+    @profiletime
+    def get():
+        """Return the entities matching the search text, the best ranked first."""
+        args = req.SearchQueryParameterSchema().load(request.args)
+        results = SearchService.search(args["text"], args["limit"])
+        return jsonify(results), HTTPStatus.OK
@@ -167,4 +167,6 @@ class ImportStaffs(Resource):
         """Import staffs"""
         file = request.files["file"]
         response = StaffService.import_staffs(file)
+        if response["errors"]:
+            return response, HTTPStatus.UNPROCESSABLE_ENTITY
         return response, HTTPStatus.CREATED
@@ -37,7 +37,7 @@ class SubTypes(Resource):
     @cors.crossdomain(origin="*")
     @auth.require
     @profiletime
-    @AppCache.cache.cached(timeout=constants.CACHE_DAY_TIMEOUT, query_string=True)
+    @AppCache.cached(timeout=constants.CACHE_DAY_TIMEOUT, query_string=True)
     def get():
         """Return all sub_types based on type_id."""
         req.TypeIdPathParameterSchema().load(request.args)
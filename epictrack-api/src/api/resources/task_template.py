@@ -17,6 +17,7 @@ from http import HTTPStatus
 from flask import jsonify, request
 from flask_restx import Namespace, Resource, cors
 
+from api.models.task_template import TASK_TEMPLATE_CACHE_TAG
 from api.schemas import request as req
 from api.schemas import response as res
 from api.services import TaskTemplateService
@@ -67,7 +68,7 @@ class TemplateTasks(Resource):
     @cors.crossdomain(origin="*")
     @auth.require
     @profiletime
-    @AppCache.cache.cached(timeout=constants.CACHE_DAY_TIMEOUT, query_string=True)
+    @AppCache.cached(timeout=constants.CACHE_DAY_TIMEOUT, query_string=True, tag=TASK_TEMPLATE_CACHE_TAG)
     def get(template_id):
         """Return all tasks for the template."""
         req.TaskTemplateIdPathParameterSchema().load(request.view_args)
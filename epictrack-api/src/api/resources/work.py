@@ -13,7 +13,6 @@
 # limitations under the License.
 """Resource for work endpoints."""
 from http import HTTPStatus
-from io import BytesIO
 
 from flask import jsonify, request, send_file
 from flask_restx import Namespace, Resource, cors
@@ -22,12 +21,14 @@ from api.models.dashboard_seach_options import WorkplanDashboardSearchOptions
 from api.models.pagination_options import PaginationOptions
 from api.schemas import request as req
 from api.schemas import response as res
+from api.schemas.loading import cached_schema
 from api.services import WorkService
 from api.services.work_phase import WorkPhaseService
 from api.utils import auth, constants, profiletime
 from api.utils.caching import AppCache
 from api.utils.datetime_helper import get_start_of_day
 from api.utils.util import cors_preflight
+from api.utils.xlsx_export import XLSX_MIMETYPE
 from api.models.work_phase import WorkPhase
 
 API = Namespace("works", description="Works")
@@ -63,14 +64,20 @@ class WorkDashboard(Resource):
     @cors.crossdomain(origin="*")
     @auth.require
     def get():
-        """Return all active works."""
+        """Return all active works.
+
+        The works are paged by the page number, or by the cursor of the previous
+        page when a cursor is given, empty for the first page.
+        """
         args = request.args
 
         pagination_options = PaginationOptions(
             page=args.get('page', None, int),
             size=args.get('size', None, int),
-            sort_key=args.get('sort_key', 'name', str),
-            sort_order=args.get('sort_order', 'asc', str),
+            sort_key=args.get('sort_key', None, str),
+            sort_order=args.get('sort_order', None, str),
+            cursor=args.get('cursor', None, str),
+            approximate_total=args.get('approximate_total', False, type=lambda v: v.lower() == 'true'),
         )
         search_options = WorkplanDashboardSearchOptions(
             teams=list(map(int, args.getlist('teams[]'))),
@@ -99,9 +106,9 @@ class Works(Resource):
         request_args = req.WorkQueryParameterSchema().load(request.args)
         is_active = request_args.get("is_active", None)
         include_indigenous_nations = request_args.get('include_indigenous_nations')
-        works = WorkService.find_all_works(is_active)
-        exclude = [] if include_indigenous_nations else ['indigenous_works']
-        works_schema = res.WorkResponseSchema(many=True, exclude=exclude)
+        exclude = () if include_indigenous_nations else ('indigenous_works',)
+        works_schema = cached_schema(res.WorkResponseSchema, exclude=exclude, many=True)
+        works = WorkService.find_all_works(is_active, works_schema)
 
         return jsonify(works_schema.dump(works)), HTTPStatus.OK
 
@@ -280,7 +287,7 @@ class WorkPlan(Resource):
         work_phase_id = args.get("work_phase_id")
         file = WorkService.generate_workplan(work_phase_id)
         return send_file(
-            BytesIO(file), as_attachment=True, download_name="work_plan.xlsx"
+            file, as_attachment=True, mimetype=XLSX_MIMETYPE, download_name="work_plan.xlsx"
         )
 
 
@@ -443,7 +450,7 @@ class WorkFirstNationsDownload(Resource):
         req.WorkIdPathParameterSchema().load(request.view_args)
         file = WorkService.generate_first_nations_excel(work_id)
         return send_file(
-            BytesIO(file), as_attachment=True, download_name="first_nations.xlsx"
+            file, as_attachment=True, mimetype=XLSX_MIMETYPE, download_name="first_nations.xlsx"
         )
 
 
@@ -495,7 +502,7 @@ class WorkTypes(Resource):
     @staticmethod
     @cors.crossdomain(origin="*")
     @auth.require
-    @AppCache.cache.cached(timeout=constants.CACHE_DAY_TIMEOUT)
+    @AppCache.cached(timeout=constants.CACHE_DAY_TIMEOUT)
     @profiletime
     def get():
         """Return all active works."""
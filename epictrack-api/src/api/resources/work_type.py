@@ -34,7 +34,7 @@ class WorkTypes(Resource):
     @staticmethod
     @cors.crossdomain(origin="*")
     @auth.require
-    @AppCache.cache.cached(timeout=constants.CACHE_DAY_TIMEOUT)
+    @AppCache.cached(timeout=constants.CACHE_DAY_TIMEOUT)
     @profiletime
     def get():
         """Return all active work types."""
@@ -0,0 +1,49 @@
+"""Eager loading planned from the fields a schema dumps, and schemas reused across dumps"""
+from functools import lru_cache
+from typing import Optional, Tuple, Type
+
+from marshmallow import Schema, fields
+from sqlalchemy import inspect
+from sqlalchemy.orm import selectinload
+
+
+@lru_cache(maxsize=None)
+def cached_schema(
+    schema_class: Type[Schema],
+    only: Optional[Tuple[str, ...]] = None,
+    exclude: Tuple[str, ...] = (),
+    many: bool = False,
+) -> Schema:
+    """Return the schema for the options, instantiated on the first call only
+
+    Instantiating a schema binds and copies all its declared fields, which costs more
+    than dumping a row. The returned schema is shared, so it must not be modified.
+    """
+    return schema_class(only=only, exclude=exclude, many=many)
+
+
+def schema_loader_options(schema: Schema, model) -> list:
+    """Loader options selecting in the relationships of the model which the schema dumps
+
+    Only the nested fields left by the only and exclude options of the schema are
+    loaded, along with the relationships their own nested fields dump.
+    """
+    relationships = inspect(model).relationships
+    options = []
+    for field in schema.dump_fields.values():
+        nested_schema = _nested_schema(field)
+        name = field.attribute or field.name
+        if nested_schema is None or name not in relationships:
+            continue
+        nested_options = schema_loader_options(nested_schema, relationships[name].mapper.class_)
+        options.append(selectinload(getattr(model, name)).options(*nested_options))
+    return options
+
+
+def _nested_schema(field: fields.Field) -> Optional[Schema]:
+    """Return the schema of a nested field, or of the nested items of a list field"""
+    if isinstance(field, fields.List):
+        field = field.inner
+    if isinstance(field, fields.Nested):
+        return field.schema
+    return None
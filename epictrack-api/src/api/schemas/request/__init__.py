@@ -63,6 +63,7 @@ from .proponent_request import (
 from .reminder_configuration_request import (
     ReminderConfigurationExistenceQueryParamSchema,
 )
+from .search_request import SearchQueryParameterSchema
 from .special_field_request import (
     SpecialFieldBodyParameterSchema,
     SpecialFieldIdPathParameterSchema,
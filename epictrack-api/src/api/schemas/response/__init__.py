@@ -31,6 +31,7 @@ from .outcome_template_response import OutcomeTemplateResponseSchema
 from .phase_response import PhaseResponseSchema
 from .project_response import ProjectResponseSchema
 from .proponent_response import ProponentResponseSchema
+from .report_job_response import ReportJobResponseSchema
 from .responsibility_response import ResponsibilityResponseSchema
 from .role_response import RoleResponseSchema
 from .special_field_response import SpecialFieldResponseSchema
@@ -0,0 +1,42 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Report job response schema"""
+from marshmallow import EXCLUDE, fields
+
+from api.models import ReportJob
+from api.schemas.base import AutoSchemaBase
+
+
+class ReportJobResponseSchema(
+    AutoSchemaBase
+):  # pylint: disable=too-many-ancestors,too-few-public-methods
+    """Report job response schema"""
+
+    class Meta(AutoSchemaBase.Meta):
+        """Meta information"""
+
+        model = ReportJob
+        unknown = EXCLUDE
+        exclude = ("job_key", "content")
+
+    status = fields.Method("get_status")
+    has_file = fields.Method("get_has_file")
+
+    def get_status(self, obj: ReportJob) -> str:
+        """Get the status name"""
+        return obj.status.value
+
+    def get_has_file(self, obj: ReportJob) -> bool:
+        """Whether the job generated a file"""
+        return obj.content is not None
@@ -66,7 +66,7 @@ class WorkResponseSchema(
         model = Work
         include_fk = True
         unknown = EXCLUDE
-        exclude = ("created_by", "updated_at", "updated_by", "is_deleted")
+        exclude = ("created_by", "updated_at", "updated_by", "is_deleted", "normalized_title")
 
     project = fields.Nested(
         ProjectResponseSchema(exclude=("created_by", "updated_at", "updated_by", "is_deleted")), dump_only=True)
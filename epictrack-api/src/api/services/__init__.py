@@ -15,6 +15,7 @@
 
 from .act_section import ActSectionService
 from .action_template import ActionTemplateService
+from .bulk_import import BulkImportService
 from .code import CodeService
 from .eao_team_service import EAOTeamService
 from .event import EventService
@@ -32,7 +33,9 @@ from .proponent import ProponentService
 from .region import RegionService
 from .reminder_configuration import ReminderConfigurationService
 from .report import ReportService
+from .report_job import ReportJobService
 from .responsibility import ResponsibilityService
+from .search import SearchService
 from .staff import StaffService
 from .sub_type import SubTypeService
 from .task import TaskService
@@ -2,13 +2,17 @@
 
 This module is to handle authorization related queries.
 """
+from typing import Dict, Set
 
+from flask import current_app, g, has_app_context
 from flask_restx import abort
+from sqlalchemy import event
 
 from api.utils import TokenInfo
+from api.utils.caching import AppCache
 from api.utils.roles import Membership
-from api.models import Staff as StaffModel
 from api.models import StaffWorkRole as StaffWorkRoleModel
+from api.models.staff_work_role import STAFF_WORK_ROLE_CACHE_TAG
 
 
 # pylint: disable=unused-argument,inconsistent-return-statements
@@ -34,18 +38,50 @@ def _has_team_membership(kwargs, team_permitted_roles) -> bool:
     if not work_id:
         return False
 
-    email = TokenInfo.get_user_data()['email_id']
-    staff_model: StaffModel = StaffModel.find_by_email(email)
-
-    work_roles = StaffWorkRoleModel.find_by_params(
-        {"work_id": work_id, "staff_id": staff_model.id}
-    )
-    if not work_roles:
+    work_role_ids = _work_memberships().get(int(work_id))
+    if not work_role_ids:
         return False
 
     if Membership.TEAM_MEMBER in team_permitted_roles:
-        return bool(work_roles)
+        return bool(work_role_ids)
 
     membership_ids = {membership.value for membership in Membership}
 
-    return any(work_role.role_id in membership_ids for work_role in work_roles)
+    return bool(work_role_ids & membership_ids)
+
+
+def _work_memberships() -> Dict[int, Set[int]]:
+    """Return the role ids of the user in each of their works, resolved once per request
+
+    The memberships are also shared across the requests of the user for a short while,
+    under the version of the cache tag the staff work roles invalidate when they change.
+    Only a cache shared by all the workers is used, as the invalidation would not reach
+    the other workers of a per process cache and they would keep authorising revoked
+    memberships.
+    """
+    email = TokenInfo.get_user_data()['email_id']
+    request_memberships = g.setdefault('work_memberships', {})
+    memberships = request_memberships.get(email)
+    if memberships is not None:
+        return memberships
+
+    cache_key = None
+    if AppCache.is_shared():
+        subject = TokenInfo.get_id() or email
+        cache_key = f"memberships/{AppCache.tag_version(STAFF_WORK_ROLE_CACHE_TAG)}/{subject}"
+        memberships = AppCache.cache.get(cache_key)
+    if memberships is None:
+        memberships = StaffWorkRoleModel.find_memberships_by_email(email)
+        if cache_key:
+            AppCache.cache.set(cache_key, memberships, timeout=current_app.config['MEMBERSHIP_CACHE_TIMEOUT'])
+    request_memberships[email] = memberships
+    return memberships
+
+
+@event.listens_for(StaffWorkRoleModel, 'after_insert')
+@event.listens_for(StaffWorkRoleModel, 'after_update')
+@event.listens_for(StaffWorkRoleModel, 'after_delete')
+def _forget_request_memberships(mapper, connection, target):
+    """Resolve the memberships again in a request which changes the staff roles of works"""
+    if has_app_context():
+        g.pop('work_memberships', None)
@@ -0,0 +1,148 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Service to import master data sheets in bulk."""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from flask import current_app
+from psycopg2.extras import DateTimeTZRange
+from sqlalchemy import insert, select, update
+
+from api.models import db
+from api.models.special_field import EntityEnum, SpecialField
+from api.utils.token_info import TokenInfo
+
+
+# Rows of the sheet are numbered from 1 and the first one holds the headers
+FIRST_DATA_ROW = 2
+
+
+@dataclass(frozen=True)
+class ImportLookup:
+    """Replaces the names found in a column of the sheet by the ids they refer to"""
+
+    column: str
+    label: str
+    ids: Dict[Any, Any]
+
+
+class BulkImportService:  # pylint: disable=too-few-public-methods
+    """Service to import master data sheets in bulk"""
+
+    @classmethod
+    def build_lookup_ids(cls, query) -> Dict[Any, Any]:
+        """Return the ids of the rows selected by a (name, id) query, by name"""
+        return dict(db.session.execute(query).all())
+
+    @classmethod
+    def import_rows(  # pylint: disable=too-many-arguments,too-many-locals
+        cls,
+        model,
+        rows: List[dict],
+        key: str,
+        lookups: Iterable[ImportLookup] = (),
+        key_column=None,
+        entity: Optional[EntityEnum] = None,
+    ) -> dict:
+        """Insert the new rows, update the existing ones and disable the ones missing from the sheet.
+
+        The rows are matched to the existing ones by the key. When any row does not
+        validate nothing is written and the report lists the errors of each row.
+        """
+        key_column = getattr(model, key) if key_column is None else key_column
+        errors = cls._resolve_lookups(rows, key, lookups)
+        report = {"created": 0, "updated": 0, "disabled": 0, "errors": errors}
+        if errors:
+            return report
+
+        existing_ids = cls.build_lookup_ids(select(key_column, model.id))
+        username = TokenInfo.get_username()
+        new_rows = []
+        updated_rows = []
+        for row in rows:
+            if row[key] in existing_ids:
+                updated_rows.append(
+                    {**row, "id": existing_ids[row[key]], "is_active": True, "is_deleted": False,
+                     "updated_by": username}
+                )
+            else:
+                new_rows.append({**row, "created_by": username})
+        keys = {row[key] for row in rows}
+        disabled_ids = [id_ for name, id_ in existing_ids.items() if name not in keys]
+        if disabled_ids:
+            report["disabled"] = db.session.execute(
+                update(model)
+                .where(model.id.in_(disabled_ids))
+                .values(is_active=False, is_deleted=True, updated_by=username)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+        if updated_rows:
+            db.session.execute(update(model), updated_rows)
+            report["updated"] = len(updated_rows)
+        if new_rows:
+            created = db.session.execute(
+                insert(model).returning(model.id, sort_by_parameter_order=True), new_rows
+            ).scalars().all()
+            report["created"] = len(created)
+            if entity is not None:
+                cls._insert_name_history(entity, zip(created, new_rows), username)
+        db.session.commit()
+        current_app.logger.info(
+            f"Imported {model.__tablename__}: {report['created']} created, {report['updated']} updated, "
+            f"{report['disabled']} disabled"
+        )
+        return report
+
+    @classmethod
+    def _resolve_lookups(cls, rows: List[dict], key: str, lookups: Iterable[ImportLookup]) -> List[dict]:
+        """Replace the names of the lookup columns by ids and return the errors of each row"""
+        errors = []
+        seen_keys = set()
+        for index, row in enumerate(rows):
+            row_errors = []
+            if row[key] is None:
+                row_errors.append(f"{key} is required")
+            elif row[key] in seen_keys:
+                row_errors.append(f"{key} {row[key]} appears more than once")
+            seen_keys.add(row[key])
+            for lookup in lookups:
+                name = row[lookup.column]
+                if name is None:
+                    continue
+                row[lookup.column] = lookup.ids.get(name)
+                if row[lookup.column] is None:
+                    row_errors.append(f"{lookup.label} with name {name} does not exist")
+            if row_errors:
+                errors.append({"row": index + FIRST_DATA_ROW, "errors": row_errors})
+        return errors
+
+    @classmethod
+    def _insert_name_history(cls, entity: EntityEnum, created_rows, username: str) -> None:
+        """Start the name history of the created entities"""
+        time_range = DateTimeTZRange(datetime.now(), None, bounds="[)")
+        db.session.execute(
+            insert(SpecialField),
+            [
+                {
+                    "entity": entity,
+                    "entity_id": entity_id,
+                    "field_name": "name",
+                    "field_value": row["name"],
+                    "time_range": time_range,
+                    "created_by": username,
+                }
+                for entity_id, row in created_rows
+            ],
+        )
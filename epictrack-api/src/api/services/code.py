@@ -17,6 +17,7 @@ from flask import current_app
 from sqlalchemy import text
 
 from api.models import CodeTableVersioned
+from api.models.serializer import compile_serializer
 from api.utils.helpers import find_model_from_table_name
 
 
@@ -41,8 +42,13 @@ class CodeService:
             filters['is_deleted'] = False
         if hasattr(model, 'sort_order'):
             order_by_fields.insert(0, "sort_order")
-        for row in model.query.filter_by(**filters).order_by(text(",".join(order_by_fields))):
-            response['codes'].append(row.as_dict())
+        query = model.query.filter_by(**filters).order_by(text(",".join(order_by_fields)))
+        if hasattr(model, '__serialized_fields__'):
+            # Serialize through the compiled serializer, loading the nested rows it reads up front
+            serializer = compile_serializer(model)
+            response['codes'] = serializer.dump_many(query.options(*serializer.loader_options()))
+        else:
+            response['codes'] = [row.as_dict() for row in query]
 
         current_app.logger.debug('>find_code_values_by_type')
         return response
@@ -14,18 +14,20 @@
 """Service to manage Event."""
 import copy
 import functools
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import List
+from typing import Dict, List
 from flask import current_app
 
 import pytz
 
 from sqlalchemy import and_, extract, func, or_
+from sqlalchemy.orm import contains_eager, joinedload
 
 from api.actions.action_handler import ActionHandler
+from api.actions.context import ActionContext
 from api.exceptions import ResourceNotFoundError, UnprocessableEntityError
 from api.models import (
-    PRIMARY_CATEGORIES,
     CalendarEvent,
     Event,
     EventCategoryEnum,
@@ -40,18 +42,19 @@ from api.models import (
 from api.models.action import Action, ActionEnum
 from api.models.action_configuration import ActionConfiguration
 from api.models.event_template import EventPositionEnum
-from api.models.phase_code import PhaseCode, PhaseVisibilityEnum
+from api.models.phase_code import PhaseCode
 from api.models.project import Project
 from api.models.work_type import WorkType
 from api.services.outcome_configuration import OutcomeConfigurationService
 from api.utils import util
+from api.utils.start_at import start_at_days
 from api.application_constants import MIN_WORK_START_DATE
 
 from ..utils.roles import Membership
 from ..utils.roles import Role as KeycloakRole
 from . import authorisation
-from .event_configuration import EventConfigurationService
 from .common_service import find_event_date, event_compare_func
+from .work_schedule import WorkSchedule
 
 
 # pylint:disable=not-callable, too-many-lines
@@ -73,18 +76,15 @@ class EventService:
             one_of_roles=one_of_roles, work_id=current_work_phase.work_id
         )
 
-        all_work_events = cls.find_events(
-            current_work_phase.work_id, None, PRIMARY_CATEGORIES, True
-        )
+        schedule = WorkSchedule(current_work_phase.work_id)
         data["work_id"] = current_work_phase.work_id
         event = Event(**data)
         event = event.flush()
         if not current_app.config["SKIP_EVENT_LOGIC"]:
-            cls._process_events(
-                current_work_phase, event, all_work_events, push_events, None
-            )
-        cls._process_actions(event, data.get("outcome_id", None))
-        cls._post_process_actions(event)
+            cls._process_events(schedule, current_work_phase, event, push_events, None)
+        context = ActionContext(current_work_phase.work_id)
+        cls._process_actions(event, context, data.get("outcome_id", None))
+        cls._post_process_actions(event, context)
         if commit:
             db.session.commit()
         return event
@@ -108,9 +108,7 @@ class EventService:
             one_of_roles=one_of_roles, work_id=current_work_phase.work_id
         )
 
-        all_work_events = cls.find_events(
-            current_work_phase.work_id, None, PRIMARY_CATEGORIES, scoped=True
-        )
+        schedule = WorkSchedule(current_work_phase.work_id)
         if not event:
             raise ResourceNotFoundError("Event not found")
         if not event.is_active:
@@ -120,14 +118,15 @@ class EventService:
         if not event_old.actual_date:
             if not current_app.config["SKIP_EVENT_LOGIC"]:
                 cls._process_events(
+                    schedule,
                     current_work_phase,
                     event,
-                    all_work_events,
                     push_events,
                     event_old,
                 )
-            cls._process_actions(event, data.get("outcome_id", None))
-            cls._post_process_actions(event)
+            context = ActionContext(current_work_phase.work_id)
+            cls._process_actions(event, context, data.get("outcome_id", None))
+            cls._post_process_actions(event, context)
         if commit:
             db.session.commit()
         return event
@@ -161,13 +160,10 @@ class EventService:
             event_to_check, event_old, current_work_phase
         )
         if number_of_days_to_be_pushed != 0:
-            all_work_events = cls.find_events(
-                current_work_phase.work_id, None, PRIMARY_CATEGORIES
-            )
             result = cls._validate_event_effect_on_dates(
+                WorkSchedule(current_work_phase.work_id),
                 current_work_phase,
                 event_to_check,
-                all_work_events,
                 event_old,
                 number_of_days_to_be_pushed,
             )
@@ -178,9 +174,9 @@ class EventService:
     @classmethod
     def _validate_event_effect_on_dates(
         cls,
+        schedule: WorkSchedule,
         current_work_phase: WorkPhase,
         event: Event,
-        all_work_events: List[Event],
         event_old: Event,
         number_of_days_to_be_pushed: int,
     ):
@@ -198,20 +194,16 @@ class EventService:
         )
         if current_work_phase.legislated and not legislated_phase_end_push_can_happen:
             return result
-        all_work_phases = WorkPhase.find_by_params(
-            {"work_id": current_work_phase.work_id}
-        )
+        all_work_phases = schedule.work_phases
         current_work_phase_index = util.find_index_in_array(
             all_work_phases, current_work_phase
         )
         current_event_index = cls.find_event_index(
-            all_work_events, event_old if event_old else event, current_work_phase
+            schedule.all_events(), event_old if event_old else event, current_work_phase
         )
         work_phases_to_be_checked = [all_work_phases[current_work_phase_index]]
         if current_work_phase.legislated:
-            phase_events = cls._find_work_phase_events(
-                all_work_events, current_work_phase.id
-            )
+            phase_events = schedule.phase_events(current_work_phase.id)
             if legislated_phase_end_push_can_happen:
                 if find_event_date(event) >= current_work_phase.end_date:
                     end_event = next(
@@ -225,29 +217,23 @@ class EventService:
                         phase_events, end_event
                     )
         for work_phase in work_phases_to_be_checked:
-            phase_events_to_be_checked = cls._find_work_phase_events(
-                all_work_events, work_phase.id
-            )
+            phase_events_to_be_checked = schedule.phase_events(work_phase.id)
             if current_work_phase.id == work_phase.id:
                 phase_events_to_be_checked = phase_events_to_be_checked[
                     current_event_index:
                 ]
                 for each_event in phase_events_to_be_checked:
-                    if each_event.id:
+                    # The shifted date is only computed here, the schedule is left untouched
+                    event_date = find_event_date(each_event)
+                    if each_event.id and event_date:
+                        event_date = event_date + timedelta(
+                            days=number_of_days_to_be_pushed
+                        )
+                    if (work_phase.end_date.date() - event_date.date()).days < 0:
                         if each_event.actual_date:
-                            each_event.actual_date = each_event.actual_date + timedelta(
-                                days=number_of_days_to_be_pushed
-                            )
-                        elif each_event.anticipated_date:
-                            each_event.anticipated_date = (
-                                each_event.anticipated_date
-                                + timedelta(days=number_of_days_to_be_pushed)
-                            )
-                    days_diff = (
-                        work_phase.end_date.date()
-                        - find_event_date(each_event).date()
-                    ).days
-                    if days_diff < 0:
+                            each_event.actual_date = event_date
+                        else:
+                            each_event.anticipated_date = event_date
                         result["phase_end_push_required"] = True
                         result["work_phase_to_be_exceeded"] = work_phase
                         result["event"] = each_event
@@ -285,22 +271,22 @@ class EventService:
     @classmethod
     def _process_events(
         cls,
+        schedule: WorkSchedule,
         current_work_phase: WorkPhase,
         event: Event,
-        all_work_events: List[Event],
         push_events: bool,
         event_old: Event = None,
     ) -> None:
         # pylint: disable=too-many-arguments
-        """Process the event date logic"""
+        """Process the event date logic
+
+        All the changes are made on the objects loaded by the schedule. The moved dates
+        of the events and calendar events are written with one statement per table, the
+        rest is written back together when the session is flushed.
+        """
         cls._end_event_anticipated_change_rule(event, event_old, current_work_phase)
-        all_work_phases = WorkPhase.find_by_params(
-            {
-                "work_id": current_work_phase.work_id,
-                "visibility": PhaseVisibilityEnum.REGULAR.value,
-            }
-        )
-        all_work_phases = sorted(all_work_phases, key=lambda x: x.sort_order)
+        all_work_events = schedule.all_events()
+        all_work_phases = schedule.regular_work_phases
         current_work_phase_index = util.find_index_in_array(
             all_work_phases, current_work_phase
         )
@@ -309,18 +295,18 @@ class EventService:
             all_work_events, all_work_phases, current_work_phase_index, event, event_old
         )
         cls._handle_work_start_date_for_start_event_start_phase(
-            event, current_work_phase_index
+            schedule, event, current_work_phase_index
         )
         number_of_days_to_be_pushed = cls._get_number_of_days_to_be_pushed(
             event, event_old, current_work_phase
         )
         cls._handle_work_phase_for_end_phase_end_event(
-            all_work_phases, current_work_phase_index, event, current_work_phase
+            schedule, current_work_phase_index, event, current_work_phase
         )
         cls._handle_end_event_date_when_start_event_changed(
+            schedule,
             current_work_phase,
             event,
-            all_work_events,
             number_of_days_to_be_pushed,
             push_events,
         )
@@ -336,26 +322,22 @@ class EventService:
         )
         if number_of_days_to_be_pushed != 0 and push_events:
             cls._push_subsequent_events(
+                schedule,
                 event,
-                all_work_phases,
-                all_work_events,
                 current_work_phase_index,
                 current_work_phase,
                 number_of_days_to_be_pushed,
                 event_old,
             )
         else:
-            all_work_event_configurations = (
-                EventConfigurationService.find_all_configurations_by_work(event.work_id)
-            )
-            cls._handle_child_events(all_work_event_configurations, event)
+            cls._handle_child_events(schedule, event)
+        schedule.save_reschedules()
 
     @classmethod
     def _push_subsequent_events(
         cls,
+        schedule: WorkSchedule,
         event: Event,
-        all_work_phases: List[WorkPhase],
-        all_work_events: List[Event],
         current_work_phase_index: int,
         current_work_phase: WorkPhase,
         number_of_days_to_be_pushed: int,
@@ -363,20 +345,17 @@ class EventService:
     ):
         # pylint: disable=too-many-arguments
         """Push the subsequent events or phases if push_events flag is set"""
-        all_work_event_configurations = (
-            EventConfigurationService.find_all_configurations_by_work(event.work_id)
-        )
         current_event_index = cls.find_event_index(
-            all_work_events, event_old if event_old else event, current_work_phase
+            schedule.all_events(), event_old if event_old else event, current_work_phase
         )
-        cls._handle_child_events(all_work_event_configurations, event)
-        current_future_work_phases = all_work_phases[current_work_phase_index:]
+        cls._handle_child_events(schedule, event)
+        current_future_work_phases = schedule.regular_work_phases[
+            current_work_phase_index:
+        ]
         # if the phase is legislated, only start event, extension or suspension can push
         # all the subsequent events in all the subsequent phases
         if current_work_phase.legislated:
-            phase_events = cls._find_work_phase_events(
-                all_work_events, current_work_phase.id
-            )
+            phase_events = schedule.phase_events(current_work_phase.id)
             if (
                 event.event_configuration.event_position.value
                 == EventPositionEnum.START.value
@@ -404,9 +383,8 @@ class EventService:
                     if end_event_index > 0:
                         end_event_index = end_event_index - 1
                 cls._push_work_phases(
+                    schedule,
                     current_future_work_phases,
-                    all_work_events,
-                    all_work_event_configurations,
                     number_of_days_to_be_pushed,
                     event,
                     current_work_phase,
@@ -421,16 +399,15 @@ class EventService:
                     )
                 )
                 cls._push_events(
+                    schedule,
                     phase_events[current_event_index:],
                     number_of_days_to_be_pushed,
                     event,
-                    all_work_event_configurations,
                 )
         if not current_work_phase.legislated:
             cls._push_work_phases(
+                schedule,
                 current_future_work_phases,
-                all_work_events,
-                all_work_event_configurations,
                 number_of_days_to_be_pushed,
                 event,
                 current_work_phase,
@@ -542,13 +519,10 @@ class EventService:
                 current_work_phase.end_date = current_work_phase.end_date + timedelta(
                     days=number_of_days_to_be_pushed
                 )
-            current_work_phase.update(
-                current_work_phase.as_dict(recursive=False), commit=False
-            )
 
     @classmethod
     def _handle_work_start_date_for_start_event_start_phase(
-        cls, event: Event, current_phase_index: int
+        cls, schedule: WorkSchedule, event: Event, current_phase_index: int
     ):
         """Update the work start date to the event's actual if the event is start event and the phase is start phase"""
         if (
@@ -556,16 +530,14 @@ class EventService:
             and event.event_position == EventPositionEnum.START.value
             and current_phase_index == 0
         ):
-            work = event.work
-            work.start_date = event.actual_date
-            work.update(work.as_dict(recursive=False), commit=False)
+            schedule.work.start_date = event.actual_date
 
     @classmethod
     def _handle_end_event_date_when_start_event_changed(
         cls,
+        schedule: WorkSchedule,
         current_work_phase: WorkPhase,
         event: Event,
-        all_work_events: List[Event],
         number_of_days_to_be_pushed: int,
         push_events: bool,
     ):
@@ -581,8 +553,8 @@ class EventService:
             and event.event_position == EventPositionEnum.START.value
             and not push_events
         ):
-            phase_events = cls._find_work_phase_events(
-                all_work_events, event.event_configuration.work_phase_id
+            phase_events = schedule.phase_events(
+                event.event_configuration.work_phase_id
             )
             end_event = next(
                 (
@@ -592,14 +564,11 @@ class EventService:
                 ),
                 None,
             )
-            end_event_from_db = Event.find_by_id(end_event.id)
+            end_event_from_db = schedule.find_event(end_event.id)
             end_event_from_db.anticipated_date = (
                 end_event_from_db.anticipated_date
                 + timedelta(days=number_of_days_to_be_pushed)
             )
-            end_event_from_db.update(
-                end_event_from_db.as_dict(recursive=False), commit=False
-            )
 
     @classmethod
     def _handle_work_phase_for_suspension(
@@ -613,9 +582,6 @@ class EventService:
         ):
             current_work_phase.suspended_date = event.actual_date
             current_work_phase.is_suspended = True
-            current_work_phase.update(
-                current_work_phase.as_dict(recursive=False), commit=False
-            )
 
     @classmethod
     def _handle_work_phase_for_resumption(
@@ -631,16 +597,12 @@ class EventService:
             and event.actual_date
         ):
             event.number_of_days = number_of_days_to_be_pushed
-            event.update(event.as_dict(recursive=False), commit=False)
             current_work_phase.is_suspended = False
-            current_work_phase.update(
-                current_work_phase.as_dict(recursive=False), commit=False
-            )
 
     @classmethod
     def _handle_work_phase_for_end_phase_end_event(
         cls,
-        all_work_phases: List[WorkPhase],
+        schedule: WorkSchedule,
         current_work_phase_index: int,
         event: Event,
         current_work_phase: WorkPhase,
@@ -653,18 +615,14 @@ class EventService:
         ):
             current_work_phase.is_completed = True
             current_work_phase.end_date = event.actual_date
-            current_work_phase.update(
-                current_work_phase.as_dict(recursive=False), commit=False
-            )
 
-            work: Work = Work.find_by_id(current_work_phase.work_id)
+            all_work_phases = schedule.regular_work_phases
             if current_work_phase_index == len(all_work_phases) - 1:
-                work.work_state = WorkStateEnum.COMPLETED
+                schedule.work.work_state = WorkStateEnum.COMPLETED
             else:
-                work.current_work_phase_id = all_work_phases[
+                schedule.work.current_work_phase_id = all_work_phases[
                     current_work_phase_index + 1
                 ].id
-            work.update(work.as_dict(recursive=False), commit=False)
 
     @classmethod
     def _handle_work_phase_for_extension_without_push_events(
@@ -684,9 +642,6 @@ class EventService:
             current_work_phase.end_date = current_work_phase.end_date + timedelta(
                 days=number_of_days_to_be_pushed
             )
-            current_work_phase.update(
-                current_work_phase.as_dict(recursive=False), commit=False
-            )
 
     @classmethod
     def find_event_index(
@@ -775,33 +730,30 @@ class EventService:
     @classmethod
     def _push_events(
         cls,
+        schedule: WorkSchedule,
         phase_events: List[Event],
         number_of_days_to_be_pushed: int,
         event: Event,
-        all_work_event_configurations: List[EventConfiguration],
     ) -> None:
         """Push events the given number of days"""
         for event_to_update in phase_events:
             if event_to_update.id != event.id:
-                event_from_db = Event.find_by_id(event_to_update.id)
+                event_from_db = schedule.find_event(event_to_update.id)
                 if (
                     not event_from_db.actual_date
                 ):  # do not modify already locked milestones
-                    event_from_db.anticipated_date = (
+                    schedule.reschedule(
+                        event_from_db,
                         event_from_db.anticipated_date
-                        + timedelta(days=number_of_days_to_be_pushed)
+                        + timedelta(days=number_of_days_to_be_pushed),
                     )
-                event_from_db.update(
-                    event_from_db.as_dict(recursive=False), commit=False
-                )
-                cls._handle_child_events(all_work_event_configurations, event_from_db)
+                cls._handle_child_events(schedule, event_from_db)
 
     @classmethod
     def _push_work_phases(
         cls,
+        schedule: WorkSchedule,
         work_phases: List[WorkPhase],
-        all_work_events: List[Event],
-        all_work_event_configurations: List[EventConfiguration],
         number_of_days_to_be_pushed: int,
         event: Event,
         current_work_phase: WorkPhase,
@@ -810,19 +762,17 @@ class EventService:
         # pylint: disable=too-many-arguments
         """Push all the events and work phases"""
         for each_work_phase in work_phases:
-            phase_events = cls._find_work_phase_events(
-                all_work_events, each_work_phase.id
-            )
+            phase_events = schedule.phase_events(each_work_phase.id)
             _current_event_index = (
                 -1
                 if each_work_phase.id != current_work_phase.id
                 else current_event_index
             )
             cls._push_events(
+                schedule,
                 phase_events[_current_event_index + 1:],
                 number_of_days_to_be_pushed,
                 event,
-                all_work_event_configurations,
             )
             if each_work_phase.id != current_work_phase.id:
                 each_work_phase.start_date = each_work_phase.start_date + timedelta(
@@ -840,9 +790,6 @@ class EventService:
                 each_work_phase.end_date = each_work_phase.end_date + timedelta(
                     days=number_of_days_to_be_pushed
                 )
-                each_work_phase.update(
-                    each_work_phase.as_dict(recursive=False), commit=False
-                )
 
     @classmethod
     def _find_work_phase_events(
@@ -918,83 +865,57 @@ class EventService:
                     )
 
     @classmethod
-    def _handle_child_events(
-        cls, event_configurations: List[EventConfiguration], event: List[Event]
-    ) -> None:
-        """Create events based on the child event configurations"""
-        child_configurations = list(
-            filter(
-                lambda x, p_id=event.event_configuration_id: x.parent_id == p_id,
-                event_configurations,
-            )
+    def _handle_child_events(cls, schedule: WorkSchedule, event: Event) -> None:
+        """Create or move the events based on the child event configurations"""
+        child_configurations = schedule.child_configurations(event.event_configuration_id)
+        child_start_days = start_at_days(
+            (c_event_conf.start_at for c_event_conf in child_configurations),
+            event.number_of_days,
         )
-        for c_event_conf in child_configurations:
-            c_event_start_date = find_event_date(event) + timedelta(
-                days=cls._find_start_at_value(
-                    c_event_conf.start_at, event.number_of_days
-                )
-            )
+        for c_event_conf, days in zip(child_configurations, child_start_days):
+            c_event_start_date = find_event_date(event) + timedelta(days=int(days))
             if c_event_conf.event_category_id == EventCategoryEnum.CALENDAR.value:
-                work_calendar_event = (
-                    db.session.query(WorkCalendarEvent)
-                    .filter(
-                        WorkCalendarEvent.event_configuration_id == c_event_conf.id,
-                        WorkCalendarEvent.source_event_id == event.id,
-                        WorkCalendarEvent.is_active.is_(True),
-                    )
-                    .scalar()
+                work_calendar_event = schedule.find_calendar_event(
+                    c_event_conf.id, event.id
                 )
                 if work_calendar_event:
-                    cal_event = CalendarEvent.find_by_id(
-                        work_calendar_event.calendar_event_id
+                    schedule.reschedule(
+                        work_calendar_event.calendar_event, c_event_start_date
                     )
-                    cal_event.anticipated = c_event_start_date
-                    cal_event.update(cal_event.as_dict(), commit=False)
                 else:
-                    cal_event = CalendarEvent.flush(
-                        CalendarEvent(
-                            **{
-                                "name": c_event_conf.name,
-                                "anticipated_date": c_event_start_date,
-                                "number_of_days": c_event_conf.number_of_days,
-                            }
-                        )
-                    )
-                    WorkCalendarEvent.flush(
-                        WorkCalendarEvent(
-                            **{
-                                "calendar_event_id": cal_event.id,
-                                "source_event_id": event.id,
-                                "event_configuration_id": c_event_conf.id,
-                            }
-                        )
+                    # Added without flushing so that the new rows are inserted together
+                    work_calendar_event = WorkCalendarEvent(
+                        **{
+                            "calendar_event": CalendarEvent(
+                                **{
+                                    "name": c_event_conf.name,
+                                    "anticipated_date": c_event_start_date,
+                                    "number_of_days": c_event_conf.number_of_days,
+                                }
+                            ),
+                            "source_event_id": event.id,
+                            "event_configuration_id": c_event_conf.id,
+                        }
                     )
+                    db.session.add(work_calendar_event)
+                    schedule.add_calendar_event(work_calendar_event)
             else:
-                existing_event = (
-                    db.session.query(Event)
-                    .filter(
-                        Event.source_event_id == event.id, Event.is_active.is_(True)
-                    )
-                    .first()
-                )
+                existing_event = schedule.find_child_event(event.id)
                 if existing_event:
-                    existing_event.anticipated_date = c_event_start_date
-                    existing_event.update(
-                        existing_event.as_dict(recursive=False), commit=False
-                    )
+                    schedule.reschedule(existing_event, c_event_start_date)
                 else:
-                    Event.flush(
-                        Event(
-                            **cls._prepare_regular_event(
-                                c_event_conf.name,
-                                str(c_event_start_date),
-                                c_event_conf.number_of_days,
-                                c_event_conf.id,
-                                event.work_id,
-                                event.id,
-                            )
+                    child_event = Event(
+                        **cls._prepare_regular_event(
+                            c_event_conf.name,
+                            str(c_event_start_date),
+                            c_event_conf.number_of_days,
+                            c_event_conf.id,
+                            event.work_id,
+                            event.id,
                         )
                     )
+                    db.session.add(child_event)
+                    schedule.add_child_event(child_event)
 
     @classmethod
     def find_events(
@@ -1042,15 +963,49 @@ class EventService:
         return results
 
     @classmethod
-    def _find_start_at_value(cls, start_at: str, number_of_days: int) -> int:
-        """Calculate the start at value"""
-        # pylint: disable=eval-used
-        start_at_value = (
-            eval(start_at.replace("number_of_days", str(number_of_days)))
-            if "number_of_days" in start_at
-            else int(start_at)
+    def find_events_for_works(
+        cls,
+        work_ids: List[int],
+        event_categories: List[EventCategoryEnum] = [],
+    ) -> Dict[int, Dict[int, List[Event]]]:
+        # pylint: disable=dangerous-default-value
+        """Find all events for the given works grouped by work and work phase
+
+        The configuration and outcome of each event are loaded in the same query
+        so that callers iterating over many works do not trigger lazy loads.
+        """
+        if not work_ids:
+            return {}
+        events_query = (
+            db.session.query(Event)
+            .join(
+                EventConfiguration,
+                Event.event_configuration_id == EventConfiguration.id,
+            )
+            .options(
+                contains_eager(Event.event_configuration),
+                joinedload(Event.outcome),
+            )
+            .filter(
+                Event.is_active.is_(True),
+                Event.work_id.in_(work_ids),
+                EventConfiguration.is_active.is_(True),
+            )
         )
-        return start_at_value
+        if len(event_categories) > 0:
+            category_ids = list(map(lambda x: x.value, event_categories))
+            events_query = events_query.filter(
+                EventConfiguration.event_category_id.in_(category_ids)
+            )
+        result = defaultdict(lambda: defaultdict(list))
+        for event in events_query.all():
+            result[event.work_id][event.event_configuration.work_phase_id].append(event)
+        for work_events in result.values():
+            for work_phase_id, phase_events in work_events.items():
+                work_events[work_phase_id] = sorted(
+                    phase_events, key=functools.cmp_to_key(event_compare_func)
+                )
+        return result
 
     @classmethod
     def _prepare_regular_event(  # pylint: disable=too-many-arguments
@@ -1121,7 +1076,8 @@ class EventService:
         return "Deleted successfully"
 
     @classmethod
-    def _process_actions(cls, event: Event, outcome_id: int = None) -> None:
+    def _process_actions(cls, event: Event, context: ActionContext, outcome_id: int = None) -> None:
+        """Run the actions of the outcome of the event against the work context shared by them"""
         if event.actual_date is None:
             return
         if outcome_id is None:
@@ -1140,19 +1096,12 @@ class EventService:
         )
         for action_configuration in action_configurations:
             action_handler = ActionHandler(ActionEnum(action_configuration.action_id))
-            action_handler.apply(event, action_configuration.additional_params)
+            action_handler.apply(event, action_configuration.additional_params, context)
 
     @classmethod
-    def _post_process_actions(cls, source_event: Event):
-        """Things to happen after the actions are being processed"""
-        all_work_phases = WorkPhase.find_by_params(
-            {
-                "work_id": source_event.event_configuration.work_phase.work_id,
-                "visibility": PhaseVisibilityEnum.REGULAR.value,
-                "is_completed": False,
-            }
-        )
-        all_work_phases = sorted(all_work_phases, key=lambda x: x.sort_order)
+    def _post_process_actions(cls, source_event: Event, context: ActionContext):
+        """Things to happen after the actions are being processed, writing their changes at once"""
+        all_work_phases = context.regular_work_phases(include_completed=False)
         work = source_event.work
         # if it is same, no need to do unwanted update
         if (
@@ -1160,7 +1109,7 @@ class EventService:
             and work.current_work_phase_id != all_work_phases[0].id
         ):
             work.current_work_phase = all_work_phases[0]
-            work.update(work.as_dict(recursive=False), commit=False)
+        context.flush()
 
     @classmethod
     def find_events_by_date(cls, from_date: datetime) -> List[Event]:
@@ -34,6 +34,7 @@ from api.models import (
 from api.schemas import request as req
 from api.schemas import response as res
 from api.services.phaseservice import PhaseService
+from api.services.template_graph import TemplateGraphService
 from api.utils.str import escape_characters
 
 
@@ -211,6 +212,7 @@ class EventTemplateService:
             ActionTemplate.id.in_(removed_action_ids)
         ).update({ActionTemplate.is_active: False, ActionTemplate.is_deleted: True})
         db.session.commit()
+        TemplateGraphService.invalidate()
         return final_result
 
     @classmethod
@@ -12,18 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Service to manage IndigenousNation."""
-from typing import IO, List
+from typing import IO
 
 import numpy as np
 import pandas as pd
-from flask import current_app
-from sqlalchemy import func
+from sqlalchemy import func, select
 
 from api.exceptions import ResourceExistsError, ResourceNotFoundError
 from api.models import IndigenousNation, db
 from api.models.pip_org_type import PIPOrgType
 from api.models.staff import Staff
-from api.utils.token_info import TokenInfo
+from api.services.bulk_import import BulkImportService, ImportLookup
 
 
 class IndigenousNationService:
@@ -88,28 +87,17 @@ class IndigenousNationService:
         """Import indigenous nations"""
         data = cls._read_excel(file)
         data["relationship_holder_id"] = data["relationship_holder_id"].str.lower()
-        relationship_holders = data["relationship_holder_id"].to_list()
-        pip_org_types = data["pip_org_type_id"].to_list()
-        staffs = (
-            db.session.query(Staff)
-            .filter(func.lower(Staff.email).in_(relationship_holders), Staff.is_active.is_(True))
-            .all()
+        staff_ids = BulkImportService.build_lookup_ids(
+            select(func.lower(Staff.email), Staff.id).filter(Staff.is_active.is_(True))
         )
-        org_types = (
-            db.session.query(PIPOrgType)
-            .filter(PIPOrgType.name.in_(pip_org_types), PIPOrgType.is_active.is_(True))
-            .all()
+        org_type_ids = BulkImportService.build_lookup_ids(
+            select(PIPOrgType.name, PIPOrgType.id).filter(PIPOrgType.is_active.is_(True))
         )
-        data["relationship_holder_id"] = data.apply(lambda x: cls._find_staff_id(x["relationship_holder_id"], staffs),
-                                                    axis=1)
-        data["pip_org_type_id"] = data.apply(lambda x: cls._find_org_type_id(x["pip_org_type_id"], org_types), axis=1)
-        username = TokenInfo.get_username()
-        data["created_by"] = username
-        data = cls._update_or_delete_old_data(data)
-        data = data.to_dict("records")
-        db.session.bulk_insert_mappings(IndigenousNation, data)
-        db.session.commit()
-        return "Created successfully"
+        lookups = [
+            ImportLookup("relationship_holder_id", "Staff", staff_ids),
+            ImportLookup("pip_org_type_id", "Org type", org_type_ids),
+        ]
+        return BulkImportService.import_rows(IndigenousNation, data.to_dict("records"), "name", lookups)
 
     @classmethod
     def _read_excel(cls, file: IO) -> pd.DataFrame:
@@ -127,51 +115,3 @@ class IndigenousNationService:
         data_frame = data_frame.replace({np.nan: None})
         data_frame.rename(column_map, axis="columns", inplace=True)
         return data_frame
-
-    @classmethod
-    def _find_staff_id(cls, email: str, staffs: List[Staff]) -> int:
-        """Find and return the id of staff from given list"""
-        if email is None:
-            return None
-        staff = next((x for x in staffs if x.email.lower() == email), None)
-        if staff is None:
-            raise ResourceNotFoundError(f"Staff with email {email} does not exist")
-        return staff.id
-
-    @classmethod
-    def _find_org_type_id(cls, name: str, org_types: List[PIPOrgType]) -> int:
-        """Find and return the id of org_type from given list"""
-        if name is None:
-            return None
-        org_type = next((x for x in org_types if x.name == name), None)
-        if org_type is None:
-            raise ResourceNotFoundError(f"Org type with name {name} does not exist")
-        return org_type.id
-
-    @classmethod
-    def _update_or_delete_old_data(cls, data) -> pd.DataFrame:
-        """Marks old entries as deleted or active depending on their existence in input data.
-
-        Returns the DataFrame after filtering out updated entries.
-        """
-        indigenous_nation_names = set(data["name"].to_list())
-        existing_indigenous_nations_qry = db.session.query(IndigenousNation).filter()
-
-        existing_indigenous_nations = existing_indigenous_nations_qry.all()
-        # Create set of existing indigenous_nation names
-        existing_indigenous_nations = {x.name for x in existing_indigenous_nations}
-        # Mark removed entries as inactive
-        to_delete = existing_indigenous_nations - indigenous_nation_names
-        disabled_count = existing_indigenous_nations_qry.filter(
-            IndigenousNation.name.in_(to_delete),
-        ).update({"is_active": False, "is_deleted": True})
-        current_app.logger.info(f"Disabled {disabled_count} IndigenousNations")
-
-        # Update existing entries to be active
-        to_update = existing_indigenous_nations & indigenous_nation_names
-        enabled_count = existing_indigenous_nations_qry.filter(
-            IndigenousNation.name.in_(to_update)
-        ).update({"is_active": True, "is_deleted": False})
-        current_app.logger.info(f"Enabled {enabled_count} IndigenousNations")
-        # Remove updated indigenous_nations to avoid creating duplicates
-        return data[~data["name"].isin(to_update)]
@@ -14,8 +14,10 @@
 """Service to manage Insight."""
 from flask import current_app
 
-from api.insights import get_insight_generator
+from api.insights import WorkInsightEngine, get_insight_generator
 from api.insights.insight_protocol import InsightGenerator
+from api.utils.caching import AppCache
+from api.utils.data_version import get_data_version
 
 
 class InsightService:  # pylint:disable=too-few-public-methods
@@ -31,6 +33,21 @@ class InsightService:  # pylint:disable=too-few-public-methods
         insights = insight_generator().fetch_data()
         return insights
 
+    @classmethod
+    def fetch_all_work_insights(cls):
+        """Fetch every work and project insight grouping, reusing the ones computed from the same data"""
+        current_app.logger.debug("Fetch all work insights")
+        cache_key = None
+        if AppCache.cache is not None:
+            cache_key = f"insights/works/{get_data_version(WorkInsightEngine.source_models)}"
+            insights = AppCache.cache.get(cache_key)
+            if insights is not None:
+                return insights
+        insights = WorkInsightEngine().fetch_data()
+        if cache_key:
+            AppCache.cache.set(cache_key, insights, timeout=current_app.config["INSIGHT_CACHE_TIMEOUT"])
+        return insights
+
     @classmethod
     def fetch_assessment_work_insights(cls, group_by: str):
         """Fetch assessment work insights"""
@@ -12,49 +12,133 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Service to manage Lookups."""
-from io import BytesIO
-from xlsxwriter.workbook import Workbook
+from typing import IO, Iterator, List
 
+from sqlalchemy import select
 
-class LookupService():
+from api.models import (
+    EAAct, EAOTeam, EventTemplate, EventType, FederalInvolvement, IndigenousCategory, IndigenousNation, Ministry,
+    OutcomeTemplate, PhaseCode, Position, Project, Proponent, Region, Role, Staff, SubType, Type, WorkType, db)
+from api.utils.xlsx_export import ExportSheet, stream_rows, write_workbook
+
+
+class LookupService():  # pylint: disable=too-few-public-methods
     """Service to manage lookup related operations"""
 
     @classmethod
-    def get_data_item(cls, data, key, value):
-        """Returns the item in list that matches the given key and value"""
-        return next((x for x in data if x[key] == value), None)
+    def generate_excel(cls) -> IO[bytes]:
+        """Generates an excel file containing the lookup data"""
+        sheets = [
+            cls._code_sheet("Indigenous Nations", IndigenousNation),
+            cls._code_sheet("Indigenous Categories", IndigenousCategory),
+            cls._code_sheet("Positions", Position),
+            cls._code_sheet("Roles", Role),
+            cls._code_sheet("Ea Acts", EAAct),
+            cls._code_sheet("Work Types", WorkType),
+            cls._code_sheet("Federal Involvements", FederalInvolvement),
+            cls._code_sheet("Teams", EAOTeam),
+            cls._code_sheet("Ministries", Ministry, Ministry.abbreviation),
+            ExportSheet(
+                "Phases",
+                ["Id", "Name", "Duration", "Work Type", "Ea Act"],
+                stream_rows(
+                    cls._code_query(
+                        PhaseCode, PhaseCode.id, PhaseCode.name, PhaseCode.number_of_days, WorkType.name, EAAct.name
+                    )
+                    .join(WorkType, WorkType.id == PhaseCode.work_type_id)
+                    .join(EAAct, EAAct.id == PhaseCode.ea_act_id)
+                ),
+            ),
+            ExportSheet(
+                "Milestones",
+                ["Id", "Name", "Duration", "Start At", "Kind", "Milestone Type", "Phase Name"],
+                cls._milestone_rows(),
+            ),
+            ExportSheet("Outcomes", ["Id", "Name", "Milestone"], cls._outcome_rows()),
+            ExportSheet(
+                "Staffs",
+                ["Id", "First Name", "Last Name", "Email", "Phone", "Position"],
+                stream_rows(
+                    cls._code_query(
+                        Staff, Staff.id, Staff.first_name, Staff.last_name, Staff.email, Staff.phone, Position.name
+                    ).join(Position, Position.id == Staff.position_id)
+                ),
+            ),
+            ExportSheet(
+                "Projects",
+                ["Id", "Name", "Description", "Address", "Proponent Name", "Sub Type Name"],
+                stream_rows(
+                    select(
+                        Project.id, Project.name, Project.description, Project.address, Proponent.name, SubType.name
+                    )
+                    .join(Proponent, Proponent.id == Project.proponent_id)
+                    .join(SubType, SubType.id == Project.sub_type_id)
+                    .where(Project.is_deleted.is_(False))
+                    .order_by(Project.id)
+                ),
+                column_widths={0: 5, 2: 100},
+            ),
+            cls._code_sheet("Regions", Region, Region.entity),
+            cls._code_sheet("Types", Type, Type.short_name),
+            ExportSheet(
+                "Sub Types",
+                ["Id", "Name", "Short Name", "Types"],
+                stream_rows(
+                    cls._code_query(SubType, SubType.id, SubType.name, SubType.short_name, Type.name).join(
+                        Type, Type.id == SubType.type_id
+                    )
+                ),
+            ),
+            cls._code_sheet("Proponents", Proponent),
+        ]
+        return write_workbook(sheets)
 
     @classmethod
-    def generate_excel(cls, data):  # pylint: disable=too-many-locals
-        """Generates an excel file containing the lookup data"""
-        output = BytesIO()
-        work_book = Workbook(output)
-        header_format = work_book.add_format()
-        cell_format = work_book.add_format()
-        header_format.set_bold()
-        header_format.set_align('center')
-        cell_format.set_text_wrap()
-
-        for key, value in data.items():
-
-            sheet_name = " ".join(key.split('_')).title()
-            work_sheet = work_book.add_worksheet(sheet_name)
-            if not value:
-                continue
-            row = 0
-            column = 0
-            headers = list(map(lambda x: " ".join(x.split('_')).title(), value[0].keys()))
-            work_sheet.write_row(row, column, headers, header_format)
-            for row_data in value:
-                row += 1
-                work_sheet.write_row(row, column, row_data.values(), cell_format)
-            work_sheet.autofit()
-            work_sheet.set_column(0, 0, 5)
-            if key == 'projects':
-                columns = list(value[0].keys())
-                description = columns.index('description')
-                work_sheet.set_column(description, description, 100)
-        work_book.read_only_recommended()
-        work_book.close()
-        output.seek(0)
-        return output
+    def _code_sheet(cls, name: str, model, *columns) -> ExportSheet:
+        """Sheet listing the id and name of the code table, followed by the given columns"""
+        headers = ["Id", "Name", *(" ".join(column.key.split("_")).title() for column in columns)]
+        return ExportSheet(name, headers, stream_rows(cls._code_query(model, model.id, model.name, *columns)))
+
+    @classmethod
+    def _code_query(cls, model, *columns):
+        """Select the columns of the active rows of the model, in the order the code lookups use"""
+        query = select(*columns)
+        if hasattr(model, "is_active"):
+            query = query.where(model.is_active.is_(True))
+        if hasattr(model, "is_deleted"):
+            query = query.where(model.is_deleted.is_(False))
+        order_by = [model.id]
+        if hasattr(model, "sort_order"):
+            order_by.insert(0, model.sort_order)
+        return query.order_by(*order_by)
+
+    @classmethod
+    def _milestone_rows(cls) -> Iterator[List]:
+        """Rows of the milestones sheet, naming their phase"""
+        phase_names = dict(db.session.execute(select(PhaseCode.id, PhaseCode.name)).all())
+        rows = stream_rows(
+            cls._code_query(
+                EventTemplate,
+                EventTemplate.id,
+                EventTemplate.name,
+                EventTemplate.number_of_days,
+                EventTemplate.start_at,
+                EventTemplate.event_position,
+                EventType.name,
+                EventTemplate.phase_id,
+            ).join(EventType, EventType.id == EventTemplate.event_type_id)
+        )
+        for *row, phase_id in rows:
+            yield [*row, phase_names.get(phase_id)]
+
+    @classmethod
+    def _outcome_rows(cls) -> Iterator[List]:
+        """Rows of the outcomes sheet, naming their milestone"""
+        milestone_names = dict(db.session.execute(select(EventTemplate.id, EventTemplate.name)).all())
+        rows = stream_rows(
+            cls._code_query(
+                OutcomeTemplate, OutcomeTemplate.id, OutcomeTemplate.name, OutcomeTemplate.event_template_id
+            )
+        )
+        for outcome_id, name, event_template_id in rows:
+            yield [outcome_id, name, milestone_names.get(event_template_id)]
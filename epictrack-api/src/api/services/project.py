@@ -12,14 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Service to manage Project."""
-from datetime import datetime
-from typing import IO, List
+from typing import IO
 
 import numpy as np
 import pandas as pd
 from flask import current_app
-from psycopg2.extras import DateTimeTZRange
-from sqlalchemy import and_
+from sqlalchemy import and_, select
 
 from api.exceptions import BadRequestError, ResourceExistsError, ResourceNotFoundError
 from api.models import Project, db
@@ -28,16 +26,16 @@ from api.models.indigenous_work import IndigenousWork
 from api.models.project import ProjectStateEnum
 from api.models.proponent import Proponent
 from api.models.region import Region
-from api.models.special_field import EntityEnum, SpecialField
+from api.models.special_field import EntityEnum
 from api.models.sub_types import SubType
 from api.models.types import Type
 from api.models.work import Work
 from api.models.work_type import WorkType
 from api.schemas.types import TypeSchema
+from api.services.bulk_import import BulkImportService, ImportLookup
 from api.services.special_field import SpecialFieldService
 from api.utils.constants import PROJECT_STATE_ENUM_MAPS
 from api.utils.enums import ProjectCodeMethod
-from api.utils.token_info import TokenInfo
 
 
 class ProjectService:
@@ -189,67 +187,34 @@ class ProjectService:
         return {"first_nation_available": result}
 
     @classmethod
-    def import_projects(cls, file: IO):  # pylint: disable=too-many-locals
-        """Import proponents"""
+    def import_projects(cls, file: IO):
+        """Import projects"""
         data = cls._read_excel(file)
-        proponent_names = set(data["proponent_id"].to_list())
-        type_names = set(data["type_id"].to_list())
-        sub_type_names = set(data["sub_type_id"].to_list())
-        env_region_names = set(data["region_id_env"].to_list())
-        flnro_region_names = set(data["region_id_flnro"].to_list())
-
-        proponents, types, sub_types, regions = cls._get_master_data(
-            proponent_names,
-            type_names,
-            sub_type_names,
-            env_region_names.union(flnro_region_names),
-        )
-
-        data["proponent_id"] = data.apply(
-            lambda x: cls._find_proponent_id(x["proponent_id"], proponents), axis=1
-        )
-        data["type_id"] = data.apply(
-            lambda x: cls._find_type_id(x["type_id"], types), axis=1
-        )
-        data["sub_type_id"] = data.apply(
-            lambda x: cls._find_sub_type_id(x["sub_type_id"], sub_types), axis=1
-        )
-        data["region_id_env"] = data.apply(
-            lambda x: cls._find_region_id(x["region_id_env"], regions, "ENV"), axis=1
-        )
-        data["region_id_flnro"] = data.apply(
-            lambda x: cls._find_region_id(x["region_id_flnro"], regions, "FLNR"), axis=1
-        )
-        data["project_state"] = data.apply(
-            lambda x: PROJECT_STATE_ENUM_MAPS[x["project_state"]], axis=1
+        regions = db.session.execute(
+            select(Region.entity, Region.name, Region.id).filter(Region.is_active.is_(True))
+        ).all()
+        lookups = [
+            ImportLookup("proponent_id", "Proponent", cls._find_active_ids(Proponent)),
+            ImportLookup("type_id", "Type", cls._find_active_ids(Type)),
+            ImportLookup("sub_type_id", "SubType", cls._find_active_ids(SubType)),
+            ImportLookup(
+                "region_id_env", "Region", {name: id_ for entity, name, id_ in regions if entity == "ENV"}
+            ),
+            ImportLookup(
+                "region_id_flnro", "Region", {name: id_ for entity, name, id_ in regions if entity == "FLNR"}
+            ),
+            ImportLookup("project_state", "Project state", PROJECT_STATE_ENUM_MAPS),
+        ]
+        return BulkImportService.import_rows(
+            Project, data.to_dict("records"), "name", lookups, entity=EntityEnum.PROJECT
         )
 
-        username = TokenInfo.get_username()
-        data["created_by"] = username
-        data = cls._update_or_delete_old_projects(data)
-        data = data.to_dict("records")
-        db.session.bulk_insert_mappings(Project, data)
-        special_history_mappings = []
-        time_range = DateTimeTZRange(
-            datetime.now(), None, bounds="[)"
+    @classmethod
+    def _find_active_ids(cls, model) -> dict:
+        """Return the ids of the active rows of the model by name"""
+        return BulkImportService.build_lookup_ids(
+            select(model.name, model.id).filter(model.is_active.is_(True))
         )
-        for project_data in data:
-            project = db.session.query(Project).filter(
-                Project.name == project_data["name"],
-                Project.proponent_id == project_data["proponent_id"],
-            ).first()
-            special_history_mappings.append(
-                {
-                    "entity": EntityEnum.PROJECT,
-                    "entity_id": project.id,
-                    "field_name": "name",
-                    "field_value": project.name,
-                    "time_range": time_range
-                }
-            )
-        db.session.bulk_insert_mappings(SpecialField, special_history_mappings)
-        db.session.commit()
-        return "Created successfully"
 
     @classmethod
     def _read_excel(cls, file: IO) -> pd.DataFrame:
@@ -284,49 +249,6 @@ class ProjectService:
         data_frame = data_frame.replace({np.NaN: None})
         return data_frame
 
-    @classmethod
-    def _find_proponent_id(cls, name: str, proponents: List[Proponent]) -> int:
-        """Find and return the id of proponent from given list"""
-        if name is None:
-            return None
-        proponent = next((x for x in proponents if x.name == name), None)
-        if proponent is None:
-            print(f"Proponent with name {name} does not exist")
-            raise ResourceNotFoundError(f"Proponent with name {name} does not exist")
-        return proponent.id
-
-    @classmethod
-    def _find_type_id(cls, name: str, types: List[Type]) -> int:
-        """Find and return the id of type from given list"""
-        if name is None:
-            return None
-        type_obj = next((x for x in types if x.name == name), None)
-        if type_obj is None:
-            raise ResourceNotFoundError(f"Type with name {name} does not exist")
-        return type_obj.id
-
-    @classmethod
-    def _find_sub_type_id(cls, name: str, sub_types: List[SubType]) -> int:
-        """Find and return the id of SubType from given list"""
-        if name is None:
-            return None
-        sub_type = next((x for x in sub_types if x.name == name), None)
-        if sub_type is None:
-            raise ResourceNotFoundError(f"SubType with name {name} does not exist")
-        return sub_type.id
-
-    @classmethod
-    def _find_region_id(cls, name: str, regions: List[Region], entity: str) -> int:
-        """Find and return the id of region from given list"""
-        if name is None:
-            return None
-        region = next(
-            (x for x in regions if x.name == name and x.entity == entity), None
-        )
-        if region is None:
-            raise ResourceNotFoundError(f"Region with name {name} does not exist")
-        return region.id
-
     @classmethod
     def _generate_project_abbreviation(
         cls, project_name: str, method: ProjectCodeMethod
@@ -369,60 +291,3 @@ class ProjectService:
         """Get all project types"""
         project_types = Type.find_all(default_filters=False)
         return TypeSchema(many=True).dump(project_types)
-
-    @classmethod
-    def _get_master_data(
-        cls, proponent_names, type_names, sub_type_names, region_names
-    ):
-        proponents = (
-            db.session.query(Proponent)
-            .filter(Proponent.name.in_(proponent_names), Proponent.is_active.is_(True))
-            .all()
-        )
-        types = (
-            db.session.query(Type)
-            .filter(Type.name.in_(type_names), Type.is_active.is_(True))
-            .all()
-        )
-        sub_types = (
-            db.session.query(SubType)
-            .filter(SubType.name.in_(sub_type_names), SubType.is_active.is_(True))
-            .all()
-        )
-        regions = (
-            db.session.query(Region)
-            .filter(
-                Region.name.in_(region_names),
-                Region.is_active.is_(True),
-            )
-            .all()
-        )
-        return proponents, types, sub_types, regions
-
-    @classmethod
-    def _update_or_delete_old_projects(cls, data) -> pd.DataFrame:
-        """Marks old entries as deleted or active depending on their existence in input data.
-
-        Returns the DataFrame after filtering out updated entries.
-        """
-        project_names = set(data["name"].to_list())
-        existing_projects_qry = db.session.query(Project).filter()
-
-        existing_projects = existing_projects_qry.all()
-        # Create set of existing project names
-        existing_projects = {x.name for x in existing_projects}
-        # Mark removed entries as inactive
-        to_delete = existing_projects - project_names
-        disabled_count = existing_projects_qry.filter(
-            Project.name.in_(to_delete),
-        ).update({"is_active": False, "is_deleted": True})
-        current_app.logger.info(f"Disabled {disabled_count} Projects")
-
-        # Update existing entries to be active
-        to_update = existing_projects & project_names
-        enabled_count = existing_projects_qry.filter(
-            Project.name.in_(to_update)
-        ).update({"is_active": True, "is_deleted": False})
-        current_app.logger.info(f"Enabled {enabled_count} Projects")
-        # Remove updated projects to avoid creating duplicates
-        return data[~data["name"].isin(to_update)]
@@ -12,20 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Service to manage Proponent."""
-from datetime import datetime
-from typing import IO, List
+from typing import IO
 
 import numpy as np
 import pandas as pd
-from flask import current_app
-from psycopg2.extras import DateTimeTZRange
+from sqlalchemy import func, select
 
 from api.exceptions import ResourceExistsError, ResourceNotFoundError
 from api.models import Proponent, db
-from api.models.special_field import EntityEnum, SpecialField
+from api.models.special_field import EntityEnum
 from api.models.staff import Staff
+from api.services.bulk_import import BulkImportService, ImportLookup
 from api.services.special_field import SpecialFieldService
-from api.utils.token_info import TokenInfo
 
 
 class ProponentService:
@@ -98,48 +96,15 @@ class ProponentService:
     def import_proponents(cls, file: IO):
         """Import proponents"""
         data = cls._read_excel(file)
-        data["relationship_holder_id"] = data.apply(
-            lambda x: x["relationship_holder_id"].lower()
-            if x["relationship_holder_id"]
-            else None,
-            axis=1,
+        data["relationship_holder_id"] = data["relationship_holder_id"].str.lower()
+        staff_ids = BulkImportService.build_lookup_ids(
+            select(func.lower(Staff.email), Staff.id).filter(Staff.is_active.is_(True))
         )
-        relationship_holders = data["relationship_holder_id"].to_list()
-        staffs = (
-            db.session.query(Staff)
-            .filter(Staff.email.in_(relationship_holders), Staff.is_active.is_(True))
-            .all()
+        lookups = [ImportLookup("relationship_holder_id", "Staff", staff_ids)]
+        return BulkImportService.import_rows(
+            Proponent, data.to_dict("records"), "name", lookups, entity=EntityEnum.PROPONENT
         )
 
-        data["relationship_holder_id"] = data.apply(
-            lambda x: cls._find_staff_id(x["relationship_holder_id"], staffs), axis=1
-        )
-        username = TokenInfo.get_username()
-        data["created_by"] = username
-        data = cls._update_or_delete_old_data(data)
-        data = data.to_dict("records")
-        db.session.bulk_insert_mappings(Proponent, data)
-        special_history_mappings = []
-        time_range = DateTimeTZRange(
-            datetime.now(), None, bounds="[)"
-        )
-        for proponent_data in data:
-            proponent = db.session.query(Proponent).filter(
-                Proponent.name == proponent_data["name"],
-            ).first()
-            special_history_mappings.append(
-                {
-                    "entity": EntityEnum.PROPONENT,
-                    "entity_id": proponent.id,
-                    "field_name": "name",
-                    "field_value": proponent.name,
-                    "time_range": time_range
-                }
-            )
-        db.session.bulk_insert_mappings(SpecialField, special_history_mappings)
-        db.session.commit()
-        return "Created successfully"
-
     @classmethod
     def _read_excel(cls, file: IO) -> pd.DataFrame:
         """Read the template excel file"""
@@ -151,41 +116,3 @@ class ProponentService:
         data_frame = data_frame.replace({np.nan: None})
         data_frame.rename(column_map, axis="columns", inplace=True)
         return data_frame
-
-    @classmethod
-    def _find_staff_id(cls, email: str, staffs: List[Staff]) -> int:
-        """Find and return the id of staff from given list"""
-        if email is None:
-            return None
-        staff = next((x for x in staffs if x.email == email), None)
-        if staff is None:
-            raise ResourceNotFoundError(f"Staff with email {email} does not exist")
-        return staff.id
-
-    @classmethod
-    def _update_or_delete_old_data(cls, data) -> pd.DataFrame:
-        """Marks old entries as deleted or active depending on their existence in input data.
-
-        Returns the DataFrame after filtering out updated entries.
-        """
-        proponent_names = set(data["name"].to_list())
-        existing_proponents_qry = db.session.query(Proponent).filter()
-
-        existing_proponents = existing_proponents_qry.all()
-        # Create set of existing proponent names
-        existing_proponents = {x.name for x in existing_proponents}
-        # Mark removed entries as inactive
-        to_delete = existing_proponents - proponent_names
-        disabled_count = existing_proponents_qry.filter(
-            Proponent.name.in_(to_delete),
-        ).update({"is_active": False, "is_deleted": True})
-        current_app.logger.info(f"Disabled {disabled_count} Proponents")
-
-        # Update existing entries to be active
-        to_update = existing_proponents & proponent_names
-        enabled_count = existing_proponents_qry.filter(
-            Proponent.name.in_(to_update)
-        ).update({"is_active": True, "is_deleted": False})
-        current_app.logger.info(f"Enabled {enabled_count} Proponents")
-        # Remove updated proponents to avoid creating duplicates
-        return data[~data["name"].isin(to_update)]
@@ -12,8 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Service to manage Reports."""
+import hashlib
+import json
 
-from api.reports import get_report_generator
+from flask import current_app
+
+from api.reports import REPORT_CLASSES, get_report_generator
+from api.utils.caching import AppCache
+from api.utils.data_version import get_data_version
 
 
 class ReportService:  # pylint: disable=too-few-public-methods, too-many-arguments
@@ -21,9 +27,40 @@ class ReportService:  # pylint: disable=too-few-public-methods, too-many-argumen
 
     @classmethod
     def generate_report(cls, report_type, report_date, return_type='json', filters=None, color_intensity=None):
-        """Generate a report"""
-        report_generator = get_report_generator(report_type, filters, color_intensity)
-        report, file_name = report_generator.generate_report(report_date, return_type)
+        """Generate a report, reusing the one generated from the same parameters and data"""
+        cache_key = None
+        result = None
+        if AppCache.cache is not None:
+            cache_key = (
+                f"report/{cls.request_key(report_type, report_date, filters, color_intensity)}"
+                f"/{return_type}/{cls.data_version(report_type)}"
+            )
+            result = AppCache.cache.get(cache_key)
+        if result is None:
+            report_generator = get_report_generator(report_type, filters, color_intensity)
+            result = report_generator.generate_report(report_date, return_type)
+            if cache_key:
+                AppCache.cache.set(cache_key, result, timeout=current_app.config["REPORT_CACHE_TIMEOUT"])
+        report, file_name = result
         if return_type == 'json':
             return report
         return report, file_name
+
+    @classmethod
+    def request_key(cls, report_type, report_date, filters=None, color_intensity=None) -> str:
+        """Return a key identifying the reports requested with the same parameters"""
+        key = json.dumps(
+            {
+                "report_type": report_type,
+                "report_date": report_date.isoformat(),
+                "filters": filters,
+                "color_intensity": color_intensity,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    @classmethod
+    def data_version(cls, report_type) -> str:
+        """Return a fingerprint of the data the report is generated from"""
+        return get_data_version(REPORT_CLASSES[report_type].source_models)
@@ -0,0 +1,191 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Service to generate report files in the background."""
+import os
+import threading
+import uuid
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+from flask import current_app, g
+from sqlalchemy import func, select
+
+from api.exceptions import BadRequestError, ResourceNotFoundError
+from api.models import ReportJob, ReportJobStatusEnum, db
+from api.models.report_job import IN_FLIGHT_STATUSES
+from api.reports import REPORT_CLASSES
+from api.utils.statement_timeout import statement_timeout
+from api.utils.utcnow import utcnow
+
+from .report import ReportService
+
+
+class ReportJobService:
+    """Queues report file generation and keeps the generated files."""
+
+    _executor = None
+    _executor_pid = None
+    _executor_lock = threading.Lock()
+
+    @classmethod
+    def submit_job(  # pylint: disable=too-many-arguments
+        cls, report_type: str, report_date: date, filters=None, color_intensity=None
+    ) -> ReportJob:
+        """Queue the generation of a report file, sharing the job of an identical unfinished request"""
+        if report_type not in REPORT_CLASSES:
+            raise BadRequestError(f"Report type {report_type} is not supported")
+        if color_intensity is not None:
+            color_intensity = int(color_intensity)
+        job_key = ReportService.request_key(report_type, report_date, filters, color_intensity)
+        # Serializes the submissions of the same report across the workers until commit
+        db.session.execute(select(func.pg_advisory_xact_lock(func.hashtext(job_key))))
+        job = cls._find_in_flight_job(job_key)
+        if job:
+            return job
+        cls._purge_expired_jobs()
+        job = ReportJob(
+            id=uuid.uuid4().hex,
+            job_key=job_key,
+            report_type=report_type,
+            report_date=report_date,
+            filters=filters,
+            color_intensity=color_intensity,
+            status=ReportJobStatusEnum.PENDING,
+        )
+        db.session.add(job)
+        db.session.commit()
+        cls._schedule(job.id)
+        return job
+
+    @classmethod
+    def find_job(cls, job_id: str) -> ReportJob:
+        """Return the report job with the given id"""
+        job = db.session.get(ReportJob, job_id)
+        if job is None:
+            raise ResourceNotFoundError(f"Report job with id '{job_id}' not found")
+        return job
+
+    @classmethod
+    def run_job(cls, job_id: str) -> None:
+        """Generate the report file of the job and store the outcome"""
+        # The job may run as long as it is considered in flight, unlike the statements of a request
+        with statement_timeout(db.session(), current_app.config["REPORT_JOB_TIMEOUT"] * 1000):
+            cls._run_job(job_id)
+
+    @classmethod
+    def _run_job(cls, job_id: str) -> None:
+        """Generate the report file of the job within its statement timeout"""
+        job = db.session.get(ReportJob, job_id)
+        if job is None or job.status != ReportJobStatusEnum.PENDING:
+            return
+        job.status = ReportJobStatusEnum.RUNNING
+        db.session.commit()
+        try:
+            report, file_name = ReportService.generate_report(
+                job.report_type,
+                datetime.combine(job.report_date, datetime.min.time()),
+                "file",
+                filters=job.filters,
+                color_intensity=job.color_intensity,
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            db.session.rollback()
+            current_app.logger.exception(f"Report job {job_id} failed")
+            job = db.session.get(ReportJob, job_id)
+            job.status = ReportJobStatusEnum.FAILED
+            job.error = str(exc)
+        else:
+            job.status = ReportJobStatusEnum.COMPLETED
+            # Reports without data have no file
+            job.content = report or None
+            job.file_name = file_name
+        job.completed_at = utcnow()
+        db.session.commit()
+
+    @classmethod
+    def _find_in_flight_job(cls, job_key: str) -> ReportJob:
+        """Return the unfinished job with the given key, ignoring the ones that have timed out"""
+        timeout = timedelta(seconds=current_app.config["REPORT_JOB_TIMEOUT"])
+        return (
+            db.session.query(ReportJob)
+            .filter(
+                ReportJob.job_key == job_key,
+                ReportJob.status.in_(IN_FLIGHT_STATUSES),
+                ReportJob.created_at >= utcnow() - timeout,
+            )
+            .order_by(ReportJob.created_at.desc())
+            .first()
+        )
+
+    @classmethod
+    def _purge_expired_jobs(cls) -> None:
+        """Delete the jobs older than the retention period"""
+        retention = timedelta(seconds=current_app.config["REPORT_JOB_RETENTION"])
+        db.session.query(ReportJob).filter(
+            ReportJob.created_at < utcnow() - retention
+        ).delete(synchronize_session=False)
+
+    @classmethod
+    def _schedule(cls, job_id: str) -> None:
+        """Run the job on the worker pool, or right away when there is no pool"""
+        executor = cls._get_executor()
+        if executor is None:
+            cls.run_job(job_id)
+            return
+        app = current_app._get_current_object()  # pylint: disable=protected-access
+        executor.submit(_run_in_app_context, app, g.jwt_oidc_token_info, job_id)
+
+    @classmethod
+    def _get_executor(cls) -> Executor:
+        """Return the worker pool of this process, created on first use"""
+        workers = current_app.config["REPORT_JOB_WORKERS"]
+        if workers <= 0:
+            return None
+        with cls._executor_lock:
+            # Pools do not survive a fork, so each worker process gets its own
+            if cls._executor is None or cls._executor_pid != os.getpid():
+                cls._executor = _create_executor(workers)
+                cls._executor_pid = os.getpid()
+        return cls._executor
+
+
+def _create_executor(workers: int) -> Executor:
+    """Return a pool of native threads
+
+    Under gevent the threading module is patched to greenlets, which would run
+    the CPU bound report generation on the event loop of the worker.
+    """
+    try:
+        from gevent import monkey  # pylint: disable=import-outside-toplevel
+
+        if monkey.is_module_patched("threading"):
+            from gevent.threadpool import \
+                ThreadPoolExecutor as NativeThreadPoolExecutor  # pylint: disable=import-outside-toplevel
+
+            return NativeThreadPoolExecutor(max_workers=workers)
+    except ImportError:
+        pass
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="report-job")
+
+
+def _run_in_app_context(app, token_info: dict, job_id: str) -> None:
+    """Run the job in its own application context and session, on behalf of the user who queued it"""
+    with app.app_context():
+        g.jwt_oidc_token_info = token_info
+        try:
+            ReportJobService.run_job(job_id)
+        except Exception:  # pylint: disable=broad-except
+            app.logger.exception(f"Report job {job_id} could not be run")
+        finally:
+            db.session.remove()
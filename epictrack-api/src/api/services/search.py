@@ -0,0 +1,65 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Service to search works, projects, proponents and staff."""
+from typing import List
+
+from sqlalchemy import func, literal, select, union_all
+
+from api.models import Project, Proponent, Staff, Work, WorkType, db
+from api.models.search import search_document, search_query
+
+
+class SearchService:  # pylint: disable=too-few-public-methods
+    """Service to search works, projects, proponents and staff"""
+
+    @classmethod
+    def search(cls, text: str, limit: int) -> List[dict]:
+        """Return the entities whose names match every term of the text, the best ranked first"""
+        query = search_query(text)
+        if query is None:
+            return []
+        branches = [
+            cls._branch(
+                "project", Project.id, Project.name, search_document(Project.name, Project.abbreviation), query
+            ).where(Project.is_deleted.is_(False)),
+            cls._branch("work", Work.id, Work.title, search_document(Work.normalized_title), query)
+            .join(Project, Project.id == Work.project_id)
+            .join(WorkType, WorkType.id == Work.work_type_id)
+            .where(Work.is_deleted.is_(False)),
+            cls._branch("proponent", Proponent.id, Proponent.name, search_document(Proponent.name), query).where(
+                Proponent.is_deleted.is_(False)
+            ),
+            cls._branch(
+                "staff",
+                Staff.id,
+                Staff.full_name,
+                search_document(Staff.first_name, Staff.last_name, Staff.email),
+                query,
+            ).where(Staff.is_deleted.is_(False)),
+        ]
+        matches = union_all(*branches).subquery()
+        rows = db.session.execute(
+            select(matches).order_by(matches.c.rank.desc(), matches.c.name, matches.c.id).limit(limit)
+        ).all()
+        return [dict(row._mapping) for row in rows]  # pylint: disable=protected-access
+
+    @staticmethod
+    def _branch(entity: str, id_column, name_column, document, query):
+        """Select the entities of a kind whose document matches the query, with their rank"""
+        return select(
+            literal(entity).label("type"),
+            id_column.label("id"),
+            name_column.label("name"),
+            func.ts_rank(document, query).label("rank"),
+        ).where(document.op("@@")(query))
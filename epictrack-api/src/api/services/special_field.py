@@ -45,7 +45,7 @@ class SpecialFieldService:  # pylint:disable=too-many-arguments
         )
         special_field = SpecialField(**payload)
         special_field.flush()
-        cls._update_original_model(special_field)
+        cls._update_original_model(special_field, commit)
         if commit:
             db.session.commit()
         return special_field
@@ -66,7 +66,7 @@ class SpecialFieldService:  # pylint:disable=too-many-arguments
             payload.pop("active_from"), upper_limit, bounds="[)"
         )
         special_field = special_field.update(payload, commit=commit)
-        cls._update_original_model(special_field)
+        cls._update_original_model(special_field, commit)
         if commit:
             db.session.commit()
         return special_field
@@ -115,7 +115,7 @@ class SpecialFieldService:  # pylint:disable=too-many-arguments
         return upper_limit
 
     @classmethod
-    def _update_original_model(cls, special_field_entry: SpecialField) -> None:
+    def _update_original_model(cls, special_field_entry: SpecialField, commit: bool = True) -> None:
         """If `special_field_entry` is latest, update original table with new value"""
         if special_field_entry.time_range.upper is None:
             model_class = SPECIAL_FIELD_ENTITY_MODEL_MAPS[
@@ -125,10 +125,10 @@ class SpecialFieldService:  # pylint:disable=too-many-arguments
             model_class.query.filter(
                 model_class.id == special_field_entry.entity_id
             ).update({special_field_entry.field_name: special_field_entry.field_value})
-            cls.run_other_related_updates(special_field_entry)
+            cls.run_other_related_updates(special_field_entry, commit)
 
     @classmethod
-    def run_other_related_updates(cls, special_field: SpecialField):
+    def run_other_related_updates(cls, special_field: SpecialField, commit: bool = True):
         """Run other related updates based on special field entry."""
         from api.services.work import WorkService  # pylint: disable=import-outside-toplevel
         special_field_entity = EntityEnum(special_field.entity).value
@@ -143,7 +143,7 @@ class SpecialFieldService:  # pylint:disable=too-many-arguments
                     "role_id": RoleEnum.RESPONSIBLE_EPD.value
                 }
                 WorkService.replace_work_staff(
-                    special_field.entity_id, data
+                    special_field.entity_id, data, commit
                 )
             if special_field.field_name == "work_lead_id":
                 data = {
@@ -151,7 +151,7 @@ class SpecialFieldService:  # pylint:disable=too-many-arguments
                     "role_id": RoleEnum.TEAM_LEAD.value
                 }
                 WorkService.replace_work_staff(
-                    special_field.entity_id, data
+                    special_field.entity_id, data, commit
                 )
 
     @classmethod
@@ -13,16 +13,18 @@
 # limitations under the License.
 """Service to manage Staffs."""
 from datetime import datetime
-from typing import IO, List
+from typing import IO
 
+import numpy as np
 import pandas as pd
 from flask import current_app
+from sqlalchemy import func, select
 
 from api.exceptions import ResourceExistsError, ResourceNotFoundError
 from api.models import Staff, db
 from api.models.position import Position
 from api.schemas.response import StaffResponseSchema
-from api.utils.token_info import TokenInfo
+from api.services.bulk_import import BulkImportService, ImportLookup
 
 
 class StaffService:
@@ -118,28 +120,17 @@ class StaffService:
 
     @classmethod
     def import_staffs(cls, file: IO):
-        """Import proponents"""
+        """Import staffs"""
         data = cls._read_excel(file)
-        position_names = set(data["position_id"].to_list())
-        positions = (
-            db.session.query(Position)
-            .filter(Position.name.in_(position_names), Position.is_active.is_(True))
-            .all()
+        data["email"] = data["email"].str.lower()
+        position_ids = BulkImportService.build_lookup_ids(
+            select(Position.name, Position.id).filter(Position.is_active.is_(True))
         )
-
-        data["position_id"] = data.apply(
-            lambda x: cls._find_position_id(x["position_id"], positions), axis=1
+        lookups = [ImportLookup("position_id", "Position", position_ids)]
+        return BulkImportService.import_rows(
+            Staff, data.to_dict("records"), "email", lookups, key_column=func.lower(Staff.email)
         )
 
-        username = TokenInfo.get_username()
-        data["created_by"] = username
-        data["email"] = data["email"].str.lower()
-        data = cls._update_or_delete_old_data(data)
-        data = data.to_dict("records")
-        db.session.bulk_insert_mappings(Staff, data)
-        db.session.commit()
-        return "Inserted successfully"
-
     @classmethod
     def _read_excel(cls, file: IO) -> pd.DataFrame:
         """Read the template excel file"""
@@ -154,42 +145,5 @@ class StaffService:
         data_frame.rename(column_map, axis="columns", inplace=True)
         data_frame = data_frame.infer_objects()
         data_frame = data_frame.apply(lambda x: x.str.strip() if x.dtype == "object" else x)
+        data_frame = data_frame.replace({np.nan: None})
         return data_frame
-
-    @classmethod
-    def _find_position_id(cls, name: str, positions: List[Position]) -> int:
-        """Find and return the id of position from given list"""
-        if name is None:
-            return None
-        position = next((x for x in positions if x.name == name), None)
-        if position is None:
-            raise ResourceNotFoundError(f"position with name {name} does not exist")
-        return position.id
-
-    @classmethod
-    def _update_or_delete_old_data(cls, data) -> pd.DataFrame:
-        """Marks old entries as deleted or active depending on their existence in input data.
-
-        Returns the DataFrame after filtering out updated entries.
-        """
-        staff_emails = set(data["email"].to_list())
-        existing_staffs_qry = db.session.query(Staff).filter()
-
-        existing_staffs = existing_staffs_qry.all()
-        # Create set of existing staff emails
-        existing_staffs = {x.email.lower() for x in existing_staffs}
-        # Mark removed entries as inactive
-        to_delete = existing_staffs - staff_emails
-        disabled_count = existing_staffs_qry.filter(
-            Staff.email.in_(to_delete),
-        ).update({"is_active": False, "is_deleted": True})
-        current_app.logger.info(f"Disabled {disabled_count} Staffs")
-
-        # Update existing entries to be active
-        to_update = existing_staffs & staff_emails
-        enabled_count = existing_staffs_qry.filter(
-            Staff.email.in_(to_update)
-        ).update({"is_active": True, "is_deleted": False})
-        current_app.logger.info(f"Enabled {enabled_count} Staffs")
-        # Remove updated indigenous_nations to avoid creating duplicates
-        return data[~data["email"].isin(to_update)]
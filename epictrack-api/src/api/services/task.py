@@ -477,7 +477,6 @@ class TaskService:
                 task_added = True
             if task_added:
                 work_phase.task_added = True
-                work_phase.update(work_phase.as_dict(recursive=False), commit=False)
         if commit:
             db.session.commit()
         return task_events
@@ -0,0 +1,228 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compiled graph of the phase, event, outcome and action templates of a work type.
+
+The templates only change when a configuration sheet is imported, so the graph of
+each EA act and work type is read once and kept by the process. Each graph carries
+the version of the template tables it was compiled from, their row counts and latest
+creation and update times, read with a single statement on use. Every worker so
+compiles its graphs again once an import has been committed, whatever the cache
+backend.
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from api.models import ActionTemplate, EventTemplate, OutcomeTemplate, PhaseCode, db
+from api.models.phase_code import PhaseVisibilityEnum
+from api.utils.start_at import compile_start_at
+
+
+# Tables the graphs are compiled from, whose changes give a new version of the templates
+TEMPLATE_MODELS = (PhaseCode, EventTemplate, OutcomeTemplate, ActionTemplate)
+
+
+@dataclass(frozen=True)
+class ActionNode:
+    """Action template run when the outcome of an event is reached"""
+
+    id: int
+    action_id: int
+    additional_params: Optional[dict]
+    description: Optional[str]
+    sort_order: int
+
+
+@dataclass(frozen=True)
+class OutcomeNode:
+    """Outcome template of an event, with its actions in the order of their ids"""
+
+    id: int
+    name: str
+    sort_order: int
+    actions: Tuple[ActionNode, ...]
+
+
+@dataclass(frozen=True)
+class EventTemplateNode:  # pylint: disable=too-many-instance-attributes
+    """Event template, with its outcomes and the templates of its child events"""
+
+    id: int
+    name: str
+    phase_id: int
+    event_type_id: int
+    event_category_id: int
+    event_position: str
+    multiple_days: bool
+    start_at: str
+    start_at_days: Optional[int]
+    number_of_days: int
+    sort_order: int
+    visibility: str
+    outcomes: Tuple[OutcomeNode, ...]
+    children: Tuple["EventTemplateNode", ...] = ()
+
+
+@dataclass(frozen=True)
+class PhaseNode:
+    """Phase, with the templates of its parent events in their sort order"""
+
+    id: int
+    name: str
+    number_of_days: int
+    legislated: bool
+    sort_order: int
+    visibility: PhaseVisibilityEnum
+    event_templates: Tuple[EventTemplateNode, ...]
+
+
+@dataclass(frozen=True)
+class TemplateGraph:
+    """Phases of an EA act and work type in their sort order"""
+
+    ea_act_id: int
+    work_type_id: int
+    phases: Tuple[PhaseNode, ...]
+
+    def find_phase_by_name(self, name: str) -> Optional[PhaseNode]:
+        """Return the first phase with the name"""
+        return next((phase for phase in self.phases if phase.name == name), None)
+
+
+class TemplateGraphService:
+    """Service to compile the template graphs and keep them across requests"""
+
+    _graphs: Dict[Tuple[int, int], Tuple[tuple, TemplateGraph]] = {}
+
+    @classmethod
+    def find_graph(cls, ea_act_id: int, work_type_id: int) -> TemplateGraph:
+        """Return the template graph of the EA act and work type, compiling it when out of date"""
+        key = (int(ea_act_id), int(work_type_id))
+        version = cls._version()
+        cached = cls._graphs.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        graph = cls._compile(*key)
+        cls._graphs[key] = (version, graph)
+        return graph
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop the template graphs of this process, the other workers find out from the version"""
+        cls._graphs.clear()
+
+    @classmethod
+    def _version(cls) -> tuple:
+        """Return the version the templates are in, read from the template tables in one statement"""
+        columns = [
+            select(aggregate).select_from(model).scalar_subquery()
+            for model in TEMPLATE_MODELS
+            for aggregate in (func.count(), func.max(model.created_at), func.max(model.updated_at))
+        ]
+        return tuple(db.session.execute(select(*columns)).one())
+
+    @classmethod
+    def _compile(cls, ea_act_id: int, work_type_id: int) -> TemplateGraph:
+        """Read the templates of the EA act and work type and build their graph"""
+        phases = PhaseCode.find_by_ea_act_and_work_type(ea_act_id, work_type_id)
+        templates = EventTemplate.find_by_phase_ids([phase.id for phase in phases]) if phases else []
+        outcomes = _active_templates(
+            OutcomeTemplate, OutcomeTemplate.event_template_id, {template.id for template in templates}
+        )
+        actions = _active_templates(ActionTemplate, ActionTemplate.outcome_id, {outcome.id for outcome in outcomes})
+
+        actions_by_outcome = defaultdict(list)
+        for action in actions:
+            actions_by_outcome[action.outcome_id].append(
+                ActionNode(
+                    id=action.id,
+                    action_id=action.action_id,
+                    additional_params=action.additional_params,
+                    description=action.description,
+                    sort_order=action.sort_order,
+                )
+            )
+        outcomes_by_template = defaultdict(list)
+        for outcome in outcomes:
+            outcomes_by_template[outcome.event_template_id].append(
+                OutcomeNode(
+                    id=outcome.id,
+                    name=outcome.name,
+                    sort_order=outcome.sort_order,
+                    actions=tuple(actions_by_outcome[outcome.id]),
+                )
+            )
+        templates_by_parent = defaultdict(list)
+        for template in templates:
+            templates_by_parent[template.parent_id].append(template)
+
+        def node(template: EventTemplate) -> EventTemplateNode:
+            return EventTemplateNode(
+                id=template.id,
+                name=template.name,
+                phase_id=template.phase_id,
+                event_type_id=template.event_type_id,
+                event_category_id=template.event_category_id,
+                event_position=template.event_position.value,
+                multiple_days=template.multiple_days,
+                start_at=template.start_at,
+                start_at_days=_start_at_days(template.start_at),
+                number_of_days=template.number_of_days,
+                sort_order=template.sort_order,
+                visibility=template.visibility.value,
+                outcomes=tuple(outcomes_by_template[template.id]),
+                children=tuple(
+                    node(child) for child in templates_by_parent[template.id] if child.phase_id == template.phase_id
+                ),
+            )
+
+        return TemplateGraph(
+            ea_act_id=ea_act_id,
+            work_type_id=work_type_id,
+            phases=tuple(
+                PhaseNode(
+                    id=phase.id,
+                    name=phase.name,
+                    number_of_days=phase.number_of_days,
+                    legislated=phase.legislated,
+                    sort_order=phase.sort_order,
+                    visibility=phase.visibility,
+                    event_templates=tuple(
+                        node(template) for template in templates_by_parent[None] if template.phase_id == phase.id
+                    ),
+                )
+                for phase in phases
+            ),
+        )
+
+
+def _active_templates(model, parent_column, parent_ids) -> list:
+    """Active templates of the model under the parents, in the order of their ids"""
+    if not parent_ids:
+        return []
+    return (
+        db.session.query(model)
+        .filter(parent_column.in_(parent_ids), model.is_active.is_(True), model.is_deleted.is_(False))
+        .order_by(model.id)
+        .all()
+    )
+
+
+def _start_at_days(start_at: str) -> Optional[int]:
+    """Days from the start of the phase, or of the parent event, to the start of the event"""
+    if not start_at:
+        return None
+    return compile_start_at(start_at).days()
@@ -0,0 +1,249 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Instantiation of the phase, event and outcome templates of a work in bulk.
+
+The work phases, event configurations, outcome and action configurations, events and
+calendar events are built in memory first. Their ids are then reserved from the
+sequences of their tables in a single statement, so the references between the rows
+can be filled in, and a single flush inserts every table with one multi-row INSERT.
+"""
+from collections import defaultdict
+from copy import deepcopy
+from datetime import datetime, timedelta
+from typing import Dict, List, Sequence, Tuple
+
+from sqlalchemy import func, select
+
+from api.models import (
+    ActionConfiguration, CalendarEvent, Event, EventConfiguration, OutcomeConfiguration, WorkCalendarEvent,
+    WorkPhase, db)
+from api.models.event_category import EventCategoryEnum
+from api.models.event_template import EventTemplateVisibilityEnum
+from api.models.phase_code import PhaseVisibilityEnum
+from api.services.template_graph import EventTemplateNode
+
+
+# Configurations for which an event is created along with the work phase
+EVENT_VISIBILITIES = (
+    EventTemplateVisibilityEnum.MANDATORY.value,
+    EventTemplateVisibilityEnum.SUGGESTED.value,
+)
+
+# Models in the order their rows are created, parents first
+INSTANTIATED_MODELS = (
+    WorkPhase,
+    EventConfiguration,
+    OutcomeConfiguration,
+    ActionConfiguration,
+    Event,
+    CalendarEvent,
+    WorkCalendarEvent,
+)
+
+
+class TemplateInstantiation:
+    """Rows of the work phases and configurations instantiated from templates, inserted in bulk"""
+
+    def __init__(self):
+        """Start with no rows"""
+        self._rows: Dict[type, list] = defaultdict(list)
+        # (row, attribute, referenced row) filled in with the id of the referenced row once reserved
+        self._references: List[Tuple[object, str, object]] = []
+        # (configuration, id of the configuration it is copied from) whose outcomes to copy
+        self._outcome_sources: List[Tuple[EventConfiguration, int]] = []
+
+    def add_phase(self, work_phase_data: dict, event_templates: Sequence[EventTemplateNode]) -> WorkPhase:
+        """Add a work phase with the configurations of its events, and the events of a regular phase"""
+        work_phase = self._add(WorkPhase(**work_phase_data))
+        regular = work_phase.visibility.value == PhaseVisibilityEnum.REGULAR.value
+        phase_start_date = datetime.fromisoformat(str(work_phase.start_date))
+        for parent_template in event_templates:
+            parent = self._add_configuration(work_phase, parent_template)
+            children = [
+                (child_template, self._add_configuration(work_phase, child_template, parent))
+                for child_template in parent_template.children
+            ]
+            if not regular or parent_template.visibility not in EVENT_VISIBILITIES:
+                continue
+            parent_start_date = phase_start_date + timedelta(days=parent_template.start_at_days)
+            parent_event = self._add_event(parent, parent_start_date, work_phase.work_id)
+            for child_template, child in children:
+                if child_template.visibility in EVENT_VISIBILITIES:
+                    child_start_date = parent_start_date + timedelta(days=child_template.start_at_days)
+                    self._add_child_event(child, child_start_date, parent_event, work_phase.work_id)
+        return work_phase
+
+    def add_outcomes(self, configuration: EventConfiguration, source_configuration_id: int) -> None:
+        """Copy the outcomes and actions of the source configuration to the configuration"""
+        self._outcome_sources.append((configuration, source_configuration_id))
+
+    def save(self) -> None:
+        """Insert all the rows added, one statement per table"""
+        self._copy_outcomes()
+        counts = {model: len(self._rows[model]) for model in INSTANTIATED_MODELS if self._rows[model]}
+        for model, ids in reserve_ids(counts).items():
+            for row, row_id in zip(self._rows[model], ids):
+                row.id = row_id
+        for row, attribute, referenced in self._references:
+            setattr(row, attribute, referenced.id)
+        db.session.add_all(row for model in INSTANTIATED_MODELS for row in self._rows[model])
+        db.session.flush()
+        self._rows.clear()
+        self._references.clear()
+
+    def _add(self, row):
+        """Add the row to be inserted"""
+        self._rows[type(row)].append(row)
+        return row
+
+    def _refer(self, row, attribute: str, referenced) -> None:
+        """Set the attribute of the row to the id of the referenced row, which may not be reserved yet"""
+        if referenced is not None:
+            self._references.append((row, attribute, referenced))
+
+    def _add_configuration(
+        self, work_phase: WorkPhase, template: EventTemplateNode, parent: EventConfiguration = None
+    ) -> EventConfiguration:
+        """Add the event configuration of the template, with its outcomes and actions"""
+        configuration = self._add(
+            EventConfiguration(
+                name=template.name,
+                event_type_id=template.event_type_id,
+                event_category_id=template.event_category_id,
+                start_at=template.start_at,
+                number_of_days=template.number_of_days,
+                event_position=template.event_position,
+                multiple_days=template.multiple_days,
+                sort_order=template.sort_order,
+                template_id=template.id,
+                visibility=template.visibility,
+                repeat_count=1,
+            )
+        )
+        self._refer(configuration, "work_phase_id", work_phase)
+        self._refer(configuration, "parent_id", parent)
+        for outcome in template.outcomes:
+            outcome_configuration = self._add_outcome(configuration, outcome.name, outcome.id, outcome.sort_order)
+            for action in outcome.actions:
+                self._add_action(outcome_configuration, action, action.id)
+        return configuration
+
+    def _add_event(self, configuration: EventConfiguration, start_date: datetime, work_id: int) -> Event:
+        """Add the event of the configuration"""
+        event = self._add(
+            Event(
+                name=configuration.name,
+                anticipated_date=f"{start_date}",
+                number_of_days=configuration.number_of_days,
+                work_id=work_id,
+            )
+        )
+        self._refer(event, "event_configuration_id", configuration)
+        return event
+
+    def _add_child_event(
+        self, configuration: EventConfiguration, start_date: datetime, parent_event: Event, work_id: int
+    ) -> None:
+        """Add the event of the child configuration, in the calendar for the calendar events"""
+        if configuration.event_category_id == EventCategoryEnum.CALENDAR.value:
+            calendar_event = self._add(
+                CalendarEvent(
+                    name=configuration.name,
+                    anticipated_date=start_date,
+                    number_of_days=configuration.number_of_days,
+                )
+            )
+            work_calendar_event = self._add(WorkCalendarEvent())
+            self._refer(work_calendar_event, "calendar_event_id", calendar_event)
+            self._refer(work_calendar_event, "source_event_id", parent_event)
+            self._refer(work_calendar_event, "event_configuration_id", configuration)
+        else:
+            child_event = self._add_event(configuration, start_date, work_id)
+            self._refer(child_event, "source_event_id", parent_event)
+
+    def _add_outcome(
+        self, configuration: EventConfiguration, name: str, outcome_template_id: int, sort_order: int
+    ) -> OutcomeConfiguration:
+        """Add an outcome to the configuration"""
+        outcome_configuration = self._add(
+            OutcomeConfiguration(name=name, outcome_template_id=outcome_template_id, sort_order=sort_order)
+        )
+        self._refer(outcome_configuration, "event_configuration_id", configuration)
+        return outcome_configuration
+
+    def _add_action(self, outcome_configuration: OutcomeConfiguration, action, action_template_id: int) -> None:
+        """Add a copy of the action template or configuration to the outcome"""
+        action_configuration = self._add(
+            ActionConfiguration(
+                action_id=action.action_id,
+                action_template_id=action_template_id,
+                additional_params=deepcopy(action.additional_params),
+                description=action.description,
+                sort_order=action.sort_order,
+            )
+        )
+        self._refer(action_configuration, "outcome_configuration_id", outcome_configuration)
+
+    def _copy_outcomes(self) -> None:
+        """Copy the outcomes and actions of the source configurations, loading those of all of them at once"""
+        if not self._outcome_sources:
+            return
+        outcomes = _active_rows(
+            OutcomeConfiguration,
+            OutcomeConfiguration.event_configuration_id,
+            {source_id for _, source_id in self._outcome_sources},
+        )
+        actions = _active_rows(
+            ActionConfiguration, ActionConfiguration.outcome_configuration_id, {outcome.id for outcome in outcomes}
+        )
+        outcomes_by_configuration = defaultdict(list)
+        for outcome in outcomes:
+            outcomes_by_configuration[outcome.event_configuration_id].append(outcome)
+        actions_by_outcome = defaultdict(list)
+        for action in actions:
+            actions_by_outcome[action.outcome_configuration_id].append(action)
+        for configuration, source_id in self._outcome_sources:
+            for outcome in outcomes_by_configuration[source_id]:
+                outcome_configuration = self._add_outcome(
+                    configuration, outcome.name, outcome.outcome_template_id, outcome.sort_order
+                )
+                for action in actions_by_outcome[outcome.id]:
+                    self._add_action(outcome_configuration, action, action.action_template_id)
+        self._outcome_sources.clear()
+
+
+def reserve_ids(counts: Dict[type, int]) -> Dict[type, List[int]]:
+    """Draw the given number of ids from the sequence of the primary key of each model, in one statement"""
+    if not counts:
+        return {}
+    columns = [
+        select(
+            func.array_agg(func.nextval(func.pg_get_serial_sequence(model.__tablename__, "id")))
+        ).select_from(func.generate_series(1, count)).scalar_subquery()
+        for model, count in counts.items()
+    ]
+    row = db.session.execute(select(*columns)).one()
+    return dict(zip(counts, row))
+
+
+def _active_rows(model, parent_column, parent_ids) -> list:
+    """Active rows of the model under the parents, in the order of their ids"""
+    if not parent_ids:
+        return []
+    return (
+        db.session.query(model)
+        .filter(parent_column.in_(parent_ids), model.is_active.is_(True), model.is_deleted.is_(False))
+        .order_by(model.id)
+        .all()
+    )
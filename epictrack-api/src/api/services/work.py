@@ -13,15 +13,14 @@
 # limitations under the License.
 """Service to manage Works."""
 from collections import defaultdict
-from datetime import datetime, timedelta
-from io import BytesIO
+from datetime import timedelta
 from typing import Dict, List, Optional
 
 import pandas as pd
 from flask import current_app
 from sqlalchemy import and_
 from sqlalchemy import tuple_
-from sqlalchemy.orm import aliased
+from sqlalchemy.orm import aliased, contains_eager
 
 from api.exceptions import (
     ResourceExistsError,
@@ -29,26 +28,17 @@ from api.exceptions import (
     UnprocessableEntityError,
 )
 from api.models import (
-    ActionConfiguration,
-    ActionTemplate,
-    CalendarEvent,
     EAOTeam,
-    Event,
     EventConfiguration,
-    OutcomeConfiguration,
     Project,
     Role,
     Staff,
     StaffWorkRole,
     Work,
-    WorkCalendarEvent,
-    WorkPhase,
     WorkStateEnum,
     db,
 )
 from api.models.dashboard_seach_options import WorkplanDashboardSearchOptions
-from api.models.event_category import EventCategoryEnum
-from api.models.event_template import EventTemplateVisibilityEnum
 from api.models.indigenous_nation import IndigenousNation
 from api.models.indigenous_work import IndigenousWork
 from api.models.indigenous_work_queries import find_all_by_project_id
@@ -57,32 +47,59 @@ from api.models.phase_code import PhaseVisibilityEnum
 from api.models.special_field import EntityEnum
 from api.models.work_status import WorkStatus
 from api.models.work_type import WorkType
-from api.schemas.request import (
-    ActionConfigurationBodyParameterSchema,
-    OutcomeConfigurationBodyParameterSchema,
-)
 from api.schemas.response import (
-    ActionTemplateResponseSchema,
-    EventTemplateResponseSchema,
-    OutcomeTemplateResponseSchema,
     StaffWorkRoleResponseSchema,
     WorkPhaseAdditionalInfoResponseSchema,
     WorkResponseSchema,
     WorkStatusResponseSchema,)
+from api.schemas.loading import cached_schema, schema_loader_options
 from api.schemas.work_first_nation import WorkFirstNationSchema
 from api.schemas.work_plan import WorkPlanSchema
 from api.schemas.work_type import WorkTypeSchema
 from api.services import authorisation
 from api.services.event import EventService
-from api.services.event_template import EventTemplateService
-from api.services.outcome_configuration import OutcomeConfigurationService
-from api.services.outcome_template import OutcomeTemplateService
-from api.services.phaseservice import PhaseService
 from api.services.task import TaskService
+from api.services.template_graph import TemplateGraphService
+from api.services.template_instantiation import TemplateInstantiation
 from api.services.work_phase import WorkPhaseService
 from api.utils import util
 from api.utils.roles import Membership
 from api.utils.roles import Role as KeycloakRole
+from api.utils.xlsx_export import ExportSheet, write_workbook
+
+
+# Fields of the works listed on the work plan dashboard
+WORK_PLAN_FIELDS = (
+    "id",
+    "work_state",
+    "work_type",
+    "current_work_phase_id",
+    "federal_involvement",
+    "eao_team",
+    "title",
+    "simple_title",
+    "is_active",
+    "project.name",
+)
+
+# Fields of the phases of the works listed on the work plan dashboard
+WORK_PLAN_PHASE_FIELDS = (
+    "work_phase.name",
+    "total_number_of_days",
+    "current_milestone",
+    "next_milestone",
+    "next_milestone_date",
+    "decision_milestone",
+    "decision",
+    "decision_milestone_date",
+    "milestone_progress",
+    "days_left",
+    "work_phase.id",
+    "work_phase.phase.color",
+    "work_phase.start_date",
+    "work_phase.end_date",
+    "work_phase.is_completed",
+)
 
 
 # pylint:disable=not-callable, too-many-lines
@@ -95,10 +112,13 @@ class WorkService:  # pylint: disable=too-many-public-methods
         return Work.check_existence(title=title, work_id=work_id)
 
     @classmethod
-    def find_all_works(cls, is_active=False):
-        """Find all non-deleted works"""
-        works = Work.find_all(is_active)
-        return works
+    def find_all_works(cls, is_active=False, schema=None):
+        """Find all non-deleted works, loading up front the relationships the schema dumps"""
+        query = {"is_deleted": False}
+        if is_active:
+            query["is_active"] = True
+        options = schema_loader_options(schema, Work) if schema is not None else []
+        return Work.query.filter_by(**query).options(*options).all()
 
     @classmethod
     def fetch_all_work_plans(
@@ -107,7 +127,11 @@ class WorkService:  # pylint: disable=too-many-public-methods
         search_options: WorkplanDashboardSearchOptions,
     ):
         """Fetch all workplans"""
-        works, total = Work.fetch_all_works(pagination_options, search_options)
+        works, total, next_cursor = Work.fetch_all_works(
+            pagination_options,
+            search_options,
+            schema_loader_options(cached_schema(WorkResponseSchema, only=WORK_PLAN_FIELDS), Work),
+        )
         work_ids = [work.id for work in works]
 
         serialized_works = []
@@ -124,56 +148,23 @@ class WorkService:  # pylint: disable=too-many-public-methods
             )
             serialized_works.append(serialized_work)
 
-        return {"items": serialized_works, "total": total}
+        response = {"items": serialized_works, "total": total}
+        if pagination_options and pagination_options.cursor is not None:
+            response["next_cursor"] = next_cursor
+        return response
 
     @staticmethod
     def _serialize_work(work, work_staffs, works_statuses, work_phase):
         """Serialize a single work"""
         staff_info = work_staffs.get(work.id, [])
         works_status = works_statuses.get(work.id, None)
-        serialized_work = WorkResponseSchema(
-            only=(
-                "id",
-                "work_state",
-                "work_type",
-                "current_work_phase_id",
-                "federal_involvement",
-                "eao_team",
-                "title",
-                "simple_title",
-                "is_active",
-                "project.name",
-            )
-        ).dump(work)
+        serialized_work = cached_schema(WorkResponseSchema, only=WORK_PLAN_FIELDS).dump(work)
         if work_phase and len(work_phase) > 0:
-            serialised_phase = WorkPhaseAdditionalInfoResponseSchema(
-                only=(
-                    "work_phase.name",
-                    "total_number_of_days",
-                    "current_milestone",
-                    "next_milestone",
-                    "next_milestone_date",
-                    "decision_milestone",
-                    "decision",
-                    "decision_milestone_date",
-                    "milestone_progress",
-                    "days_left",
-                    "work_phase.id",
-                    "work_phase.phase.color",
-                    "work_phase.start_date",
-                    "work_phase.end_date",
-                    "work_phase.is_completed",
-                ),
-                many=True,
+            serialized_work["phase_info"] = cached_schema(
+                WorkPhaseAdditionalInfoResponseSchema, only=WORK_PLAN_PHASE_FIELDS, many=True
             ).dump(work_phase)
-
-            serialized_work["phase_info"] = serialised_phase
-        serialized_work["status_info"] = WorkStatusResponseSchema(many=False).dump(
-            works_status
-        )
-        serialized_work["staff_info"] = StaffWorkRoleResponseSchema(many=True).dump(
-            staff_info
-        )
+        serialized_work["status_info"] = cached_schema(WorkStatusResponseSchema).dump(works_status)
+        serialized_work["staff_info"] = cached_schema(StaffWorkRoleResponseSchema, many=True).dump(staff_info)
 
         return serialized_work
 
@@ -241,18 +232,13 @@ class WorkService:  # pylint: disable=too-many-public-methods
         cls._check_duplicate_title(payload)
         work = Work(**payload)
         work.work_state = WorkStateEnum.IN_PROGRESS
-        phases = PhaseService.find_phase_codes_by_ea_act_and_work_type(
-            work.ea_act_id, work.work_type_id
-        )
+        phases = TemplateGraphService.find_graph(work.ea_act_id, work.work_type_id).phases
         if not phases:
             raise UnprocessableEntityError("No configuration found")
-        phase_ids = list(map(lambda x: x.id, phases))
-        event_templates = EventTemplateService.find_by_phase_ids(phase_ids)
-        event_template_json = EventTemplateResponseSchema(many=True).dump(
-            event_templates
-        )
         work = work.flush()
         cls.create_special_fields(work)
+        instantiation = TemplateInstantiation()
+        work_phases = []
         phase_start_date = work.start_date
         sort_order = 1
         for phase in phases:
@@ -268,19 +254,12 @@ class WorkService:  # pylint: disable=too-many-public-methods
                 "sort_order": sort_order,
                 "visibility": phase.visibility,
             }
-            phase_event_templates = [
-                template
-                for template in event_template_json
-                if template["phase_id"] == phase.id
-            ]
-            work_phase = cls.create_events_by_template(
-                work_phase, phase_event_templates
-            )
+            work_phases.append(instantiation.add_phase(work_phase, phase.event_templates))
             if phase.visibility.value != PhaseVisibilityEnum.HIDDEN.value:
                 phase_start_date = end_date + timedelta(days=1)
-            if sort_order == 1:
-                work.current_work_phase_id = work_phase.id
             sort_order = sort_order + 1
+        instantiation.save()
+        work.current_work_phase_id = work_phases[0].id
         # dev-note: find_code_values_by_type - we should use RoleService instead of the "code" way
 
         if commit:
@@ -353,6 +332,10 @@ class WorkService:  # pylint: disable=too-many-public-methods
             .join(Staff, StaffWorkRole.staff_id == Staff.id)
             .join(Role, StaffWorkRole.role_id == Role.id)
             .join(Work, StaffWorkRole.work_id == Work.id)
+            .options(
+                contains_eager(StaffWorkRole.staff).joinedload(Staff.position),
+                contains_eager(StaffWorkRole.role),
+            )
             .filter(
                 StaffWorkRole.is_deleted.is_(False),
                 StaffWorkRole.is_active.is_(True),
@@ -462,7 +445,7 @@ class WorkService:  # pylint: disable=too-many-public-methods
         return cls.create_work_staff(work_id, data, commit)
 
     @classmethod
-    def replace_work_staff(cls, work_id: int, data: dict):
+    def replace_work_staff(cls, work_id: int, data: dict, commit: bool = True):
         """Replace work staff"""
         work_staff = StaffWorkRole.find_one_by_role_and_work(
             work_id, data.get("role_id")
@@ -476,106 +459,16 @@ class WorkService:  # pylint: disable=too-many-public-methods
             cls.update_work_staff(work_staff.id, update_data, commit=False)
 
         upserted_work_staff = cls.upsert_work_staff(work_id, data, commit=False)
-        db.session.commit()
+        if commit:
+            db.session.commit()
         return upserted_work_staff
 
     @classmethod
-    def copy_outcome_and_actions(
-            cls, template: dict, config: EventConfiguration, from_template: bool = True
-    ) -> None:
-        """Copy the outcome and actions"""
-        if from_template:
-            outcome_params = {"event_template_id": template.get("id")}
-            outcomes = OutcomeTemplateService.find_all_outcomes(outcome_params)
-            outcome_ids = list(map(lambda x: x.id, outcomes))
-            actions = ActionTemplate.find_by_outcome_ids(outcome_ids)
-        else:
-            outcome_params = {"event_configuration_id": template.get("id")}
-            outcomes = OutcomeConfigurationService.find_all_outcomes(outcome_params)
-            outcome_ids = list(map(lambda x: x.id, outcomes))
-            actions = ActionConfiguration.find_by_outcome_ids(outcome_ids)
-        for outcome in outcomes:
-            outcome_json = OutcomeTemplateResponseSchema().dump(outcome)
-            outcome_json["event_configuration_id"] = config.id
-            outcome_json["outcome_template_id"] = (
-                outcome.id if from_template else outcome.outcome_template_id
-            )
-
-            outcome_result = OutcomeConfiguration(
-                **OutcomeConfigurationBodyParameterSchema().load(outcome_json)
-            ).flush()
-            outcome_actions = list(
-                filter(
-                    lambda x, _outcome_id=outcome.id: (
-                        x.outcome_id == _outcome_id
-                        if from_template
-                        else x.outcome_configuration_id == _outcome_id
-                    ),
-                    actions,
-                )
-            )
-            for outcome_action in outcome_actions:
-                action_json = ActionTemplateResponseSchema().dump(outcome_action)
-                action_json["outcome_configuration_id"] = outcome_result.id
-                action_json["action_template_id"] = (
-                    outcome_action.id
-                    if from_template
-                    else outcome_action.action_template_id
-                )
-
-                ActionConfiguration(
-                    **ActionConfigurationBodyParameterSchema().load(action_json)
-                ).flush()
-
-    @classmethod
-    def _find_start_at_value(cls, start_at: str, number_of_days: int) -> int:
-        """Calculate the start at value"""
-        # pylint: disable=eval-used
-        start_at_value = (
-            eval(start_at.replace("number_of_days", str(number_of_days)))
-            if "number_of_days" in start_at
-            else int(start_at)
-        )
-        return start_at_value + number_of_days
-
-    @classmethod
-    def _prepare_regular_event(  # pylint: disable=too-many-arguments
-        cls,
-        name: str,
-        start_date: str,
-        number_of_days: int,
-        ev_config_id: int,
-        work_id: int,
-        source_e_id: int = None,
-    ) -> dict:
-        """Prepare the event object"""
-        return {
-            "name": name,
-            "anticipated_date": f"{start_date}",
-            "number_of_days": number_of_days,
-            "event_configuration_id": ev_config_id,
-            "source_event_id": source_e_id,
-            "work_id": work_id,
-        }
-
-    @classmethod
-    def _prepare_configuration(cls, data, from_template) -> dict:
-        """Prepare the configuration object"""
-        return {
-            "name": data["name"],
-            "parent_id": data["parent_id"],
-            "event_type_id": data["event_type_id"],
-            "event_category_id": data["event_category_id"],
-            "start_at": data["start_at"],
-            "number_of_days": data["number_of_days"],
-            "event_position": data["event_position"],
-            "multiple_days": data["multiple_days"],
-            "sort_order": data["sort_order"],
-            "template_id": data["id"] if from_template else data["template_id"],
-            "work_phase_id": data["work_phase_id"],
-            "visibility": data["visibility"],
-            "repeat_count": 1,
-        }
+    def copy_outcome_and_actions(cls, source_config: dict, config: EventConfiguration) -> None:
+        """Copy the outcome and actions of the source configuration"""
+        instantiation = TemplateInstantiation()
+        instantiation.add_outcomes(config, source_config.get("id"))
+        instantiation.save()
 
     @classmethod
     def find_by_id(cls, work_id, exclude_deleted=False):
@@ -624,27 +517,20 @@ class WorkService:  # pylint: disable=too-many-public-methods
         work_plan_schema.context["type"] = "Task"
         tasks_json = work_plan_schema.dump(task_events)
 
-        data = pd.DataFrame(milestones_json + tasks_json)
-        data["start_date"] = pd.to_datetime(data["start_date"])
-        data = data.sort_values(by="start_date")
-
-        data["start_date"] = data["start_date"].dt.strftime(
-            "%b. %d %Y"
-        )  # pylint: disable=unsubscriptable-object,
-        # unsupported-assignment-operation
-        data["end_date"] = data["end_date"].dt.strftime(
-            "%b. %d %Y"
-        )  # pylint: disable=unsubscriptable-object,
-        # unsupported-assignment-operation
-
-        file_buffer = BytesIO()
+        rows = sorted(milestones_json + tasks_json, key=lambda row: pd.Timestamp(row["start_date"]))
         columns = ["name", "type", "start_date", "end_date", "days", "assigned",
                    "responsibility", "notes", "progress"]
         headers = ["Name", "Type", "Start Date", "End Date", "Days", "Assigned",
                    "Responsibility", "Notes", "Progress"]
-        data.to_excel(file_buffer, index=False, columns=columns, header=headers)
-        file_buffer.seek(0, 0)
-        return file_buffer.getvalue()
+        return write_workbook([ExportSheet("Sheet1", headers, cls._workplan_rows(rows, columns))])
+
+    @classmethod
+    def _workplan_rows(cls, rows: List[dict], columns: List[str]):
+        """Rows of the workplan sheet with the dates written out"""
+        for row in rows:
+            for date_column in ("start_date", "end_date"):
+                row[date_column] = pd.Timestamp(row[date_column]).strftime("%b. %d %Y")
+            yield [row[column] for column in columns]
 
     @classmethod
     def find_first_nations(cls, work_id: int, is_active) -> List[IndigenousNation]:
@@ -780,9 +666,6 @@ class WorkService:  # pylint: disable=too-many-public-methods
         schema = WorkFirstNationSchema(many=True)
         data = schema.dump(first_nations)
 
-        data = pd.DataFrame(data)
-
-        file_buffer = BytesIO()
         columns = [
             "nation",
             "consultation_level",
@@ -797,9 +680,8 @@ class WorkService:  # pylint: disable=too-many-public-methods
             "PIP Link",
             "Active",
         ]
-        data.to_excel(file_buffer, index=False, columns=columns, header=headers)
-        file_buffer.seek(0, 0)
-        return file_buffer.getvalue()
+        rows = ([row[column] for column in columns] for row in data)
+        return write_workbook([ExportSheet("Sheet1", headers, rows)])
 
     @classmethod
     def import_first_nations(cls, work_id: int, indigenous_nation_ids: [int]):
@@ -879,136 +761,6 @@ class WorkService:  # pylint: disable=too-many-public-methods
             return True
         return False
 
-    @classmethod
-    def create_events_by_template(
-            cls, work_phase: WorkPhase, phase_event_templates: List[dict]
-    ) -> int:  # pylint: disable=too-many-locals
-        """Create a new work phase and related events and event configuration entries"""
-        work_phase = WorkPhase.flush(WorkPhase(**work_phase))
-        event_configurations = cls.create_configurations(
-            work_phase, phase_event_templates
-        )
-        cls.create_events_by_configuration(work_phase, event_configurations)
-        return work_phase
-
-    @classmethod
-    def create_configurations(
-        cls,
-        work_phase: WorkPhase,
-        event_configs: List[dict],
-        from_template: bool = True,
-    ) -> List[EventConfiguration]:
-        """Create event configurations from existing configurations/templates"""
-        event_configurations: List[EventConfiguration] = []
-        for parent_config in list(filter(lambda x: not x["parent_id"], event_configs)):
-            parent_config["work_phase_id"] = work_phase.id
-            p_result = EventConfiguration(
-                **cls._prepare_configuration(parent_config, from_template)
-            )
-            p_result.flush()
-            event_configurations.append(p_result)
-            cls.copy_outcome_and_actions(parent_config, p_result, from_template)
-            child_configs = [
-                child
-                for child in event_configs
-                if child["parent_id"] == parent_config["id"]
-            ]
-            for child in child_configs:
-                child["parent_id"] = p_result.id
-                child["work_phase_id"] = work_phase.id
-                c_result = EventConfiguration.flush(
-                    EventConfiguration(
-                        **cls._prepare_configuration(child, from_template)
-                    )
-                )
-                event_configurations.append(c_result)
-                cls.copy_outcome_and_actions(child, c_result, from_template)
-        return event_configurations
-
-    @classmethod
-    def create_events_by_configuration(
-        cls, work_phase: WorkPhase, event_configurations: List[EventConfiguration]
-    ) -> None:
-        """Create events by given event configurations"""
-        if work_phase.visibility.value == PhaseVisibilityEnum.REGULAR.value:
-            parent_event_configs = [
-                parent_config
-                for parent_config in event_configurations
-                if parent_config.visibility
-                in [
-                    EventTemplateVisibilityEnum.MANDATORY.value,
-                    EventTemplateVisibilityEnum.SUGGESTED.value,
-                ]
-                and parent_config.work_phase_id == work_phase.id
-                and parent_config.parent_id is None
-            ]
-            for p_event_conf in parent_event_configs:
-                days = cls._find_start_at_value(p_event_conf.start_at, 0)
-                p_event_start_date = datetime.fromisoformat(
-                    work_phase.start_date
-                ) + timedelta(days=days)
-                p_event = Event.flush(
-                    Event(
-                        **cls._prepare_regular_event(
-                            p_event_conf.name,
-                            str(p_event_start_date),
-                            p_event_conf.number_of_days,
-                            p_event_conf.id,
-                            p_event_conf.work_phase.work.id,
-                        )
-                    )
-                )
-                c_events = [
-                    c_event
-                    for c_event in event_configurations
-                    if c_event.visibility
-                    in [
-                        EventTemplateVisibilityEnum.MANDATORY.value,
-                        EventTemplateVisibilityEnum.SUGGESTED.value,
-                    ]
-                    and c_event.work_phase_id == work_phase.id
-                    and c_event.parent_id == p_event_conf.id
-                ]
-                for c_event_conf in c_events:
-                    c_event_start_date = p_event_start_date + timedelta(
-                        days=cls._find_start_at_value(c_event_conf.start_at, 0)
-                    )
-                    if (
-                        c_event_conf.event_category_id
-                        == EventCategoryEnum.CALENDAR.value
-                    ):
-                        cal_event = CalendarEvent.flush(
-                            CalendarEvent(
-                                **{
-                                    "name": c_event_conf.name,
-                                    "anticipated_date": c_event_start_date,
-                                    "number_of_days": c_event_conf.number_of_days,
-                                }
-                            )
-                        )
-                        WorkCalendarEvent.flush(
-                            WorkCalendarEvent(
-                                **{
-                                    "calendar_event_id": cal_event.id,
-                                    "source_event_id": p_event.id,
-                                    "event_configuration_id": c_event_conf.id,
-                                }
-                            )
-                        )
-                    else:
-                        Event.flush(
-                            Event(
-                                **cls._prepare_regular_event(
-                                    c_event_conf.name,
-                                    str(c_event_start_date),
-                                    c_event_conf.number_of_days,
-                                    c_event_conf.id,
-                                    c_event_conf.work_phase.work.id,
-                                    p_event.id,
-                                )
-                            )
-                        )
-
     @classmethod
     def find_all_work_types(cls):
         """Get all work types"""
@@ -13,19 +13,17 @@
 # limitations under the License.
 """Service to manage Work phases."""
 import datetime
-import functools
 from collections import defaultdict
 from datetime import timezone
 from typing import List, Dict, Any, Union
 
-from api.models import PhaseCode, WorkPhase, PRIMARY_CATEGORIES, db
-from api.models.event_type import EventTypeEnum
-from api.models.event_category import EventCategoryEnum
+from sqlalchemy.orm import contains_eager
+
+from api.models import PhaseCode, WorkPhase, db
 from api.schemas.work_v2 import WorkPhaseSchema
 from api.models.phase_code import PhaseVisibilityEnum
-from api.services.event import EventService
 from api.services.task_template import TaskTemplateService
-from .common_service import event_compare_func
+from api.services.work_phase_summary import WorkPhaseSummaryService
 
 
 class WorkPhaseService:  # pylint: disable=too-few-public-methods
@@ -112,10 +110,11 @@ class WorkPhaseService:  # pylint: disable=too-few-public-methods
         work_ids = list(work_params_dict.keys())
 
         work_phases_dict = cls.find_work_phases_by_work_ids(work_ids)[0]
+        summaries = WorkPhaseSummaryService.find_by_work_ids(work_ids)
 
-        for work_id, _work_phase_id in work_params_dict.items():
+        for work_id in work_params_dict:
             result_dict[work_id] = cls._find_work_phase_status(
-                work_id, None, work_phases_dict.get(work_id, [])
+                work_phases_dict.get(work_id, []), summaries
             )
 
         return result_dict
@@ -126,6 +125,7 @@ class WorkPhaseService:  # pylint: disable=too-few-public-methods
         work_phases_dict = (
             db.session.query(WorkPhase.work_id, WorkPhase)
             .join(PhaseCode, WorkPhase.phase_id == PhaseCode.id)
+            .options(contains_eager(WorkPhase.phase))
             .filter(
                 WorkPhase.work_id.in_(work_ids),
                 WorkPhase.is_deleted.is_(False),
@@ -145,106 +145,28 @@ class WorkPhaseService:  # pylint: disable=too-few-public-methods
         return result_dict, total_work_phases
 
     @classmethod
-    def _find_work_phase_status(cls, work_id, work_phase_id, work_phases):
-        """Find work phase status for the work Id.If work_phase_id is passed , only that phase is considered."""
+    def _find_work_phase_status(cls, work_phases, summaries):
+        """Build the work phase status from the precomputed summaries"""
         result = []
-        events = EventService.find_events(work_id, event_categories=PRIMARY_CATEGORIES)
-        if work_phase_id is not None:
-            work_phases = [wp for wp in work_phases if wp.id == work_phase_id]
         for index, work_phase in enumerate(work_phases, start=1):
-            result_item = {"work_phase": work_phase}
-            total_days = (
-                work_phase.end_date.date() - work_phase.start_date.date()
-            ).days
-            work_phase_events = cls._filter_sort_events(events, work_phase)
-
-            suspended_days = functools.reduce(
-                lambda x, y: x + y,
-                map(
-                    lambda x: (
-                        x.number_of_days
-                        if x.event_configuration.event_type_id
-                        == EventTypeEnum.TIME_LIMIT_RESUMPTION.value
-                        and x.actual_date is not None
-                        else 0
-                    ),
-                    work_phase_events,
+            summary = summaries[work_phase.id]
+            result.append({
+                "work_phase": work_phase,
+                "total_number_of_days": summary.total_days - summary.suspended_days,
+                "current_milestone": summary.current_milestone,
+                "next_milestone": summary.next_milestone,
+                "next_milestone_date": summary.next_milestone_date,
+                "decision_milestone": summary.decision_milestone,
+                "decision": summary.decision,
+                "decision_milestone_date": summary.decision_milestone_date,
+                "milestone_progress": summary.milestone_progress,
+                "days_left": cls._get_days_left(
+                    summary.suspended_days, summary.total_days, work_phase
                 ),
-            )
-            result_item["total_number_of_days"] = total_days - suspended_days
-
-            milestone_info = cls._get_milestone_information(work_phase_events)
-            result_item = {**result_item, **milestone_info}
-
-            days_left = cls._get_days_left(suspended_days, total_days, work_phase)
-            result_item["days_left"] = days_left
-            result_item["is_last_phase"] = index == len(work_phases)
-            result.append(result_item)
-        return result
-
-    @classmethod
-    def _get_milestone_information(cls, work_phase_events):
-        result = {}
-        completed_milestone_events = [
-            event for event in work_phase_events if event.actual_date
-        ]
-        result["current_milestone"] = (
-            completed_milestone_events[-1].name if completed_milestone_events else None
-        )
-
-        remaining_milestone_events = [
-            event for event in work_phase_events if event.actual_date is None
-        ]
-        result["next_milestone"] = (
-            remaining_milestone_events[0].name if remaining_milestone_events else None
-        )
-        result["next_milestone_date"] = (
-            remaining_milestone_events[0].anticipated_date
-            if remaining_milestone_events
-            else None
-        )
-
-        decision_milestones = [
-            event
-            for event in work_phase_events
-            if event.event_configuration.event_category_id
-            == EventCategoryEnum.DECISION.value
-            and event.actual_date
-        ]
-
-        result["decision_milestone"] = (
-            decision_milestones[-1].name if decision_milestones else None
-        )
-        result["decision"] = (
-            decision_milestones[-1].outcome.name if decision_milestones else None
-        )
-        result["decision_milestone_date"] = (
-            decision_milestones[-1].actual_date if decision_milestones else None
-        )
-
-        result["milestone_progress"] = cls._calculate_milestone_progress(
-            work_phase_events
-        )
-
+                "is_last_phase": index == len(work_phases),
+            })
         return result
 
-    @classmethod
-    def _calculate_milestone_progress(cls, work_phase_events):
-        total_number_of_milestones = len(work_phase_events)
-        completed_ones = sum(1 for x in work_phase_events if x.actual_date is not None)
-        milestone_progress = (completed_ones / total_number_of_milestones) * 100
-        return milestone_progress
-
-    @classmethod
-    def _filter_sort_events(cls, events, work_phase):
-        work_phase_events = [
-            x for x in events if x.event_configuration.work_phase_id == work_phase.id
-        ]
-        work_phase_events = sorted(
-            work_phase_events, key=functools.cmp_to_key(event_compare_func)
-        )
-        return work_phase_events
-
     @classmethod
     def _get_days_left(cls, suspended_days, total_days, work_phase):
         if (
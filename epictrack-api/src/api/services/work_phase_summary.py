@@ -0,0 +1,214 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Service to maintain the work phase summaries."""
+from typing import Dict, Iterable, List, Set
+
+from sqlalchemy import event, select
+
+from api.models import (
+    PRIMARY_CATEGORIES, Event, EventConfiguration, OutcomeConfiguration, WorkPhase, WorkPhaseSummary, db)
+from api.models.event_category import EventCategoryEnum
+from api.models.event_type import EventTypeEnum
+
+
+class WorkPhaseSummaryService:
+    """Service to maintain the precomputed status of the work phases"""
+
+    @classmethod
+    def find_by_work_ids(cls, work_ids: List[int]) -> Dict[int, WorkPhaseSummary]:
+        """Return the summaries of the work phases of the given works by work phase id
+
+        The summaries are written when the works change and backfilled by the migration
+        creating the table. A work phase without one is summarised for the read only,
+        reads do not write to the database.
+        """
+        if not work_ids:
+            return {}
+        summaries = {
+            summary.work_phase_id: summary
+            for summary in db.session.query(WorkPhaseSummary).filter(
+                WorkPhaseSummary.work_id.in_(work_ids)
+            )
+        }
+        missing_work_ids = {
+            work_id
+            for work_id, work_phase_id in db.session.query(WorkPhase.work_id, WorkPhase.id).filter(
+                WorkPhase.work_id.in_(work_ids), WorkPhase.is_deleted.is_(False)
+            )
+            if work_phase_id not in summaries
+        }
+        if missing_work_ids:
+            for work_phase_id, summary in cls._summarise(missing_work_ids, {}).items():
+                summaries.setdefault(work_phase_id, summary)
+        return summaries
+
+    @classmethod
+    def refresh(cls, work_ids: Iterable[int]) -> Dict[int, WorkPhaseSummary]:
+        """Recompute and write the summaries of the work phases of the given works"""
+        work_ids = list(work_ids)
+        summaries = {
+            summary.work_phase_id: summary
+            for summary in db.session.query(WorkPhaseSummary).filter(
+                WorkPhaseSummary.work_id.in_(work_ids)
+            )
+        }
+        existing_work_phase_ids = set(summaries)
+        summaries = cls._summarise(work_ids, summaries)
+        db.session.add_all(
+            summary for work_phase_id, summary in summaries.items() if work_phase_id not in existing_work_phase_ids
+        )
+        db.session.flush()
+        return summaries
+
+    @classmethod
+    def _summarise(
+        cls, work_ids: Iterable[int], summaries: Dict[int, WorkPhaseSummary]
+    ) -> Dict[int, WorkPhaseSummary]:
+        """Compute the summaries of the work phases of the works, creating those missing outside of the session"""
+        from api.services.event import EventService  # pylint: disable=import-outside-toplevel
+
+        work_ids = list(work_ids)
+        work_phases = (
+            db.session.query(WorkPhase)
+            .filter(WorkPhase.work_id.in_(work_ids), WorkPhase.is_deleted.is_(False))
+            .all()
+        )
+        work_events_dict = EventService.find_events_for_works(work_ids, PRIMARY_CATEGORIES)
+        for work_phase in work_phases:
+            summary = summaries.get(work_phase.id)
+            if summary is None:
+                summary = WorkPhaseSummary(work_phase_id=work_phase.id, work_id=work_phase.work_id)
+                summaries[work_phase.id] = summary
+            cls._compute(
+                summary,
+                work_phase,
+                work_events_dict.get(work_phase.work_id, {}).get(work_phase.id, []),
+            )
+        return summaries
+
+    @classmethod
+    def _compute(cls, summary: WorkPhaseSummary, work_phase: WorkPhase, work_phase_events: List[Event]):
+        """Compute the summary of the work phase from its sorted events"""
+        summary.total_days = (work_phase.end_date.date() - work_phase.start_date.date()).days
+        summary.suspended_days = sum(
+            x.number_of_days
+            for x in work_phase_events
+            if x.event_configuration.event_type_id == EventTypeEnum.TIME_LIMIT_RESUMPTION.value
+            and x.actual_date is not None
+        )
+        completed_milestone_events = [event for event in work_phase_events if event.actual_date]
+        summary.current_milestone = (
+            completed_milestone_events[-1].name if completed_milestone_events else None
+        )
+        remaining_milestone_events = [
+            event for event in work_phase_events if event.actual_date is None
+        ]
+        summary.next_milestone = (
+            remaining_milestone_events[0].name if remaining_milestone_events else None
+        )
+        summary.next_milestone_date = (
+            remaining_milestone_events[0].anticipated_date if remaining_milestone_events else None
+        )
+        decision_milestones = [
+            event
+            for event in work_phase_events
+            if event.event_configuration.event_category_id == EventCategoryEnum.DECISION.value
+            and event.actual_date
+        ]
+        summary.decision_milestone = decision_milestones[-1].name if decision_milestones else None
+        summary.decision = decision_milestones[-1].outcome.name if decision_milestones else None
+        summary.decision_milestone_date = (
+            decision_milestones[-1].actual_date if decision_milestones else None
+        )
+        summary.milestone_progress = (
+            len(completed_milestone_events) / len(work_phase_events) * 100
+            if work_phase_events
+            else 0
+        )
+
+
+def _collect_work_ids(session, *args, **kwargs):  # pylint: disable=unused-argument
+    work_ids = session.info.setdefault("work_phase_summary_work_ids", set())
+    work_phase_ids = session.info.setdefault("work_phase_summary_work_phase_ids", set())
+    outcome_ids = session.info.setdefault("work_phase_summary_outcome_ids", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, (Event, WorkPhase)) and obj.work_id:
+            work_ids.add(obj.work_id)
+        elif obj in session.dirty and not session.is_modified(obj):
+            continue
+        elif isinstance(obj, EventConfiguration) and obj.work_phase_id:
+            work_phase_ids.add(obj.work_phase_id)
+        elif isinstance(obj, OutcomeConfiguration) and obj.id and obj not in session.new:
+            outcome_ids.add(obj.id)
+
+
+def _collect_bulk_work_ids(orm_execute_state):
+    """Collect the works of the events and phases changed by bulk updates and deletes
+
+    Those are not seen by the flush, so the works are read with the criteria of the
+    statement before it runs.
+    """
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.class_ not in (Event, WorkPhase):
+        return
+    model = mapper.class_
+    work_ids_query = select(model.work_id).distinct()
+    if orm_execute_state.statement.whereclause is not None:
+        work_ids_query = work_ids_query.where(orm_execute_state.statement.whereclause)
+    session = orm_execute_state.session
+    work_ids = session.info.setdefault("work_phase_summary_work_ids", set())
+    work_ids.update(work_id for work_id in session.execute(work_ids_query).scalars() if work_id)
+
+
+def _summarised_work_ids(session) -> Set[int]:
+    """Works to summarise again, including those of the changed configurations and outcomes"""
+    work_ids = session.info.pop("work_phase_summary_work_ids", set())
+    work_phase_ids = session.info.pop("work_phase_summary_work_phase_ids", set())
+    outcome_ids = session.info.pop("work_phase_summary_outcome_ids", set())
+    if work_phase_ids:
+        work_ids.update(
+            work_id for work_id, in session.query(WorkPhase.work_id).filter(WorkPhase.id.in_(work_phase_ids))
+        )
+    if outcome_ids:
+        work_ids.update(
+            work_id for work_id, in session.query(Event.work_id).filter(Event.outcome_id.in_(outcome_ids)).distinct()
+        )
+    return work_ids
+
+
+def _refresh_summaries(session):
+    session.flush()
+    work_ids = _summarised_work_ids(session)
+    if work_ids:
+        # Reload the flushed values as they are, the commit expires them anyway
+        session.expire_all()
+        WorkPhaseSummaryService.refresh(work_ids)
+
+
+def _discard_work_ids(session):
+    session.info.pop("work_phase_summary_work_ids", None)
+    session.info.pop("work_phase_summary_work_phase_ids", None)
+    session.info.pop("work_phase_summary_outcome_ids", None)
+
+
+def work_phase_summary_session(session):
+    """Keep the summaries of the works changed in the session up to date on commit"""
+    if event.contains(session, "after_flush", _collect_work_ids):
+        return
+    event.listen(session, "after_flush", _collect_work_ids)
+    event.listen(session, "do_orm_execute", _collect_bulk_work_ids)
+    event.listen(session, "before_commit", _refresh_summaries)
+    event.listen(session, "after_rollback", _discard_work_ids)
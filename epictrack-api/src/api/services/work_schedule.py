@@ -0,0 +1,191 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Work scoped schedule used by the milestone date logic."""
+import copy
+import functools
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import DateTime, Integer, column, update, values
+from sqlalchemy.orm import attributes, contains_eager, joinedload
+
+from api.models import PRIMARY_CATEGORIES, Event, EventConfiguration, Work, WorkCalendarEvent, WorkPhase, db
+from api.models.phase_code import PhaseVisibilityEnum
+from api.utils.utcnow import utcnow
+
+from .common_service import event_compare_func
+from .event_configuration import EventConfigurationService
+
+
+class WorkSchedule:  # pylint: disable=too-many-instance-attributes
+    """In-memory view of the phases, event configurations and events of a work
+
+    Everything the date logic needs is loaded once when the schedule is built.
+    Date shifts are applied to the loaded objects and written back together by
+    the next flush of the session, except the anticipated dates moved through
+    reschedule, which save_reschedules writes with one statement per table.
+    """
+
+    def __init__(self, work_id: int):
+        """Load the schedule of the given work"""
+        self.work_id = work_id
+        self.work = Work.find_by_id(work_id)
+        self.work_phases = WorkPhase.find_by_params({"work_id": work_id})
+        self.regular_work_phases = sorted(
+            (
+                work_phase
+                for work_phase in self.work_phases
+                if work_phase.visibility == PhaseVisibilityEnum.REGULAR
+            ),
+            key=lambda x: x.sort_order,
+        )
+        self.event_configurations = (
+            EventConfigurationService.find_all_configurations_by_work(work_id)
+        )
+        self._child_configurations = defaultdict(list)
+        for configuration in self.event_configurations:
+            if configuration.parent_id:
+                self._child_configurations[configuration.parent_id].append(
+                    configuration
+                )
+        events = (
+            db.session.query(Event)
+            .join(
+                EventConfiguration,
+                Event.event_configuration_id == EventConfiguration.id,
+            )
+            .options(contains_eager(Event.event_configuration))
+            .filter(Event.is_active.is_(True), Event.work_id == work_id)
+            .order_by(Event.id)
+            .all()
+        )
+        self._events = {event.id: event for event in events}
+        self._child_events = {}
+        for event in events:
+            if event.source_event_id:
+                self._child_events.setdefault(event.source_event_id, event)
+        # Copies not attached to the session, so that the ordering of the events
+        # reflects the dates before any change is applied.
+        category_ids = [category.value for category in PRIMARY_CATEGORIES]
+        self._snapshot = defaultdict(list)
+        for event in events:
+            if (
+                event.event_configuration.is_active
+                and event.event_configuration.event_category_id in category_ids
+            ):
+                self._snapshot[event.event_configuration.work_phase_id].append(
+                    copy.copy(event)
+                )
+        for work_phase_id, phase_events in self._snapshot.items():
+            self._snapshot[work_phase_id] = sorted(
+                phase_events, key=functools.cmp_to_key(event_compare_func)
+            )
+        self._calendar_events: Optional[Dict[Tuple[int, int], WorkCalendarEvent]] = None
+        # Events and calendar events whose anticipated date was moved, by model and id
+        self._rescheduled: Dict[type, Dict[int, object]] = defaultdict(dict)
+
+    def phase_events(self, work_phase_id: int) -> List[Event]:
+        """Return the sorted snapshot of the primary events of the phase"""
+        return list(self._snapshot.get(work_phase_id, []))
+
+    def all_events(self) -> List[Event]:
+        """Return the snapshot of the primary events of the work"""
+        return [event for events in self._snapshot.values() for event in events]
+
+    def find_event(self, event_id: int) -> Event:
+        """Return the session bound event with the given id"""
+        return self._events.get(event_id)
+
+    def child_configurations(self, configuration_id: int) -> List[EventConfiguration]:
+        """Return the child configurations of the given configuration"""
+        return self._child_configurations.get(configuration_id, [])
+
+    def find_child_event(self, source_event_id: int) -> Event:
+        """Return the active child event created from the given event"""
+        return self._child_events.get(source_event_id)
+
+    def add_child_event(self, event: Event) -> None:
+        """Register a child event created while processing the schedule"""
+        self._child_events.setdefault(event.source_event_id, event)
+
+    def find_calendar_event(
+        self, configuration_id: int, source_event_id: int
+    ) -> WorkCalendarEvent:
+        """Return the active work calendar event created from the given event"""
+        if self._calendar_events is None:
+            self._calendar_events = {}
+            if self._events:
+                work_calendar_events = (
+                    db.session.query(WorkCalendarEvent)
+                    .options(joinedload(WorkCalendarEvent.calendar_event))
+                    .filter(
+                        WorkCalendarEvent.source_event_id.in_(list(self._events)),
+                        WorkCalendarEvent.is_active.is_(True),
+                    )
+                    .all()
+                )
+                for work_calendar_event in work_calendar_events:
+                    self._calendar_events[
+                        (
+                            work_calendar_event.event_configuration_id,
+                            work_calendar_event.source_event_id,
+                        )
+                    ] = work_calendar_event
+        return self._calendar_events.get((configuration_id, source_event_id))
+
+    def add_calendar_event(self, work_calendar_event: WorkCalendarEvent) -> None:
+        """Register a work calendar event created while processing the schedule"""
+        if self._calendar_events is not None:
+            self._calendar_events[
+                (
+                    work_calendar_event.event_configuration_id,
+                    work_calendar_event.source_event_id,
+                )
+            ] = work_calendar_event
+
+    def reschedule(self, row, anticipated_date) -> None:
+        """Move the anticipated date of a loaded event or calendar event"""
+        row.anticipated_date = anticipated_date
+        self._rescheduled[type(row)][row.id] = row
+
+    def save_reschedules(self) -> None:
+        """Write the moved anticipated dates with one UPDATE ... FROM (VALUES ...) per table
+
+        The dates written are marked as persisted so that the flush does not update
+        the rows again one at a time. The rows stay dirty in the session, so the
+        history listener still records their new version on the next flush.
+        """
+        for model, rows in self._rescheduled.items():
+            moved = [
+                row
+                for row in rows.values()
+                if attributes.get_history(row, "anticipated_date").has_changes()
+            ]
+            if not moved:
+                continue
+            dates = values(
+                column("id", Integer),
+                column("anticipated_date", DateTime(timezone=True)),
+                name="dates",
+            ).data([(row.id, row.anticipated_date) for row in moved])
+            table = model.__table__
+            db.session.execute(
+                update(table)
+                .where(table.c.id == dates.c.id)
+                .values(anticipated_date=dates.c.anticipated_date, updated_at=utcnow())
+            )
+            for row in moved:
+                attributes.set_committed_value(row, "anticipated_date", row.anticipated_date)
+                db.session.expire(row, ["updated_at"])
+        self._rescheduled.clear()
@@ -1,8 +1,20 @@
 """Cache configurations."""
+import hashlib
 import pydoc
+import uuid
 
+from flask import has_app_context, request
 from flask_caching import Cache
+from flask_caching.backends import MemcachedCache, RedisCache, RedisClusterCache, RedisSentinelCache
+from sqlalchemy import event
+
 from api import config
+from api.models import db
+from api.models.code_table import LOOKUP_CACHE_TAG
+
+
+# Backends whose entries are seen by every worker, so that invalidating a tag reaches all of them
+SHARED_CACHE_BACKENDS = (MemcachedCache, RedisCache, RedisClusterCache, RedisSentinelCache)
 
 
 class AppCache:  # pylint: disable=too-few-public-methods
@@ -17,6 +29,76 @@ class AppCache:  # pylint: disable=too-few-public-methods
 
         AppCache.cache = Cache(config={
             "CACHE_TYPE": conf.CACHE_TYPE,
-            "CACHE_DEFAULT_TIMEOUT": conf.CACHE_DEFAULT_TIMEOUT
+            "CACHE_DEFAULT_TIMEOUT": conf.CACHE_DEFAULT_TIMEOUT,
+            "CACHE_KEY_PREFIX": conf.CACHE_KEY_PREFIX,
+            "CACHE_REDIS_URL": conf.CACHE_REDIS_URL,
+            "CACHE_DIR": conf.CACHE_DIR,
         })
         AppCache.cache.init_app(app)
+        cache_tag_session(db.session)
+
+    @staticmethod
+    def cached(timeout=None, query_string=False, tag=LOOKUP_CACHE_TAG):
+        """Cache the view, keyed by the current version of the given tag
+
+        Entries are not deleted when the tag is invalidated, they are just no longer
+        looked up and expire with their timeout.
+        """
+        def make_cache_key(*args, **kwargs):  # pylint: disable=unused-argument
+            cache_key = f"view/{tag}/{AppCache.tag_version(tag)}{request.path}"
+            if query_string:
+                args_as_sorted_tuple = tuple(sorted(request.args.items(multi=True)))
+                cache_key += "?" + hashlib.md5(str(args_as_sorted_tuple).encode()).hexdigest()
+            return cache_key
+
+        return AppCache.cache.cached(timeout=timeout, make_cache_key=make_cache_key)
+
+    @staticmethod
+    def tag_version(tag):
+        """Return the current version of the tag, shared by all the workers through the cache"""
+        tag_key = f"tag/{tag}"
+        version = AppCache.cache.get(tag_key)
+        if version is None:
+            AppCache.cache.add(tag_key, uuid.uuid4().hex, timeout=0)
+            version = AppCache.cache.get(tag_key)
+        return version
+
+    @staticmethod
+    def is_shared():
+        """Return whether the cache is shared by all the workers rather than kept by each process"""
+        if AppCache.cache is None or not has_app_context():
+            return False
+        return isinstance(AppCache.cache.cache, SHARED_CACHE_BACKENDS)
+
+    @staticmethod
+    def invalidate_tag(tag):
+        """Invalidate all the entries cached under the tag"""
+        AppCache.cache.set(f"tag/{tag}", uuid.uuid4().hex, timeout=0)
+
+
+def _collect_cache_tags(session, *args, **kwargs):  # pylint: disable=unused-argument
+    tags = session.info.setdefault("cache_tags", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        tag = getattr(obj, "__cache_tag__", None)
+        if tag and (obj not in session.dirty or session.is_modified(obj)):
+            tags.add(tag)
+
+
+def _invalidate_cache_tags(session):
+    tags = session.info.pop("cache_tags", set())
+    if AppCache.cache is not None and has_app_context():
+        for tag in tags:
+            AppCache.invalidate_tag(tag)
+
+
+def _discard_cache_tags(session):
+    session.info.pop("cache_tags", None)
+
+
+def cache_tag_session(session):
+    """Invalidate the cache tags of the models changed in the session once committed"""
+    if event.contains(session, "after_flush", _collect_cache_tags):
+        return
+    event.listen(session, "after_flush", _collect_cache_tags)
+    event.listen(session, "after_commit", _invalidate_cache_tags)
+    event.listen(session, "after_rollback", _discard_cache_tags)
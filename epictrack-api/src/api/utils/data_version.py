@@ -0,0 +1,39 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Fingerprint of the data held by a set of versioned models."""
+import hashlib
+import json
+from typing import Iterable
+
+from sqlalchemy import func, select
+
+from api.models import db
+from api.utils.run_version import get_run_version
+
+
+def get_data_version(models: Iterable) -> str:
+    """Return a fingerprint which changes whenever the rows of the models change
+
+    Every change made through the ORM writes a history row, so the highest history
+    primary key of each table moves with it. The latest updated_at also covers the
+    bulk updates, which do not write history.
+    """
+    high_water_marks = []
+    for model in models:
+        history_table = model.__history_mapper__.local_table
+        high_water_marks.append(select(func.max(history_table.c.pk)).scalar_subquery())
+        high_water_marks.append(select(func.max(model.updated_at)).scalar_subquery())
+    row = db.session.execute(select(*high_water_marks)).one()
+    version = json.dumps([get_run_version(), *row], default=str)
+    return hashlib.sha256(version.encode()).hexdigest()
@@ -0,0 +1,50 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Cooperative database waits for the gevent workers.
+
+psycopg2 talks to the server in C, out of reach of the monkey patching of gevent, so
+a query blocks the whole worker and every greenlet it serves until the server
+replies. With a wait callback, psycopg2 hands the waits on its socket back to
+Python, where they are made on the gevent hub and let the other greenlets run.
+"""
+import psycopg2
+from psycopg2 import extensions
+
+
+try:
+    from gevent.socket import wait_read, wait_write
+except ImportError:  # gevent is only installed along the gevent workers
+    wait_read = wait_write = None
+
+
+def patch_psycopg() -> bool:
+    """Make psycopg2 wait on the gevent hub, returning whether gevent is available"""
+    if wait_read is None:
+        return False
+    extensions.set_wait_callback(gevent_wait_callback)
+    return True
+
+
+def gevent_wait_callback(conn, timeout=None):
+    """Wait for the connection to be ready, yielding to the other greenlets meanwhile"""
+    while True:
+        state = conn.poll()
+        if state == extensions.POLL_OK:
+            break
+        if state == extensions.POLL_READ:
+            wait_read(conn.fileno(), timeout=timeout)
+        elif state == extensions.POLL_WRITE:
+            wait_write(conn.fileno(), timeout=timeout)
+        else:
+            raise psycopg2.OperationalError(f"Bad result from poll: {state}")
@@ -0,0 +1,152 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Finds the full table scans in the query plans of the statements run by the application.
+
+The statements are captured while the code runs, then explained with sequential scans
+disabled. When no index can serve the filter, the planner still falls back to a
+sequential scan or to walking a whole index. Such a scan is reported when its filter
+keeps a small share of the table and no index of the table leads with a filtered
+column, which points to a missing index regardless of how small the database is.
+"""
+import json
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+
+HOT_TABLES = (
+    "works",
+    "events",
+    "event_configurations",
+    "work_phases",
+    "staff_work_roles",
+    "work_statuses",
+)
+
+
+SCAN_NODE_TYPES = ("Seq Scan", "Index Scan", "Index Only Scan")
+
+# Share of the table a filter may keep and still be worth an index
+SELECTIVE_FRACTION = 0.05
+
+_IDENTIFIER = re.compile(r"[a-z_][a-z0-9_]*")
+
+
+@dataclass(frozen=True)
+class TableScan:
+    """A scan reading a whole table, or a whole index, to filter its rows"""
+
+    relation: str
+    node_type: str
+    filter: str
+    statement: str
+
+    def __str__(self):
+        """Return a one line description of the scan"""
+        return f"{self.node_type} on {self.relation} filtering {self.filter}"
+
+
+@contextmanager
+def capture_statements(engine: Engine) -> Iterator[List[Tuple[str, object]]]:
+    """Collect the statements executed on the engine within the block, with their parameters
+
+    Inserts are left out as their plans do not scan.
+    """
+    statements = []
+
+    def _before_cursor_execute(  # pylint: disable=too-many-arguments,unused-argument
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+def is_watched_relation(relation: str, tables: Iterable[str]) -> bool:
+    """Whether the relation is one of the tables or their history tables"""
+    return relation in tables or (relation.endswith("_history") and relation[: -len("_history")] in tables)
+
+
+def find_table_scans(
+    connection: Connection, statements: Iterable[Tuple[str, object]], tables: Iterable[str] = HOT_TABLES
+) -> List[TableScan]:
+    """Return the filtered full scans on the tables, or their history tables, in the plans of the statements"""
+    tables = set(tables)
+    scans = []
+    # Fresh statistics keep the planner from preferring the primary key for its ordering
+    # on tables it wrongly believes to be tiny
+    connection.exec_driver_sql(f"ANALYZE {', '.join(sorted(tables))}")
+    connection.exec_driver_sql("SET enable_seqscan = off")
+    relations = {}
+    try:
+        for statement, parameters in statements:
+            plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            for node in _plan_nodes(plan[0]["Plan"]):
+                if (
+                    node["Node Type"] not in SCAN_NODE_TYPES
+                    or "Filter" not in node
+                    or "Index Cond" in node
+                    or not is_watched_relation(node["Relation Name"], tables)
+                ):
+                    continue
+                relation = node["Relation Name"]
+                if relation not in relations:
+                    relations[relation] = _relation_stats(connection, relation)
+                row_count, columns, leading_columns = relations[relation]
+                filtered_columns = columns.intersection(_IDENTIFIER.findall(node["Filter"]))
+                if node["Plan Rows"] <= max(row_count, 1) * SELECTIVE_FRACTION and not (
+                    filtered_columns & leading_columns
+                ):
+                    scans.append(TableScan(relation, node["Node Type"], node["Filter"], statement))
+    finally:
+        connection.exec_driver_sql("RESET enable_seqscan")
+    return list(dict.fromkeys(scans))
+
+
+def _relation_stats(connection: Connection, relation: str) -> Tuple[float, Set[str], Set[str]]:
+    """Return the row count, the columns and the columns leading an index of the relation"""
+    row_count = connection.exec_driver_sql(
+        "SELECT reltuples FROM pg_class WHERE oid = %(relation)s::regclass", {"relation": relation}
+    ).scalar()
+    columns = set(
+        connection.exec_driver_sql(
+            "SELECT attname FROM pg_attribute WHERE attrelid = %(relation)s::regclass AND attnum > 0 "
+            "AND NOT attisdropped",
+            {"relation": relation},
+        ).scalars()
+    )
+    leading_keys = connection.exec_driver_sql(
+        "SELECT pg_get_indexdef(indexrelid, 1, true) FROM pg_index WHERE indrelid = %(relation)s::regclass",
+        {"relation": relation},
+    ).scalars()
+    leading_columns = {name for key in leading_keys for name in _IDENTIFIER.findall(key.lower())} & columns
+    return row_count, columns, leading_columns
+
+
+def _plan_nodes(node: dict) -> Iterator[dict]:
+    """Walk the nodes of a plan"""
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
@@ -0,0 +1,195 @@
+"""Request scoped instrumentation of the SQL statements, database time and serialization time."""
+import json
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Dict, Set
+
+from flask import current_app, g, has_request_context, request
+from marshmallow import Schema
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+
+N_PLUS_ONE_THRESHOLD = 5
+
+
+@dataclass
+class RequestMetrics:
+    """Metrics collected while handling a request"""
+
+    start_time: float = field(default_factory=time.perf_counter)
+    statements: int = 0
+    db_duration: float = 0
+    serialization_duration: float = 0
+    # distinct parameters seen for each statement
+    statement_parameters: Dict[str, Set[str]] = field(default_factory=lambda: defaultdict(set))
+    dump_depth: int = 0
+
+    def n_plus_one_statements(self, threshold: int) -> Dict[str, int]:
+        """Return the statements run with at least threshold different parameters"""
+        return {
+            statement: len(parameters)
+            for statement, parameters in self.statement_parameters.items()
+            if len(parameters) >= threshold
+        }
+
+
+class MetricsRegistry:
+    """Per process aggregation of the request metrics, exposed in Prometheus text format"""
+
+    COUNTERS = (
+        ("epictrack_requests_total", "Number of requests handled"),
+        ("epictrack_request_duration_seconds_total", "Time spent handling the requests"),
+        ("epictrack_db_statements_total", "Number of SQL statements executed"),
+        ("epictrack_db_duration_seconds_total", "Time spent executing SQL statements"),
+        ("epictrack_serialization_duration_seconds_total", "Time spent serializing the responses"),
+        ("epictrack_n_plus_one_total", "Number of statements repeated with different parameters"),
+    )
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self._lock = threading.Lock()
+        self._values = defaultdict(lambda: defaultdict(float))
+
+    def record(self, labels: tuple, metrics: RequestMetrics, duration: float, n_plus_one: int):
+        """Add the metrics of a request"""
+        with self._lock:
+            values = self._values[labels]
+            values["epictrack_requests_total"] += 1
+            values["epictrack_request_duration_seconds_total"] += duration
+            values["epictrack_db_statements_total"] += metrics.statements
+            values["epictrack_db_duration_seconds_total"] += metrics.db_duration
+            values["epictrack_serialization_duration_seconds_total"] += metrics.serialization_duration
+            values["epictrack_n_plus_one_total"] += n_plus_one
+
+    def render(self) -> str:
+        """Render the metrics in Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, description in self.COUNTERS:
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} counter")
+                for (method, route, status), values in sorted(self._values.items()):
+                    labels = f'method="{method}",route="{_escape(route)}",status="{status}"'
+                    lines.append(f"{name}{{{labels}}} {values[name]:g}")
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        """Remove all the recorded metrics"""
+        with self._lock:
+            self._values.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+
+def render_pool(pool, max_overflow: int) -> str:
+    """Render the occupancy of the connection pool of this worker as Prometheus gauges
+
+    The pool is saturated once the checked out connections reach its capacity, after
+    which requests wait up to the pool timeout for a connection.
+    """
+    if not isinstance(pool, QueuePool):
+        return ""
+    gauges = (
+        ("epictrack_db_pool_capacity", "Maximum number of connections of the pool", pool.size() + max_overflow),
+        ("epictrack_db_pool_size", "Number of connections the pool keeps open", pool.size()),
+        ("epictrack_db_pool_checked_out", "Number of connections in use", pool.checkedout()),
+        ("epictrack_db_pool_overflow", "Number of connections open beyond the pool size", max(pool.overflow(), 0)),
+    )
+    lines = []
+    for name, description, value in gauges:
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def current_metrics() -> RequestMetrics:
+    """Return the metrics of the current request if any"""
+    if has_request_context():
+        return g.get("request_metrics")
+    return None
+
+
+def _before_cursor_execute(conn, *args):  # pylint: disable=unused-argument
+    metrics = current_metrics()
+    if metrics is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, *args):  # pylint: disable=unused-argument
+    metrics = current_metrics()
+    if metrics is not None and conn.info.get("query_start_time"):
+        metrics.db_duration += time.perf_counter() - conn.info["query_start_time"].pop()
+        metrics.statements += 1
+        metrics.statement_parameters[statement].add(repr(parameters))
+
+
+def _instrument_schema_dump():
+    """Measure the time spent in the outermost marshmallow dump of a request"""
+    if getattr(Schema.dump, "instrumented", False):
+        return
+    dump = Schema.dump
+
+    @wraps(dump)
+    def timed_dump(self, obj, *, many=None):
+        metrics = current_metrics()
+        if metrics is None or metrics.dump_depth:
+            return dump(self, obj, many=many)
+        metrics.dump_depth += 1
+        start_time = time.perf_counter()
+        db_duration = metrics.db_duration
+        try:
+            return dump(self, obj, many=many)
+        finally:
+            metrics.dump_depth -= 1
+            # queries triggered by lazy loading are accounted as database time
+            metrics.serialization_duration += (
+                time.perf_counter() - start_time - (metrics.db_duration - db_duration)
+            )
+
+    timed_dump.instrumented = True
+    Schema.dump = timed_dump
+
+
+def _start_request():
+    g.request_metrics = RequestMetrics()
+
+
+def _record_request(response):
+    metrics = current_metrics()
+    if metrics is None:
+        return response
+    duration = time.perf_counter() - metrics.start_time
+    threshold = current_app.config.get("METRICS_N_PLUS_ONE_THRESHOLD", N_PLUS_ONE_THRESHOLD)
+    n_plus_one = metrics.n_plus_one_statements(threshold)
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    for statement, count in n_plus_one.items():
+        current_app.logger.warning(json.dumps({
+            "event": "n_plus_one",
+            "method": request.method,
+            "route": route,
+            "count": count,
+            "statement": statement,
+        }))
+    REGISTRY.record((request.method, route, response.status_code), metrics, duration, len(n_plus_one))
+    return response
+
+
+def setup_metrics(app):
+    """Collect the metrics of every request handled by the app"""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _instrument_schema_dump()
+    app.before_request(_start_request)
+    app.after_request(_record_request)
@@ -0,0 +1,93 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Keyset pagination of queries ordered by a sort column and the id.
+
+A page starts after the (sort value, id) of the last row of the previous page,
+which the cursor holds, so the database seeks to it through the index instead of
+counting and skipping the rows of all the previous pages as OFFSET does. The rows
+with no sort value come last in both directions, they are read by a separate query
+once the rows with a sort value run out so that the seek stays a single row-value
+comparison the index can serve.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import DateTime, and_, tuple_
+
+from api.exceptions import BadRequestError
+from api.models.db import db
+
+
+def encode_cursor(value: Any, last_id: int) -> str:
+    """Return the cursor of the page following the row with the sort value and id"""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return base64.urlsafe_b64encode(json.dumps([value, last_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str, column) -> Tuple[Any, int]:
+    """Return the sort value and the id held by the cursor"""
+    try:
+        value, last_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if value is not None and isinstance(column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        return value, int(last_id)
+    except (binascii.Error, TypeError, ValueError) as exc:
+        raise BadRequestError("Invalid pagination cursor") from exc
+
+
+def keyset_order_by(column, id_column, descending: bool) -> list:
+    """Order by the sort column then the id, both in the direction of the sort"""
+    if descending:
+        return [column.desc().nulls_last(), id_column.desc()]
+    return [column.asc().nulls_last(), id_column.asc()]
+
+
+def keyset_filter(column, id_column, descending: bool, value: Any, last_id: int):
+    """Filter the rows following the (sort value, id) in the keyset order
+
+    Past a row with a sort value only the rows with a sort value are kept, the rows
+    with no sort value that follow them are read with keyset_null_tail.
+    """
+    if value is None:
+        after_id = id_column < last_id if descending else id_column > last_id
+        return and_(column.is_(None), after_id)
+    if descending:
+        return tuple_(column, id_column) < tuple_(value, last_id)
+    return tuple_(column, id_column) > tuple_(value, last_id)
+
+
+def keyset_null_tail(column):
+    """Filter the rows with no sort value, which follow all the rows with one"""
+    return column.is_(None)
+
+
+def estimate_count(query) -> Optional[int]:
+    """Return the number of rows the planner estimates the query returns
+
+    Planning is cheap whatever the number of rows, unlike counting them, at the
+    cost of an estimate which is only as accurate as the table statistics.
+    """
+    # The expanding parameters of the IN filters are rendered so that the statement
+    # and its parameters can be sent to EXPLAIN as they are
+    statement = query.order_by(None).statement.compile(
+        dialect=db.engine.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    plan = db.session.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", statement.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]["Plan Rows"]
@@ -1,24 +1,36 @@
 """Utility function for profiling functions."""
+import json
 import time
 from functools import wraps
 
 from flask import current_app
 
+from .metrics import current_metrics
+
 
 def profiletime(profile_fn):
     """Function to profile time."""
 
     @wraps(profile_fn)
     def measure_time(*args, **kwargs):
-        """Measure the API response time using time module."""
-        start_time = time.time()
-        result = profile_fn(*args, **kwargs)
-        end_time = time.time()
-        diff = end_time - start_time
-
-        current_app.logger.info(
-            f"API endpoint: {profile_fn.__qualname__} took {diff} seconds"
+        """Measure the API response time along with the database and serialization time."""
+        metrics = current_metrics()
+        start = (
+            (metrics.statements, metrics.db_duration, metrics.serialization_duration)
+            if metrics
+            else (0, 0, 0)
         )
+        start_time = time.perf_counter()
+        result = profile_fn(*args, **kwargs)
+        record = {
+            "endpoint": profile_fn.__qualname__,
+            "duration": round(time.perf_counter() - start_time, 6),
+        }
+        if metrics:
+            record["db_statements"] = metrics.statements - start[0]
+            record["db_duration"] = round(metrics.db_duration - start[1], 6)
+            record["serialization_duration"] = round(metrics.serialization_duration - start[2], 6)
+        current_app.logger.info(json.dumps(record))
         return result
 
     return measure_time
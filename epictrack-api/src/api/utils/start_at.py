@@ -0,0 +1,142 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compiler of the start_at expressions of the event templates and configurations.
+
+A start_at is the number of days from the start of the phase, or of the parent
+event, to the start of an event. It is either an integer or integer arithmetic over
+the number of days of the parent event, such as "number_of_days-2". The grammar is
+    expression := term (("+" | "-") term)*
+    term       := factor ("*" factor)*
+    factor     := ("+" | "-") factor | integer | "number_of_days" | "(" expression ")"
+Every such expression is linear in the number of days, so it compiles to a
+coefficient and a constant, which evaluate it for many numbers of days at once.
+"""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+from api.exceptions import UnprocessableEntityError
+
+
+NUMBER_OF_DAYS = "number_of_days"
+
+TOKEN = re.compile(rf"\s*(?:(\d+)|({NUMBER_OF_DAYS})|([-+*()]))")
+
+
+@dataclass(frozen=True)
+class StartAt:
+    """Compiled start_at, the days being coefficient * number_of_days + constant"""
+
+    coefficient: int
+    constant: int
+
+    def days(self, number_of_days=0):
+        """Return the days for the number of days of the parent event, or for an array of them"""
+        return self.coefficient * number_of_days + self.constant
+
+
+@lru_cache(maxsize=None)
+def compile_start_at(expression: str) -> StartAt:
+    """Compile the start_at expression, raising UnprocessableEntityError when it is not valid"""
+    parser = _Parser(expression or "")
+    start_at = parser.expression()
+    if parser.peek() is not None:
+        parser.fail()
+    return start_at
+
+
+def start_at_days(expressions: Iterable[str], number_of_days: int) -> np.ndarray:
+    """Return the days of each start_at expression for the same number of days of the parent event"""
+    compiled = [compile_start_at(expression) for expression in expressions]
+    coefficients = np.array([start_at.coefficient for start_at in compiled], dtype=np.int64)
+    constants = np.array([start_at.constant for start_at in compiled], dtype=np.int64)
+    return coefficients * number_of_days + constants
+
+
+class _Parser:
+    """Recursive descent parser of the start_at grammar, building the linear form of each rule"""
+
+    def __init__(self, expression: str):
+        """Split the expression in tokens"""
+        self.expression_text = expression
+        self.tokens: List[Tuple[str, str]] = []
+        position = 0
+        for match in TOKEN.finditer(expression):
+            if match.start() != position:
+                break
+            integer, name, operator = match.groups()
+            self.tokens.append(("int", integer) if integer else ("name", name) if name else ("op", operator))
+            position = match.end()
+        if expression[position:].strip():
+            self.fail()
+        self.position = 0
+
+    def fail(self):
+        """Reject the expression"""
+        raise UnprocessableEntityError(f"Invalid start_at expression '{self.expression_text}'")
+
+    def peek(self):
+        """Return the next token, if any"""
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def take(self):
+        """Consume and return the next token"""
+        token = self.peek()
+        if token is None:
+            self.fail()
+        self.position += 1
+        return token
+
+    def expression(self) -> StartAt:
+        """Parse the sum of the terms"""
+        result = self.term()
+        while self.peek() in (("op", "+"), ("op", "-")):
+            sign = 1 if self.take()[1] == "+" else -1
+            term = self.term()
+            result = StartAt(result.coefficient + sign * term.coefficient, result.constant + sign * term.constant)
+        return result
+
+    def term(self) -> StartAt:
+        """Parse the product of the factors, which must stay linear"""
+        result = self.factor()
+        while self.peek() == ("op", "*"):
+            self.take()
+            factor = self.factor()
+            if result.coefficient and factor.coefficient:
+                self.fail()
+            result = StartAt(
+                result.coefficient * factor.constant + factor.coefficient * result.constant,
+                result.constant * factor.constant,
+            )
+        return result
+
+    def factor(self) -> StartAt:
+        """Parse a signed factor, an integer, the number of days or an expression in parentheses"""
+        kind, value = self.take()
+        if kind == "int":
+            return StartAt(0, int(value))
+        if kind == "name":
+            return StartAt(1, 0)
+        if value in ("+", "-"):
+            factor = self.factor()
+            return factor if value == "+" else StartAt(-factor.coefficient, -factor.constant)
+        if value == "(":
+            result = self.expression()
+            if self.take() != ("op", ")"):
+                self.fail()
+            return result
+        return self.fail()
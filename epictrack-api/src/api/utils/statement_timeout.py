@@ -0,0 +1,73 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Statement timeouts bound to the request or the job running the statements.
+
+The timeout is set on each transaction with SET LOCAL rather than on the pooled
+connections, which the requests and the background report jobs share. The
+requests get DB_STATEMENT_TIMEOUT, so the database cancels their queries before
+the worker timeout of gunicorn kills them, whereas a job sets its own limit.
+"""
+from contextlib import contextmanager
+from typing import Optional
+
+from flask import current_app, g, has_app_context, has_request_context
+from sqlalchemy import event, func, select
+
+
+def statement_timeout_session(session):
+    """Bound the statements of each transaction of the session by the timeout of its context"""
+    if event.contains(session, "after_begin", _set_transaction_timeout):
+        return
+    event.listen(session, "after_begin", _set_transaction_timeout)
+
+
+@contextmanager
+def statement_timeout(session, milliseconds: int):
+    """Bound the statements run by the session within the block by the timeout, 0 to disable"""
+    previous = g.pop("statement_timeout", None)
+    g.statement_timeout = milliseconds
+    try:
+        # The transaction the session is already in does not begin again
+        if session.in_transaction():
+            _apply_timeout(session.connection(), milliseconds)
+        yield
+    finally:
+        g.pop("statement_timeout", None)
+        if previous is not None:
+            g.statement_timeout = previous
+        if session.in_transaction():
+            _apply_timeout(session.connection(), _current_timeout() or 0)
+
+
+def _current_timeout() -> Optional[int]:
+    """Return the timeout of the statements of the current context, if it has one"""
+    if not has_app_context():
+        return None
+    if "statement_timeout" in g:
+        return g.statement_timeout
+    if has_request_context():
+        return current_app.config["DB_STATEMENT_TIMEOUT"]
+    return None
+
+
+def _set_transaction_timeout(session, transaction, connection):  # pylint: disable=unused-argument
+    """Set the timeout of the current context on the transaction the session begins"""
+    timeout = _current_timeout()
+    if timeout is not None:
+        _apply_timeout(connection, timeout)
+
+
+def _apply_timeout(connection, milliseconds: int) -> None:
+    """Set the statement timeout until the end of the transaction of the connection"""
+    connection.execute(select(func.set_config("statement_timeout", str(milliseconds), True)))
@@ -0,0 +1,89 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Excel export writing the sheets row by row.
+
+The workbook is written in constant memory mode, where every row is flushed to a
+temporary file once the next one starts, and the finished workbook is itself a
+temporary file which the response streams. Memory use therefore does not grow with
+the number of rows, as long as the rows are read lazily, e.g. with a server side cursor.
+"""
+import enum
+import tempfile
+from dataclasses import dataclass, field
+from typing import IO, Any, Dict, Iterable, Iterator, Sequence
+
+from sqlalchemy.sql import Select
+from xlsxwriter.workbook import Workbook
+
+from api.models import db
+
+
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Rows fetched from the server side cursor at a time
+YIELD_PER = 1000
+
+MAX_COLUMN_WIDTH = 100
+
+WORKBOOK_OPTIONS = {
+    "constant_memory": True,
+    "remove_timezone": True,
+    "default_date_format": "mmm. dd yyyy",
+}
+
+
+@dataclass
+class ExportSheet:
+    """A sheet of the workbook, written from an iterable of rows"""
+
+    name: str
+    headers: Sequence[str]
+    rows: Iterable[Sequence[Any]]
+    # Widths of the columns, by index, which are not sized to their content
+    column_widths: Dict[int, int] = field(default_factory=dict)
+
+
+def stream_rows(statement: Select) -> Iterator[Sequence[Any]]:
+    """Yield the rows of the statement, fetched in batches through a server side cursor"""
+    yield from db.session.execute(statement.execution_options(yield_per=YIELD_PER))
+
+
+def write_workbook(sheets: Iterable[ExportSheet]) -> IO[bytes]:
+    """Write the sheets to a workbook and return it as a temporary file positioned at its start"""
+    output = tempfile.TemporaryFile()
+    work_book = Workbook(output, WORKBOOK_OPTIONS)
+    header_format = work_book.add_format({"bold": True, "align": "center"})
+    cell_format = work_book.add_format({"text_wrap": True})
+    for sheet in sheets:
+        work_sheet = work_book.add_worksheet(sheet.name)
+        work_sheet.write_row(0, 0, sheet.headers, header_format)
+        widths = [len(header) for header in sheet.headers]
+        for row_number, row in enumerate(sheet.rows, start=1):
+            values = [_cell_value(value) for value in row]
+            work_sheet.write_row(row_number, 0, values, cell_format)
+            for index, value in enumerate(values):
+                widths[index] = max(widths[index], len(str(value)) if value is not None else 0)
+        # Autofit needs the whole sheet in memory, so the widths are tracked while writing
+        for index, width in enumerate(widths):
+            work_sheet.set_column(index, index, sheet.column_widths.get(index, min(width + 2, MAX_COLUMN_WIDTH)))
+    work_book.close()
+    output.seek(0)
+    return output
+
+
+def _cell_value(value: Any) -> Any:
+    """Return the value in a form the workbook can hold"""
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
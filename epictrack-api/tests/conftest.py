@@ -26,6 +26,8 @@ from api import jwt as _jwt
 from api.models import Project, Staff
 from api.models import db as _db
 from api.services import EventTemplateService
+from api.services.work_phase_summary import work_phase_summary_session
+from api.utils.statement_timeout import statement_timeout_session
 from tests.utilities.factory_scenarios import TestJwtClaims
 from tests.utilities.factory_utils import factory_auth_header
 
@@ -167,6 +169,8 @@ def session(app, db):
                 sess.begin_nested()
 
         db.session = sess
+        work_phase_summary_session(sess)
+        statement_timeout_session(sess)
 
         sql = text('select 1')
         sess.execute(sql)
@@ -0,0 +1,74 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark of the month grid of the resource forecast report.
+
+Labels the months of generated works with the month grid of the report and with the
+per month lookup it replaced, then reports the best duration of each. The database
+is not used. Run it from the api folder, for instance:
+
+    python -m tests.load.month_grid_benchmark --works 500 --months 24
+"""
+import argparse
+import sys
+import timeit
+from datetime import date, timedelta
+
+# The services are loaded ahead of the reports, which import them back
+import api.services  # noqa: F401  # pylint: disable=unused-import
+from api import create_app
+from api.reports.resource_forecast_report import EAResourceForeCastReport
+from tests.unit.reports.test_resource_forecast_report import _expected_month_labels, _month_ends, _start_events
+
+
+def run(work_count: int, month_count: int, repeat: int) -> dict:
+    """Time the month grid and the per month lookup, returning the best seconds of each"""
+    report = EAResourceForeCastReport(None, 50)
+    first_day = date(2024, 1, 1)
+    report.months = _month_ends(first_day - timedelta(days=1), month_count + 1)
+    report.month_labels = [f"{month:%b %Y}" for month in report.months[1:]]
+    work_ids = list(range(1, work_count + 1))
+    start_events = _start_events(work_ids, first_day)
+
+    def per_month_loop():
+        _expected_month_labels(report, {work_id: [{"work_id": work_id}] for work_id in work_ids}, start_events)
+
+    def grid():
+        works = {work_id: [{"work_id": work_id}] for work_id in work_ids}
+        report._update_month_labels(works, start_events)  # pylint: disable=protected-access
+
+    return {
+        "works": work_count,
+        "months": month_count,
+        "start events": len(start_events),
+        "per month loop s": round(min(timeit.repeat(per_month_loop, number=1, repeat=repeat)), 4),
+        "grid s": round(min(timeit.repeat(grid, number=1, repeat=repeat)), 4),
+    }
+
+
+def main(argv=None) -> int:
+    """Run the benchmark from the command line"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--works", type=int, default=500, help="Number of works in the report")
+    parser.add_argument("--months", type=int, default=24, help="Number of months of the report")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs of each path")
+    args = parser.parse_args(argv)
+    with create_app().app_context():
+        summary = run(args.works, args.months, args.repeat)
+    for key, value in summary.items():
+        print(f"{key}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark of the compiled serializers against the serialization they replaced.
+
+Serializes the works and the phase codes of the configured database with the
+compiled serializers, and with walking the mapper on each call or the hand written
+as_dict they replaced, then reports the time per round of each. The database is
+only read. Run it from the api folder with the environment of the API, for instance:
+
+    python -m tests.load.serializer_benchmark --works 500 --rounds 20
+"""
+import argparse
+import sys
+import timeit
+
+from api import create_app
+from api.models import PhaseCode, Work
+from tests.unit.models.test_serializer import _phase_code_as_dict, _walk_as_dict
+
+
+def run(work_count: int, rounds: int) -> dict:
+    """Time each serialization path, returning the milliseconds per round"""
+    works = Work.query.filter(Work.is_deleted.is_(False)).limit(work_count).all()
+    phases = PhaseCode.query.all()
+    # Load the relationships once so both paths only measure the serialization
+    for work in works:
+        work.as_dict()
+    for phase in phases:
+        phase.as_dict()
+    timings = {
+        "works walked": lambda: [_walk_as_dict(work, False) for work in works],
+        "works compiled": lambda: [work.as_dict(recursive=False) for work in works],
+        "works walked recursive": lambda: [_walk_as_dict(work) for work in works],
+        "works compiled recursive": lambda: [work.as_dict() for work in works],
+        "phases hand written": lambda: [_phase_code_as_dict(phase) for phase in phases],
+        "phases compiled": lambda: [phase.as_dict() for phase in phases],
+    }
+    summary = {"works": len(works), "phases": len(phases)}
+    for name, serialize in timings.items():
+        summary[f"{name} ms"] = round(timeit.timeit(serialize, number=rounds) * 1000 / rounds, 3)
+    return summary
+
+
+def main(argv=None) -> int:
+    """Run the benchmark from the command line"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--works", type=int, default=500, help="Number of works to serialize")
+    parser.add_argument("--rounds", type=int, default=20, help="Number of rounds timed for each path")
+    args = parser.parse_args(argv)
+    with create_app().app_context():
+        summary = run(args.works, args.rounds)
+    for key, value in summary.items():
+        print(f"{key}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Load test of the work plan dashboard against a running API.
+
+Sends the dashboard requests from concurrent clients and reports the throughput,
+the latency percentiles and the peak of the connection pool gauges sampled during
+the run. The gauges are those of whichever worker serves each metrics request. Run
+it against the deployed worker class and pool settings, for instance:
+
+    python tests/load/work_dashboard.py --url http://localhost:5000 --token "$TOKEN" --concurrency 50
+
+A pool saturated during the run shows as checked out connections at capacity and
+as requests failing once they waited for DATABASE_POOL_TIMEOUT seconds.
+"""
+import argparse
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Thread, local
+
+import requests
+
+
+DASHBOARD_PATH = "/api/v1/works/dashboard"
+POOL_GAUGES = ("epictrack_db_pool_capacity", "epictrack_db_pool_checked_out", "epictrack_db_pool_overflow")
+
+_sessions = local()
+
+
+def _session(token: str) -> requests.Session:
+    """HTTP session of the calling thread, reusing its connection across requests"""
+    if not hasattr(_sessions, "session"):
+        _sessions.session = requests.Session()
+        _sessions.session.headers["Authorization"] = f"Bearer {token}"
+    return _sessions.session
+
+
+def _request(url: str, token: str, page_size: int):
+    """Request the first dashboard page, returning its status and duration"""
+    params = {"page": 1, "size": page_size}
+    start_time = time.perf_counter()
+    try:
+        status = _session(token).get(url, params=params, timeout=120).status_code
+    except requests.RequestException:
+        status = None
+    return status, time.perf_counter() - start_time
+
+
+def _sample_pool_gauges(base_url: str, peaks: dict, stop: Event, interval: float = 0.5):
+    """Record the highest value of each connection pool gauge until stopped"""
+    while not stop.is_set():
+        try:
+            body = requests.get(f"{base_url}/ops/metrics", timeout=30).text
+        except requests.RequestException:
+            body = ""
+        for line in body.splitlines():
+            name, _, value = line.partition(" ")
+            if name in POOL_GAUGES:
+                peaks[f"peak_{name}"] = max(peaks.get(f"peak_{name}", 0), float(value))
+        stop.wait(interval)
+
+
+def run(base_url: str, token: str, concurrency: int, total: int, page_size: int) -> dict:
+    """Send the dashboard requests from concurrent clients and summarize their outcome"""
+    url = f"{base_url}{DASHBOARD_PATH}"
+    pool_peaks: dict = {}
+    stop = Event()
+    sampler = Thread(target=_sample_pool_gauges, args=(base_url, pool_peaks, stop), daemon=True)
+    sampler.start()
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda _: _request(url, token, page_size), range(total)))
+    elapsed = time.perf_counter() - start_time
+    stop.set()
+    sampler.join()
+    durations = sorted(duration for status, duration in results if status == 200)
+    failures = sum(1 for status, _ in results if status != 200)
+    summary = {
+        "requests": total,
+        "failures": failures,
+        "seconds": round(elapsed, 2),
+        "throughput_per_second": round(len(durations) / elapsed, 1),
+    }
+    if len(durations) > 1:
+        percentiles = statistics.quantiles(durations, n=100)
+        summary.update(
+            p50_ms=round(percentiles[49] * 1000, 1),
+            p95_ms=round(percentiles[94] * 1000, 1),
+            p99_ms=round(percentiles[98] * 1000, 1),
+        )
+    summary.update(pool_peaks)
+    return summary
+
+
+def main(argv=None) -> int:
+    """Run the load test from the command line"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:5000", help="Base URL of the API")
+    parser.add_argument("--token", required=True, help="Bearer token of a user allowed to read the dashboard")
+    parser.add_argument("--concurrency", type=int, default=50, help="Number of concurrent clients")
+    parser.add_argument("--requests", type=int, default=1000, help="Total number of requests")
+    parser.add_argument("--page-size", type=int, default=10, help="Number of works per dashboard page")
+    args = parser.parse_args(argv)
+    summary = run(args.url.rstrip("/"), args.token, args.concurrency, args.requests, args.page_size)
+    for key, value in summary.items():
+        print(f"{key}: {value:g}" if isinstance(value, float) else f"{key}: {value}")
+    return 1 if summary["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -29,6 +29,12 @@ from tests.utilities.factory_utils import (
     factory_staff_model,
 )
 from tests.utilities.factory_scenarios import TestWorkInfo
+from tests.utilities.helpers import count_queries
+from api.actions.context import ActionContext
+from api.models import (
+    PRIMARY_CATEGORIES, CalendarEvent, Event, EventCategoryEnum, EventConfiguration, OutcomeConfiguration,
+    WorkCalendarEvent, WorkPhaseSummary, db)
+from api.models.work import WorkStateEnum
 from api.services.event import EventService
 from api.services.work_phase import WorkPhase
 from api.models.event_configuration import EventPositionEnum
@@ -116,6 +122,240 @@ def test_change_intermediate_event_non_legislated_phase_not_push(client, jwt):
 #     )
 
 
+def test_push_events_query_count(client, jwt):
+    """Pushing the events costs the same number of statements regardless of the number of events"""
+    headers = _set_admin_user(jwt=jwt)
+    url = urljoin(API_BASE_URL, "works")
+    work_response = client.post(url, json=_set_up_work_object(), headers=headers)
+    work_id = work_response.json["id"]
+    work_phases = WorkPhase.find_by_params({"work_id": work_id})
+    assert len(work_phases) >= 10
+    # The first push creates the missing child events, the second one only moves them
+    _push_start_event(client, headers, work_id, work_phases[0].id)
+    statements = len(_push_start_event(client, headers, work_id, work_phases[0].id))
+
+    # Fill the work up to 200 milestones using the configurations without child events
+    parent_ids = [
+        configuration.parent_id
+        for configuration in db.session.query(EventConfiguration).filter(
+            EventConfiguration.parent_id.is_not(None)
+        )
+    ]
+    intermediate_events = [
+        event
+        for event in EventService.find_events(work_id, None, PRIMARY_CATEGORIES)
+        if event.event_position == EventPositionEnum.INTERMEDIATE.value
+        and event.event_configuration_id not in parent_ids
+    ]
+    number_of_events = len(EventService.find_events(work_id, None, PRIMARY_CATEGORIES))
+    index = 0
+    while number_of_events < 200:
+        event = intermediate_events[index % len(intermediate_events)]
+        db.session.add(
+            Event(
+                name=event.name,
+                anticipated_date=event.anticipated_date,
+                number_of_days=event.number_of_days,
+                event_configuration_id=event.event_configuration_id,
+                work_id=work_id,
+            )
+        )
+        number_of_events += 1
+        index += 1
+    db.session.commit()
+    events = EventService.find_events(work_id, None, PRIMARY_CATEGORIES)
+    assert len(events) >= 200
+    event_dates = {event.id: event.anticipated_date for event in events}
+
+    assert len(_push_start_event(client, headers, work_id, work_phases[0].id)) == statements
+    for event in EventService.find_events(work_id, None, PRIMARY_CATEGORIES):
+        assert (
+            event.anticipated_date.date() - event_dates[event.id].date()
+        ).days == NUMBER_OF_DAYS_TO_BE_PUSHED
+
+
+def test_push_events_bulk_reschedule(client, jwt):
+    """The moved events and calendar events are written with one set based update per table"""
+    headers = _set_admin_user(jwt=jwt)
+    url = urljoin(API_BASE_URL, "works")
+    work_response = client.post(url, json=_set_up_work_object(), headers=headers)
+    work_id = work_response.json["id"]
+    work_phase = WorkPhase.find_by_params({"work_id": work_id})[0]
+    # The first push creates the missing child events, the second one only moves them
+    _push_start_event(client, headers, work_id, work_phase.id)
+    calendar_events = (
+        db.session.query(WorkCalendarEvent)
+        .join(Event, Event.id == WorkCalendarEvent.source_event_id)
+        .filter(Event.work_id == work_id)
+        .all()
+    )
+    assert calendar_events
+    calendar_dates = {
+        calendar_event.calendar_event_id: calendar_event.calendar_event.anticipated_date
+        for calendar_event in calendar_events
+    }
+
+    statements = _push_start_event(client, headers, work_id, work_phase.id)
+    for table in ("events", "calendar_events"):
+        bulk_updates = [
+            statement
+            for statement in statements
+            if statement.startswith(f"UPDATE {table} SET anticipated_date=dates.anticipated_date")
+        ]
+        assert len(bulk_updates) == 1
+        assert "FROM (VALUES" in bulk_updates[0]
+    db.session.expire_all()
+    for calendar_event_id, anticipated_date in calendar_dates.items():
+        calendar_event = db.session.get(CalendarEvent, calendar_event_id)
+        assert (
+            calendar_event.anticipated_date.date() - anticipated_date.date()
+        ).days == NUMBER_OF_DAYS_TO_BE_PUSHED
+
+
+def test_work_phase_summary_after_push(client, jwt):
+    """The work phases are served from the summaries kept up to date by the event updates"""
+    headers = _set_admin_user(jwt=jwt)
+    url = urljoin(API_BASE_URL, "works")
+    work_response = client.post(url, json=_set_up_work_object(), headers=headers)
+    work_id = work_response.json["id"]
+    work_phase = WorkPhase.find_by_params({"work_id": work_id})[0]
+    start_event = next(
+        event
+        for event in EventService.find_events(work_id, work_phase.id)
+        if event.event_position == EventPositionEnum.START.value
+    )
+    anticipated_date = start_event.anticipated_date
+    url = urljoin(API_BASE_URL, f"works/{work_id}/phases")
+    assert client.get(url, headers=headers).status_code == HTTPStatus.OK
+    _push_start_event(client, headers, work_id, work_phase.id)
+
+    db.session.expire_all()
+    with count_queries(db.engine) as statements:
+        response = client.get(url, headers=headers)
+    assert response.status_code == HTTPStatus.OK
+    assert not [statement for statement in statements if "FROM events" in statement]
+    phase_status = next(x for x in response.json if x["work_phase"]["id"] == work_phase.id)
+    assert phase_status["next_milestone"] == start_event.name
+    assert phase_status["next_milestone_date"][:10] == str(
+        (anticipated_date + timedelta(days=NUMBER_OF_DAYS_TO_BE_PUSHED)).date()
+    )
+
+
+def test_work_phase_summary_read_does_not_write(client, jwt):
+    """The phases of a work without summaries are summarised for the read only"""
+    headers = _set_admin_user(jwt=jwt)
+    work_response = client.post(urljoin(API_BASE_URL, "works"), json=_set_up_work_object(), headers=headers)
+    work_id = work_response.json["id"]
+    db.session.query(WorkPhaseSummary).filter(WorkPhaseSummary.work_id == work_id).delete()
+    db.session.commit()
+
+    url = urljoin(API_BASE_URL, f"works/{work_id}/phases")
+    with count_queries(db.engine) as statements:
+        response = client.get(url, headers=headers)
+    assert response.status_code == HTTPStatus.OK
+    assert response.json[0]["next_milestone"]
+    assert not [statement for statement in statements if statement.startswith("INSERT")]
+    assert not db.session.query(WorkPhaseSummary).filter(WorkPhaseSummary.work_id == work_id).count()
+
+
+def test_work_phase_summary_configuration_changes(client, jwt):
+    """The summaries follow the changes to the event configurations and outcome names"""
+    headers = _set_admin_user(jwt=jwt)
+    work_response = client.post(urljoin(API_BASE_URL, "works"), json=_set_up_work_object(), headers=headers)
+    work_id = work_response.json["id"]
+    work_phase = WorkPhase.find_by_params({"work_id": work_id})[0]
+    phase_events = EventService.find_events(work_id, work_phase.id, PRIMARY_CATEGORIES)
+    decision_event = next(
+        event
+        for event in phase_events
+        if event.event_configuration.event_category_id == EventCategoryEnum.DECISION.value
+    )
+    outcome = OutcomeConfiguration.query.filter_by(
+        event_configuration_id=decision_event.event_configuration_id
+    ).first()
+    decision_event.actual_date = decision_event.anticipated_date
+    decision_event.outcome_id = outcome.id
+    db.session.commit()
+    assert db.session.get(WorkPhaseSummary, work_phase.id).decision == outcome.name
+
+    outcome.name = "Renamed outcome"
+    db.session.commit()
+    assert db.session.get(WorkPhaseSummary, work_phase.id).decision == "Renamed outcome"
+
+    next_event = next(event for event in phase_events if event.actual_date is None)
+    next_event.event_configuration.is_active = False
+    db.session.commit()
+    assert db.session.get(WorkPhaseSummary, work_phase.id).next_milestone != next_event.name
+
+
+def test_work_phase_summary_bulk_delete(client, jwt):
+    """The summaries follow the events deleted with bulk updates"""
+    headers = _set_admin_user(jwt=jwt)
+    work_response = client.post(urljoin(API_BASE_URL, "works"), json=_set_up_work_object(), headers=headers)
+    work_id = work_response.json["id"]
+    work_phase = WorkPhase.find_by_params({"work_id": work_id})[0]
+    next_milestone = db.session.get(WorkPhaseSummary, work_phase.id).next_milestone
+    next_event = next(
+        event
+        for event in EventService.find_events(work_id, work_phase.id, PRIMARY_CATEGORIES)
+        if event.name == next_milestone
+    )
+    response = client.delete(urljoin(API_BASE_URL, f"milestones/events/{next_event.id}"), headers=headers)
+    assert response.status_code == HTTPStatus.OK
+    db.session.expire_all()
+    assert db.session.get(WorkPhaseSummary, work_phase.id).next_milestone != next_milestone
+
+
+def test_actions_share_work_context(client, jwt):
+    """The actions of an outcome read the work once and write their changes together"""
+    headers = _set_admin_user(jwt=jwt)
+    url = urljoin(API_BASE_URL, "works")
+    work_response = client.post(url, json=_set_up_work_object(), headers=headers)
+    work_id = work_response.json["id"]
+    db.session.commit()
+    event = next(
+        event
+        for event in Event.find_by_params({"work_id": work_id})
+        if event.event_configuration.name == "EAC Ministers Decision"
+    )
+    outcome = OutcomeConfiguration.query.filter_by(
+        event_configuration_id=event.event_configuration_id,
+        name="Environmental Assessment Certificate REFUSED",
+    ).one()
+    event.actual_date = event.anticipated_date
+    event.outcome_id = outcome.id
+    db.session.flush()
+
+    context = ActionContext(work_id)
+    with count_queries(db.engine) as statements:
+        EventService._process_actions(event, context, outcome.id)  # pylint: disable=protected-access
+        EventService._post_process_actions(event, context)  # pylint: disable=protected-access
+    assert len([statement for statement in statements if statement.startswith("UPDATE works")]) == 1
+    assert len([statement for statement in statements if "FROM work_phases" in statement]) == 1
+    work = context.work
+    assert work.work_state == WorkStateEnum.COMPLETED
+    assert not work.is_active
+
+
+def _push_start_event(client, headers, work_id, work_phase_id):
+    """Push the start event of the phase and return the statements issued"""
+    start_event = next(
+        event
+        for event in EventService.find_events(work_id, work_phase_id)
+        if event.event_position == EventPositionEnum.START.value
+    )
+    event_data = EventResponseSchema().dump(start_event)
+    event_data["anticipated_date"] = (
+        start_event.anticipated_date + timedelta(days=NUMBER_OF_DAYS_TO_BE_PUSHED)
+    ).isoformat()
+    db.session.expire_all()
+    url = urljoin(API_BASE_URL, f"milestones/events/{start_event.id}?push_events=true")
+    with count_queries(db.engine) as statements:
+        response = client.put(url, headers=headers, json=event_data)
+    assert response.status_code == HTTPStatus.OK
+    return statements
+
+
 def _change_event_anticipated_date(
     jwt,
     client,
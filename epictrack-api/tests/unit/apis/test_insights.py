@@ -23,8 +23,12 @@ from tests.utilities.factory_utils import (
     factory_work_first_nation_model,
     factory_work_model,
 )
-from tests.utilities.helpers import prepare_work_payload
+from tests.utilities.helpers import count_queries, prepare_work_payload
+from api.insights.work_insight_engine import GROUPINGS
+from api.models import EAOTeam, Project, Work, db
+from api.models.history import versioned_session
 from api.models.role import RoleEnum
+from api.utils.caching import AppCache
 
 
 API_BASE_URL = "/api/v1/"
@@ -198,6 +202,69 @@ def test_get_projects_by_subtype(client, auth_header):
     assert project_insight["count"] == 1
 
 
+def test_get_all_work_insights(app, client, auth_header, session):
+    """Test every work grouping is returned at once and cached until the works change."""
+    # The history rows moving the data version are written by the versioned session
+    versioned_session(session)
+    payload = prepare_work_payload(TestWorkInfo.assessment_work.value)
+    work_response_json = client.post(urljoin(API_BASE_URL, "works"), json=payload, headers=auth_header).json
+    staff_role_data = {
+        "staff_id": work_response_json["work_lead_id"],
+        "role_id": RoleEnum.OFFICER_ANALYST.value,
+        "is_active": True,
+    }
+    url = urljoin(API_BASE_URL, f"works/{work_response_json['id']}/staff-roles")
+    client.post(url, json=staff_role_data, headers=auth_header)
+    factory_work_first_nation_model(work_response_json["id"])
+
+    AppCache.cache.init_app(app, config={"CACHE_TYPE": "SimpleCache"})
+    try:
+        result = client.get(urljoin(API_BASE_URL, "insights/works/all"), headers=auth_header)
+        assert result.status_code == HTTPStatus.OK
+        assert set(result.json) == set(GROUPINGS)
+        type_ids = {project.type_id for project in Project.query.filter(Project.is_active.is_(True))}
+        for group_by, insights in result.json.items():
+            assert insights
+            if group_by == "assessment_by_phase":
+                url = urljoin(API_BASE_URL, "insights/works/assessment?group_by=phase")
+                expected = client.get(url, headers=auth_header).json
+            elif group_by == "project_subtype":
+                # The subtypes of every type are counted at once
+                expected = []
+                for type_id in type_ids:
+                    url = urljoin(API_BASE_URL, f"insights/projects?type_id={type_id}&group_by=subtype")
+                    expected += client.get(url, headers=auth_header).json
+            elif group_by.startswith("project_"):
+                url = urljoin(API_BASE_URL, f"insights/projects?group_by={group_by[len('project_'):]}")
+                expected = client.get(url, headers=auth_header).json
+            else:
+                url = urljoin(API_BASE_URL, f"insights/works?group_by={group_by}")
+                expected = client.get(url, headers=auth_header).json
+            name_key, id_key = GROUPINGS[group_by]
+            assert sorted(insights, key=lambda insight: insight[id_key]) == sorted(
+                expected, key=lambda insight: insight[id_key]
+            ), name_key
+
+        with count_queries(db.session.get_bind()) as statements:
+            assert client.get(urljoin(API_BASE_URL, "insights/works/all"), headers=auth_header).json == result.json
+        # Only the data version is read
+        assert len(statements) == 1
+
+        # The names of the groups are read from the lookups
+        team = session.get(EAOTeam, session.get(Work, work_response_json["id"]).eao_team_id)
+        team.name = "Renamed team"
+        session.flush()
+        result = client.get(urljoin(API_BASE_URL, "insights/works/all"), headers=auth_header)
+        assert "Renamed team" in [insight["eao_team"] for insight in result.json["team"]]
+
+        session.get(Work, work_response_json["id"]).is_active = False
+        session.flush()
+        result = client.get(urljoin(API_BASE_URL, "insights/works/all"), headers=auth_header)
+        assert result.json["assessment_by_phase"] == []
+    finally:
+        AppCache.cache.init_app(app, config={"CACHE_TYPE": "NullCache"})
+
+
 def _set_up_work_object():
     """Set up a full fledged work object"""
     project = factory_project_model()
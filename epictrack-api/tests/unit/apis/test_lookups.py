@@ -0,0 +1,42 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test suite for Lookups."""
+from http import HTTPStatus
+from io import BytesIO
+from urllib.parse import urljoin
+
+from openpyxl import load_workbook
+
+from api.utils.xlsx_export import XLSX_MIMETYPE
+from tests.utilities.factory_utils import factory_project_model
+
+
+API_BASE_URL = '/api/v1/'
+
+
+def test_download_lookups(client, auth_header):
+    """Test the lookups are downloaded as one sheet per lookup."""
+    project = factory_project_model()
+    response = client.get(urljoin(API_BASE_URL, 'lookups'), headers=auth_header)
+    assert response.status_code == HTTPStatus.OK
+    assert response.mimetype == XLSX_MIMETYPE
+    work_book = load_workbook(filename=BytesIO(response.data))
+    assert 'Milestones' in work_book.sheetnames
+    assert 'Outcomes' in work_book.sheetnames
+    projects = list(work_book['Projects'].values)
+    assert projects[0] == ('Id', 'Name', 'Description', 'Address', 'Proponent Name', 'Sub Type Name')
+    assert (project.id, project.name) in {row[:2] for row in projects[1:]}
+    milestones = list(work_book['Milestones'].values)
+    assert len(milestones) > 1
+    assert all(row[-1] for row in milestones[1:])
@@ -13,8 +13,17 @@
 # limitations under the License.
 """Test suite for health endpoints."""
 
+import json
 from http import HTTPStatus
 
+from flask import Response
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from api.models import db
+from api.utils import metrics
+from api.utils.statement_timeout import statement_timeout, statement_timeout_session
+
 
 def test_get_healthz(client):
     """Test get health endpoint."""
@@ -28,3 +37,77 @@ def test_get_readyz(client):
     url = '/ops/readyz'
     result = client.get(url)
     assert result.status_code == HTTPStatus.OK
+
+
+def test_get_metrics(client):
+    """Test the metrics endpoint reports the queries of the handled requests."""
+    client.get('/ops/readyz')
+    result = client.get('/ops/metrics')
+    assert result.status_code == HTTPStatus.OK
+    assert result.content_type.startswith('text/plain')
+    body = result.get_data(as_text=True)
+    assert '# TYPE epictrack_requests_total counter' in body
+    assert 'epictrack_requests_total{method="GET",route="/ops/readyz",status="200"}' in body
+    assert 'epictrack_db_statements_total{' in body
+    assert '# TYPE epictrack_db_pool_checked_out gauge' in body
+    assert 'epictrack_db_pool_capacity ' in body
+
+
+def test_db_pool_configuration(app):
+    """Test the engine pools its connections as configured."""
+    assert db.engine.pool.size() == app.config['DB_POOL_SIZE']
+
+
+def _statement_timeout(session):
+    """Return the statement timeout of the transaction of the session in milliseconds."""
+    return session.execute(
+        text("SELECT extract(epoch FROM current_setting('statement_timeout')::interval) * 1000")
+    ).scalar()
+
+
+def test_request_statement_timeout(app):
+    """Test the statements of a request are bounded by the timeout of the requests, not its connection."""
+    request_timeout = app.config['DB_STATEMENT_TIMEOUT']
+    with Session(db.engine) as session:
+        statement_timeout_session(session)
+        with app.test_request_context('/ops/readyz'):
+            assert _statement_timeout(session) == request_timeout
+            with statement_timeout(session, 0):
+                assert _statement_timeout(session) == 0
+            assert _statement_timeout(session) == request_timeout
+            session.rollback()
+        # The pooled connection does not keep the timeout of the request
+        with app.app_context():
+            assert _statement_timeout(session) != request_timeout
+
+
+def _record_repeated_statement(app, monkeypatch, times):
+    """Run the same statement with different parameters within a request, returning the warnings and metrics"""
+    warnings = []
+    monkeypatch.setattr(app.logger, 'warning', lambda message: warnings.append(json.loads(message)))
+    metrics.REGISTRY.clear()
+    with app.test_request_context('/ops/n-plus-one'):
+        metrics._start_request()  # pylint: disable=protected-access
+        for value in range(times):
+            db.session.execute(text('SELECT :value'), {'value': value})
+        metrics._record_request(Response(status=HTTPStatus.OK))  # pylint: disable=protected-access
+    return warnings, metrics.REGISTRY.render()
+
+
+def test_n_plus_one_detected(app, monkeypatch):
+    """Test a statement repeated up to the threshold is reported as an N+1."""
+    threshold = app.config['METRICS_N_PLUS_ONE_THRESHOLD']
+    warnings, body = _record_repeated_statement(app, monkeypatch, threshold)
+    assert len(warnings) == 1
+    assert warnings[0]['event'] == 'n_plus_one'
+    assert warnings[0]['count'] == threshold
+    assert warnings[0]['statement'] == 'SELECT %(value)s'
+    assert 'epictrack_n_plus_one_total{method="GET",route="unmatched",status="200"} 1' in body
+
+
+def test_n_plus_one_below_threshold(app, monkeypatch):
+    """Test a statement repeated fewer times than the threshold is not reported."""
+    threshold = app.config['METRICS_N_PLUS_ONE_THRESHOLD']
+    warnings, body = _record_repeated_statement(app, monkeypatch, threshold - 1)
+    assert not warnings
+    assert 'epictrack_n_plus_one_total{method="GET",route="unmatched",status="200"} 0' in body
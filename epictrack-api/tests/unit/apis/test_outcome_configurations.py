@@ -0,0 +1,45 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test suite for Outcome Configurations."""
+from http import HTTPStatus
+from urllib.parse import urljoin
+
+from api.models import OutcomeConfiguration, db
+from api.utils.caching import AppCache, cache_tag_session
+from tests.unit.apis.test_events import _set_admin_user, _set_up_work_object
+
+
+API_BASE_URL = '/api/v1/'
+
+
+def test_get_outcome_configurations_cache_invalidation(app, client, jwt):
+    """Test cached outcome configurations are served again once an outcome configuration is changed."""
+    headers = _set_admin_user(jwt=jwt)
+    work_response = client.post(urljoin(API_BASE_URL, 'works'), json=_set_up_work_object(), headers=headers)
+    assert work_response.status_code == HTTPStatus.CREATED
+    outcome = OutcomeConfiguration.query.filter(OutcomeConfiguration.is_active.is_(True)).first()
+    AppCache.cache.init_app(app, config={"CACHE_TYPE": "SimpleCache"})
+    cache_tag_session(db.session)
+    try:
+        url = urljoin(API_BASE_URL, f'outcome-configurations/?configuration_id={outcome.event_configuration_id}')
+        result = client.get(url, headers=headers)
+        assert result.status_code == HTTPStatus.OK
+        assert outcome.name in [item['name'] for item in result.json]
+        outcome.name = 'Renamed outcome'
+        db.session.commit()
+        names = [item['name'] for item in client.get(url, headers=headers).json]
+        assert 'Renamed outcome' in names
+    finally:
+        AppCache.cache.init_app(app, config={"CACHE_TYPE": "NullCache"})
@@ -16,6 +16,11 @@
 from http import HTTPStatus
 from urllib.parse import urljoin
 
+from sqlalchemy import text
+
+from api.models import Position, db
+from api.utils.caching import AppCache, cache_tag_session
+
 
 API_BASE_URL = '/api/v1/'
 
@@ -25,3 +30,19 @@ def test_get_positions(client, auth_header):
     url = urljoin(API_BASE_URL, 'positions')
     result = client.get(url, headers=auth_header)
     assert result.status_code == HTTPStatus.OK
+
+
+def test_get_positions_cache_invalidation(app, client, auth_header):
+    """Test cached positions are served until a position is changed."""
+    AppCache.cache.init_app(app, config={"CACHE_TYPE": "SimpleCache"})
+    cache_tag_session(db.session)
+    try:
+        url = urljoin(API_BASE_URL, 'positions')
+        count = len(client.get(url, headers=auth_header).json)
+        # Changes made outside of the session are not seen until the cache is invalidated
+        db.session.execute(text("INSERT INTO positions (name, sort_order) VALUES ('Outside', 0)"))
+        assert len(client.get(url, headers=auth_header).json) == count
+        Position(name='Inside', sort_order=0).save()
+        assert len(client.get(url, headers=auth_header).json) == count + 2
+    finally:
+        AppCache.cache.init_app(app, config={"CACHE_TYPE": "NullCache"})
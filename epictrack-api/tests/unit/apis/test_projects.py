@@ -15,13 +15,18 @@
 
 from decimal import Decimal
 from http import HTTPStatus
+from io import BytesIO
 from pathlib import Path
 from urllib.parse import urljoin
 
+import pandas as pd
 from werkzeug.datastructures import FileStorage
 
+from api.models import Project, db
+from api.models.special_field import EntityEnum, SpecialField
 from tests.utilities.factory_scenarios import TestProjectInfo
 from tests.utilities.factory_utils import factory_project_model
+from tests.utilities.helpers import count_queries
 
 
 API_BASE_URL = "/api/v1/"
@@ -99,6 +104,51 @@ def test_import_project(client, auth_header):
     assert response.status_code == HTTPStatus.CREATED
 
 
+def test_import_projects_in_bulk(client, auth_header):
+    """Test a large project sheet is imported with a fixed number of statements and reported per row"""
+    url = urljoin(API_BASE_URL, "projects/import")
+    existing_project = factory_project_model()
+    template = pd.read_excel(Path("./src/api/templates/master_templates/Projects.xlsx").resolve())
+    sheet = pd.concat([template.iloc[[0]]] * 5000, ignore_index=True)
+    sheet["Name"] = [f"Bulk Project {index}" for index in range(5000)]
+    sheet.loc[0, "Name"] = existing_project.name
+    sheet["Abbreviation"] = None
+
+    invalid_sheet = sheet.copy()
+    invalid_sheet.loc[3, "Proponent"] = "Unknown Proponent"
+    invalid_sheet.loc[4, "Name"] = sheet.loc[5, "Name"]
+    response = client.post(url, data={"file": _excel_file(invalid_sheet)}, content_type="multipart/form-data",
+                           headers=auth_header)
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json["errors"] == [
+        {"row": 5, "errors": ["Proponent with name Unknown Proponent does not exist"]},
+        {"row": 7, "errors": [f"name {sheet.loc[5, 'Name']} appears more than once"]},
+    ]
+    assert db.session.query(Project).filter(Project.name == sheet.loc[1, "Name"]).count() == 0
+
+    with count_queries(db.session.get_bind()) as statements:
+        response = client.post(url, data={"file": _excel_file(sheet)}, content_type="multipart/form-data",
+                               headers=auth_header)
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.json["created"] == 4999
+    assert response.json["updated"] == 1
+    assert response.json["errors"] == []
+    # The lookups, the diff and the writes do not depend on the number of rows
+    assert len(statements) < 20
+    created_ids = db.session.query(Project.id).filter(Project.name.like("Bulk Project %"))
+    assert db.session.query(SpecialField).filter(
+        SpecialField.entity == EntityEnum.PROJECT, SpecialField.entity_id.in_(created_ids)
+    ).count() == 4999
+
+
+def _excel_file(data_frame: pd.DataFrame) -> FileStorage:
+    """Return the data frame as an uploaded excel file"""
+    stream = BytesIO()
+    data_frame.to_excel(stream, index=False)
+    stream.seek(0)
+    return FileStorage(stream=stream, filename="projects.xlsx")
+
+
 def test_validate_project(client, auth_header):
     """Test validate project"""
     url = urljoin(API_BASE_URL, "projects/exists")
@@ -0,0 +1,150 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test suite for Reports."""
+from datetime import datetime
+from http import HTTPStatus
+from urllib.parse import urljoin
+
+import pytest
+from sqlalchemy import Table, event, text
+from sqlalchemy.sql import visitors
+
+from api.models import Project, ReportJob, ReportJobStatusEnum, db
+from api.reports import REPORT_CLASSES, get_report_generator
+from api.services import ReportJobService, ReportService
+from api.utils.caching import AppCache
+from tests.unit.apis.test_events import _set_admin_user, _set_up_work_object
+from tests.utilities.factory_utils import factory_project_model
+from tests.utilities.helpers import count_queries
+
+
+API_BASE_URL = '/api/v1/'
+REPORT_PAYLOAD = {'report_date': '2023-09-15', 'color_intensity': 50, 'filters': None}
+
+
+def test_report_job_lifecycle(client, auth_header):
+    """Test a report job is generated and its file downloaded."""
+    url = urljoin(API_BASE_URL, 'reports/jobs/ea_resource_forecast')
+    result = client.post(url, json=REPORT_PAYLOAD, headers=auth_header)
+    assert result.status_code == HTTPStatus.ACCEPTED
+    job_id = result.json['id']
+
+    result = client.get(urljoin(API_BASE_URL, f'reports/jobs/{job_id}'), headers=auth_header)
+    assert result.status_code == HTTPStatus.OK
+    assert result.json['status'] == ReportJobStatusEnum.COMPLETED.value
+    assert result.json['report_date'] == REPORT_PAYLOAD['report_date']
+
+    result = client.get(urljoin(API_BASE_URL, f'reports/jobs/{job_id}/file'), headers=auth_header)
+    # The report has no file when no work matches
+    assert result.status_code in (HTTPStatus.OK, HTTPStatus.NO_CONTENT)
+
+
+def test_report_job_deduplication(client, auth_header, monkeypatch):
+    """Test identical requests share the unfinished job."""
+    monkeypatch.setattr(ReportJobService, '_schedule', classmethod(lambda cls, job_id: None))
+    url = urljoin(API_BASE_URL, 'reports/jobs/ea_resource_forecast')
+    job_id = client.post(url, json=REPORT_PAYLOAD, headers=auth_header).json['id']
+    result = client.post(url, json=REPORT_PAYLOAD, headers=auth_header)
+    assert result.json['id'] == job_id
+    assert result.json['status'] == ReportJobStatusEnum.PENDING.value
+    result = client.get(urljoin(API_BASE_URL, f'reports/jobs/{job_id}/file'), headers=auth_header)
+    assert result.status_code == HTTPStatus.ACCEPTED
+
+    # Other parameters get their own job
+    other_payload = {**REPORT_PAYLOAD, 'color_intensity': 25}
+    assert client.post(url, json=other_payload, headers=auth_header).json['id'] != job_id
+
+    ReportJobService.run_job(job_id)
+    assert db.session.get(ReportJob, job_id).status == ReportJobStatusEnum.COMPLETED
+    # Once finished, a new request generates the report again
+    assert client.post(url, json=REPORT_PAYLOAD, headers=auth_header).json['id'] != job_id
+
+
+def test_report_job_statement_timeout(app, client, auth_header, monkeypatch):
+    """Test the statements of a job are bounded by the job timeout rather than the one of the requests."""
+    timeouts = []
+
+    def generate_report(*args, **kwargs):
+        timeouts.append(db.session.execute(
+            text("SELECT extract(epoch FROM current_setting('statement_timeout')::interval) * 1000")
+        ).scalar())
+        return None, None
+
+    monkeypatch.setattr(ReportService, 'generate_report', generate_report)
+    url = urljoin(API_BASE_URL, 'reports/jobs/ea_resource_forecast')
+    result = client.post(url, json=REPORT_PAYLOAD, headers=auth_header)
+    assert result.status_code == HTTPStatus.ACCEPTED
+    assert timeouts == [app.config['REPORT_JOB_TIMEOUT'] * 1000]
+    assert timeouts[0] != app.config['DB_STATEMENT_TIMEOUT']
+
+
+def test_report_job_not_found(client, auth_header):
+    """Test unknown report types and jobs."""
+    url = urljoin(API_BASE_URL, 'reports/jobs/unknown')
+    result = client.post(url, json=REPORT_PAYLOAD, headers=auth_header)
+    assert result.status_code == HTTPStatus.BAD_REQUEST
+    result = client.get(urljoin(API_BASE_URL, 'reports/jobs/unknown'), headers=auth_header)
+    assert result.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_report_cache(app):
+    """Test generated reports are reused until the data they come from changes."""
+    AppCache.cache.init_app(app, config={"CACHE_TYPE": "SimpleCache"})
+    try:
+        project = factory_project_model()
+        report_date = datetime(2023, 9, 15)
+        first = ReportService.generate_report('ea_resource_forecast', report_date, color_intensity=50)
+        with count_queries(db.session.get_bind()) as statements:
+            assert ReportService.generate_report('ea_resource_forecast', report_date, color_intensity=50) == first
+        # Only the data version is read
+        assert len(statements) == 1
+
+        with count_queries(db.session.get_bind()) as statements:
+            ReportService.generate_report('ea_resource_forecast', report_date, color_intensity=25)
+        assert len(statements) > 1
+
+        version = ReportService.data_version('ea_resource_forecast')
+        db.session.get(Project, project.id).description = 'Changed'
+        db.session.flush()
+        assert ReportService.data_version('ea_resource_forecast') != version
+        with count_queries(db.session.get_bind()) as statements:
+            ReportService.generate_report('ea_resource_forecast', report_date, color_intensity=50)
+        assert len(statements) > 1
+    finally:
+        AppCache.cache.init_app(app, config={"CACHE_TYPE": "NullCache"})
+
+
+@pytest.mark.parametrize('report_type', REPORT_CLASSES.keys())
+def test_report_source_models(client, jwt, report_type):
+    """Test the data version of each report covers every table the report reads."""
+    headers = _set_admin_user(jwt=jwt)
+    work_response = client.post(urljoin(API_BASE_URL, 'works'), json=_set_up_work_object(), headers=headers)
+    assert work_response.status_code == HTTPStatus.CREATED
+    tables = set()
+
+    def _collect_tables(conn, cursor, statement, parameters, context, executemany):  # pylint: disable=unused-argument
+        if context.compiled is not None:
+            tables.update(
+                element.name for element in visitors.iterate(context.compiled.statement) if isinstance(element, Table)
+            )
+
+    event.listen(db.engine, 'before_cursor_execute', _collect_tables)
+    try:
+        for report_date in (datetime(2023, 12, 1), datetime(2024, 1, 15), datetime(2024, 6, 1)):
+            get_report_generator(report_type, None, 50).generate_report(report_date, 'json')
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', _collect_tables)
+    assert tables
+    source_tables = {model.__tablename__ for model in REPORT_CLASSES[report_type].source_models}
+    assert tables <= source_tables
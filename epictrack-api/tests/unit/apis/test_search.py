@@ -0,0 +1,86 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test suite for Search."""
+
+from http import HTTPStatus
+from urllib.parse import urljoin
+
+from sqlalchemy import select, text
+
+from tests.utilities.factory_scenarios import TestProjectInfo, TestProponent, TestStaffInfo
+from tests.utilities.factory_utils import (
+    factory_project_model,
+    factory_proponent_model,
+    factory_staff_model,
+    factory_work_model,
+)
+from api.models import Project, Staff, db
+from api.models.search import search_document, search_query
+
+
+API_BASE_URL = "/api/v1/"
+
+
+def _create_searchable_entities():
+    """Create a project, its work, a proponent and a staff sharing a name"""
+    project = factory_project_model(
+        {**TestProjectInfo.project1.value, "name": "Quillback Copper Mine", "abbreviation": "QCM"}
+    )
+    work = factory_work_model()
+    work.project_id = project.id
+    work.save()
+    proponent = factory_proponent_model({**TestProponent.proponent1.value, "name": "Quillback Resources"})
+    staff = factory_staff_model({**TestStaffInfo.staff1.value, "last_name": "Quillback"})
+    return project, work, proponent, staff
+
+
+def test_search(client, auth_header):
+    """Test the search matches the names of every kind of entity by word prefix"""
+    project, work, proponent, staff = _create_searchable_entities()
+    url = urljoin(API_BASE_URL, "search")
+
+    response = client.get(url, query_string={"text": "quillb"}, headers=auth_header)
+    assert response.status_code == HTTPStatus.OK
+    results = {(result["type"], result["id"]) for result in response.json}
+    assert results == {("project", project.id), ("work", work.id), ("proponent", proponent.id), ("staff", staff.id)}
+
+    response = client.get(url, query_string={"text": "Quillback cop"}, headers=auth_header)
+    assert response.status_code == HTTPStatus.OK
+    assert {(result["type"], result["id"]) for result in response.json} == {("project", project.id), ("work", work.id)}
+    assert response.json[0]["rank"] >= response.json[1]["rank"]
+
+    response = client.get(url, query_string={"text": "quillb", "limit": 1}, headers=auth_header)
+    assert len(response.json) == 1
+
+    response = client.get(url, query_string={"text": "()&|!"}, headers=auth_header)
+    assert response.status_code == HTTPStatus.OK
+    assert response.json == []
+
+    response = client.get(url, headers=auth_header)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_search_uses_indexes(session):
+    """Test the search documents are matched through their GIN indexes"""
+    query = search_query("quillback")
+    session.execute(text("SET LOCAL enable_seqscan = off"))
+    for statement, index in (
+        (select(Project.id).where(search_document(Project.name, Project.abbreviation).op("@@")(query)),
+         "ix_projects_search"),
+        (select(Staff.id).where(search_document(Staff.first_name, Staff.last_name, Staff.email).op("@@")(query)),
+         "ix_staffs_search"),
+    ):
+        compiled = statement.compile(dialect=db.engine.dialect)
+        plan = "\n".join(session.connection().exec_driver_sql(f"EXPLAIN {compiled}", compiled.params).scalars())
+        assert index in plan
@@ -21,6 +21,9 @@ from werkzeug.datastructures import FileStorage
 
 from tests.utilities.factory_scenarios import TestTaskTemplateEnum
 from tests.utilities.factory_utils import factory_task_template_model
+from api.models import Task, db
+from api.models.code_table import LOOKUP_CACHE_TAG
+from api.utils.caching import AppCache, cache_tag_session
 
 
 API_BASE_URL = "/api/v1/"
@@ -78,6 +81,31 @@ def test_get_template_tasks(client, auth_header):
     assert len(result.json) > 0
 
 
+def test_get_template_tasks_cache_invalidation(app, client, auth_header):
+    """Test cached template tasks are served again once a task is changed, leaving the lookups cached."""
+    task_template_data = TestTaskTemplateEnum.task_template1.value
+    file_path = Path("./src/api/templates/task_template/task_template.xlsx").resolve()
+    task_template_data["template_file"] = FileStorage(stream=open(file_path, "rb"), filename="task_template.xlsx")
+    url = urljoin(API_BASE_URL, "task-templates")
+    response = client.post(url, data=task_template_data, headers=auth_header, content_type="multipart/form-data")
+    assert response.status_code == HTTPStatus.CREATED
+    template_id = response.json["id"]
+
+    AppCache.cache.init_app(app, config={"CACHE_TYPE": "SimpleCache"})
+    cache_tag_session(db.session)
+    try:
+        url = urljoin(API_BASE_URL, f"task-templates/{template_id}/tasks")
+        assert client.get(url, headers=auth_header).status_code == HTTPStatus.OK
+        lookup_version = AppCache.tag_version(LOOKUP_CACHE_TAG)
+        task = Task.query.filter(Task.template_id == template_id).first()
+        task.name = "Renamed task"
+        db.session.commit()
+        assert "Renamed task" in [task["name"] for task in client.get(url, headers=auth_header).json]
+        assert AppCache.tag_version(LOOKUP_CACHE_TAG) == lookup_version
+    finally:
+        AppCache.cache.init_app(app, config={"CACHE_TYPE": "NullCache"})
+
+
 def test_get_task_template_details(client, auth_header):
     """Test get task template details"""
     task_template = factory_task_template_model()
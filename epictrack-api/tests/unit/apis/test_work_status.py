@@ -16,11 +16,20 @@
 from http import HTTPStatus
 from urllib.parse import urljoin
 
+import pytest
 from faker import Faker
 from flask import g
+from sqlalchemy import text
+from werkzeug.exceptions import Forbidden
 
-from tests.utilities.factory_scenarios import TestJwtClaims, TestStatus
-from tests.utilities.factory_utils import factory_auth_header, factory_work_model, factory_work_status_model
+from api.models import StaffWorkRole, db
+from api.services import authorisation
+from api.utils.caching import AppCache
+from api.utils.roles import Membership
+from tests.utilities.factory_scenarios import TestJwtClaims, TestStaffInfo, TestStatus
+from tests.utilities.factory_utils import (
+    factory_auth_header, factory_staff_model, factory_work_model, factory_work_status_model)
+from tests.utilities.helpers import count_queries
 
 
 API_BASE_URL = "/api/v1/"
@@ -116,3 +125,58 @@ def test_update_work_status(client, auth_header):
     assert not response_json["is_approved"]
     assert response_json["approved_by"] is None
     assert response_json["approved_date"] is None
+
+
+def test_work_status_team_member_authorisation(client, jwt):
+    """Test team members without the create role can post statuses on their works only."""
+    work = factory_work_model()
+    staff = factory_staff_model({**TestStaffInfo.staff1.value, "email": "member@gov.bc.ca"})
+    member_claims = {
+        **TestJwtClaims.staff_admin_role, "email": staff.email, "realm_access": {"roles": ["staff"]}, "groups": []
+    }
+    headers = factory_auth_header(jwt=jwt, claims=member_claims)
+    g.token_info = member_claims
+    url = urljoin(API_BASE_URL, f'work/{work.id}/statuses')
+
+    result = client.post(url, headers=headers, json=TestStatus.status1.value)
+    assert result.status_code == HTTPStatus.FORBIDDEN
+
+    StaffWorkRole(staff_id=staff.id, work_id=work.id, role_id=Membership.LEAD.value).save()
+    result = client.post(url, headers=headers, json=TestStatus.status1.value)
+    assert result.status_code == HTTPStatus.CREATED
+
+    # The memberships are resolved once, then every check of the request reuses them
+    work_id = work.id
+    g.pop("work_memberships", None)
+    one_of_roles = (Membership.TEAM_MEMBER.name,)
+    with count_queries(db.engine) as statements:
+        for _ in range(3):
+            authorisation.check_auth(one_of_roles=one_of_roles, work_id=work_id)
+    assert len(statements) == 1
+
+
+@pytest.mark.parametrize("shared", [False, True])
+def test_team_membership_cache(app, monkeypatch, shared):
+    """Test the memberships are reused across requests only with a cache shared by all the workers."""
+    work = factory_work_model()
+    staff = factory_staff_model({**TestStaffInfo.staff1.value, "email": "member@gov.bc.ca"})
+    g.token_info = {
+        **TestJwtClaims.staff_admin_role, "email": staff.email, "realm_access": {"roles": ["staff"]}, "groups": []
+    }
+    role = StaffWorkRole(staff_id=staff.id, work_id=work.id, role_id=Membership.LEAD.value).save()
+    one_of_roles = (Membership.TEAM_MEMBER.name,)
+    AppCache.cache.init_app(app, config={"CACHE_TYPE": "SimpleCache"})
+    monkeypatch.setattr(AppCache, "is_shared", staticmethod(lambda: shared))
+    try:
+        g.pop("work_memberships", None)
+        authorisation.check_auth(one_of_roles=one_of_roles, work_id=work.id)
+        # Revoked as by another worker, whose invalidation of the cache tag a per process cache does not see
+        db.session.execute(text("DELETE FROM staff_work_roles WHERE id = :id"), {"id": role.id})
+        g.pop("work_memberships", None)
+        if shared:
+            authorisation.check_auth(one_of_roles=one_of_roles, work_id=work.id)
+        else:
+            with pytest.raises(Forbidden):
+                authorisation.check_auth(one_of_roles=one_of_roles, work_id=work.id)
+    finally:
+        AppCache.cache.init_app(app, config={"CACHE_TYPE": "NullCache"})
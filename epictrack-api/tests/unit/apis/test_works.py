@@ -21,7 +21,14 @@ from io import BytesIO
 from urllib.parse import urljoin
 
 from openpyxl import load_workbook
-
+from sqlalchemy import text
+
+from api.models import Event as EventModel
+from api.models import Staff
+from api.models import Work as WorkModel
+from api.models import db
+from api.models import WorkStateEnum
+from api.models.history import versioned_session
 from api.services.event import EventService
 from api.services.event_configuration import EventConfigurationService
 from api.services.phaseservice import PhaseService
@@ -29,15 +36,18 @@ from api.models.project import Project as ProjectModel
 from api.models.work_type import WorkType as WorkTypeModel
 from api.models.event_template import EventTemplateVisibilityEnum
 from api.services.role import RoleService
-from tests.utilities.factory_scenarios import TestRoleEnum, TestWorkFirstNationEnum, TestWorkInfo, TestWorkNotesEnum
+from api.services.template_graph import TemplateGraphService
+from tests.utilities.factory_scenarios import (
+    TestProjectInfo, TestRoleEnum, TestWorkFirstNationEnum, TestWorkInfo, TestWorkNotesEnum)
 from tests.utilities.factory_utils import (
     factory_first_nation_model,
+    factory_project_model,
     factory_staff_model,
     factory_staff_work_role_model,
     factory_work_first_nation_model,
     factory_work_model,
 )
-from tests.utilities.helpers import prepare_work_payload
+from tests.utilities.helpers import count_queries, prepare_work_payload
 from api.utils import util
 
 
@@ -55,6 +65,23 @@ def test_get_works(client, auth_header):
     assert result.status_code == HTTPStatus.OK
 
 
+def test_get_works_query_count(client, auth_header, db):
+    """Test the number of queries issued by the work list does not depend on the number of works"""
+    url = urljoin(API_BASE_URL, "works")
+    statement_counts = []
+    for work_count in (1, 4):
+        while len(WorkModel.query.all()) < work_count:
+            factory_work_model()
+        db.session.expire_all()
+        with count_queries(db.engine) as statements:
+            response = client.get(url, query_string={"include_indigenous_nations": True}, headers=auth_header)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json) == work_count
+        assert all(work["project"]["name"] and work["work_lead"]["full_name"] for work in response.json)
+        statement_counts.append(len(statements))
+    assert statement_counts[0] == statement_counts[1]
+
+
 def test_get_active_works(client, auth_header):
     """Test get works."""
     url = urljoin(API_BASE_URL, "works?is_active=true")
@@ -88,6 +115,60 @@ def test_create_work(client, auth_header):
     # Scenario 2: Missing required fields
 
 
+def test_create_work_query_count(client, auth_header, db):
+    """Test the phases, configurations and events of a new work are inserted with one statement per table"""
+    url = urljoin(API_BASE_URL, "works")
+    statement_counts = []
+    for work_type_id in (1, 6):
+        payload = prepare_work_payload({**TestWorkInfo.work1.value, "work_type_id": work_type_id, "ea_act_id": 3})
+        TemplateGraphService.find_graph(3, work_type_id)
+        with count_queries(db.engine) as statements:
+            response = client.post(url, json=payload, headers=auth_header)
+        assert response.status_code == HTTPStatus.CREATED
+        inserts = [str(statement).split()[2] for statement in statements if str(statement).startswith("INSERT")]
+        for table in ("work_phases", "event_configurations", "outcome_configurations", "action_configurations",
+                      "events", "calendar_events", "work_calendar_events"):
+            assert inserts.count(table) == 1
+        statement_counts.append(len(statements))
+    assert statement_counts[0] == statement_counts[1]
+
+
+def test_create_work_template_graph(client, auth_header, db):
+    """Test works are created from the compiled templates until the templates change"""
+    url = urljoin(API_BASE_URL, "works")
+    template_tables = ("FROM event_templates", "FROM outcome_templates", "FROM action_templates")
+    graph = TemplateGraphService.find_graph(3, 1)
+    assert graph is TemplateGraphService.find_graph(3, 1)
+    assert all(phase.event_templates for phase in graph.phases)
+    payload = prepare_work_payload({**TestWorkInfo.work1.value, "work_type_id": 1, "ea_act_id": 3})
+    with count_queries(db.engine) as statements:
+        response = client.post(url, json=payload, headers=auth_header)
+    assert response.status_code == HTTPStatus.CREATED
+    # Only the version of the templates is read, in a single statement
+    template_statements = [
+        statement for statement in statements if any(table in str(statement) for table in template_tables)
+    ]
+    assert len(template_statements) == 1
+    assert "count(*)" in str(template_statements[0])
+
+    TemplateGraphService.invalidate()
+    assert TemplateGraphService.find_graph(3, 1) is not graph
+    assert TemplateGraphService.find_graph(3, 1) == graph
+
+
+def test_template_graph_follows_template_changes(db):
+    """Test a template change committed elsewhere, as by another worker, compiles the graph again"""
+    graph = TemplateGraphService.find_graph(3, 1)
+    event_template_id = graph.phases[0].event_templates[0].id
+    db.session.execute(
+        text("UPDATE event_templates SET name = 'Renamed template', updated_at = now() WHERE id = :id"),
+        {"id": event_template_id},
+    )
+    recompiled = TemplateGraphService.find_graph(3, 1)
+    assert recompiled is not graph
+    assert recompiled.phases[0].event_templates[0].name == "Renamed template"
+
+
 def _extract_title(payload):
     project_name = ProjectModel.find_by_id(payload.get('project_id')).name
     work_type = WorkTypeModel.find_by_id(payload.get('work_type_id')).name
@@ -117,6 +198,25 @@ def test_validate_work(client, auth_header):
     assert not response.json["exists"]
 
 
+def test_work_normalized_title(client, auth_header):
+    """Test the normalized title follows the changes of the work and of its project name"""
+    work_ids = _create_dashboard_works(client, auth_header, 1)
+    work = WorkModel.find_by_id(work_ids[0])
+    assert work.normalized_title == work.title.lower()
+
+    work.simple_title = "Amended Work"
+    work.save()
+    assert work.normalized_title == work.title.lower()
+
+    work.project.name = "Renamed Project"
+    work.project.save()
+    db.session.refresh(work)
+    assert work.normalized_title == work.title.lower()
+    url = urljoin(API_BASE_URL, "works/exists")
+    response = client.get(url, query_string={"title": f" {work.title.upper()} "}, headers=auth_header)
+    assert response.json["exists"]
+
+
 def test_get_work_details(client, auth_header):
     """Test get work"""
     work = factory_work_model()
@@ -225,6 +325,51 @@ def test_update_work(client, auth_header):
     assert response_json["simple_title"] == updated_data["simple_title"]
 
 
+def test_update_work_history(client, auth_header, db):
+    """Test the history entries written on work updates"""
+    versioned_session(db.session)
+    work = factory_work_model()
+    updated_data = copy(TestWorkInfo.work1.value)
+    updated_data["project_id"] = work.project_id
+    updated_data["simple_title"] = "Work title updated"
+    url = urljoin(API_BASE_URL, f"works/{work.id}")
+    response = client.put(url, headers=auth_header, json=updated_data)
+    assert response.status_code == HTTPStatus.OK
+
+    history_cls = WorkModel.__history_mapper__.class_
+    history = db.session.query(history_cls).filter(history_cls.id == work.id).order_by(history_cls.pk).all()
+    assert len(history) == 2
+    assert history[0].during.upper is not None
+    assert history[1].during.upper is None
+    assert history[1].simple_title == updated_data["simple_title"]
+
+    # Changes only to the fields excluded from tracking do not create versions
+    staff = Staff.find_by_id(work.work_lead_id)
+    staff_history_cls = Staff.__history_mapper__.class_
+    staff.last_active_at = datetime.utcnow()
+    staff.save()
+    assert db.session.query(staff_history_cls).filter(staff_history_cls.id == staff.id).count() == 1
+
+
+def test_bulk_update_history_query_count(client, auth_header, db):
+    """Test the history of many rows changed in one flush is written with a constant number of statements"""
+    versioned_session(db.session)
+    url = urljoin(API_BASE_URL, "works")
+    response = client.post(url, json=prepare_work_payload(), headers=auth_header)
+    assert response.status_code == HTTPStatus.CREATED
+    events = EventModel.find_by_work_id(response.json["id"]).all()
+    assert len(events) > 1
+
+    statement_counts = []
+    for events_to_update in (events[:1], events):
+        for event in events_to_update:
+            event.notes = f"{event.notes} updated"
+        with count_queries(db.engine) as statements:
+            db.session.flush()
+        statement_counts.append(len(statements))
+    assert statement_counts[0] == statement_counts[1]
+
+
 def test_delete_work(client, auth_header):
     """Test delete work"""
     work = factory_work_model()
@@ -255,6 +400,150 @@ def test_work_dashboard(client, auth_header):
     assert response.json["items"][0]["id"] == work_response_json["id"]
 
 
+def test_work_dashboard_query_count(client, auth_header, db):
+    """Test the number of queries issued by the work dashboard does not depend on the page size"""
+    url = urljoin(API_BASE_URL, "works")
+    for index in range(4):
+        project_data = copy(TestProjectInfo.project1.value)
+        project_data["name"] = f"{project_data['name']} {index}"
+        project_data["abbreviation"] = f"{project_data['abbreviation'][:8]}{index}"
+        payload = prepare_work_payload()
+        payload["project_id"] = factory_project_model(project_data).id
+        payload["simple_title"] = f"{payload['simple_title']} {index}"
+        response = client.post(url, json=payload, headers=auth_header)
+        assert response.status_code == HTTPStatus.CREATED
+
+    url = urljoin(API_BASE_URL, "works/dashboard")
+    statement_counts = []
+    for size in (1, 4):
+        db.session.expire_all()
+        with count_queries(db.engine) as statements:
+            response = client.get(url, query_string={"page": 1, "size": size}, headers=auth_header)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json["items"]) == size
+        statement_counts.append(len(statements))
+    assert statement_counts[0] == statement_counts[1]
+
+
+def _create_dashboard_works(client, auth_header, count):
+    """Create works with distinct projects and titles through the api and return their ids"""
+    url = urljoin(API_BASE_URL, "works")
+    work_ids = []
+    for index in range(count):
+        project_data = copy(TestProjectInfo.project1.value)
+        project_data["name"] = f"{project_data['name']} {index}"
+        project_data["abbreviation"] = f"{project_data['abbreviation'][:8]}{index}"
+        payload = prepare_work_payload()
+        payload["project_id"] = factory_project_model(project_data).id
+        payload["simple_title"] = f"Work {index}"
+        response = client.post(url, json=payload, headers=auth_header)
+        assert response.status_code == HTTPStatus.CREATED
+        work_ids.append(response.json["id"])
+    return work_ids
+
+
+def test_work_dashboard_keyset_pagination(client, auth_header):
+    """Test the dashboard pages through the works by cursor in the requested order"""
+    work_ids = _create_dashboard_works(client, auth_header, 5)
+    url = urljoin(API_BASE_URL, "works/dashboard")
+    # The default sort by start date pages by a date cursor
+    query_string = {"size": 3, "cursor": ""}
+    first_page = client.get(url, query_string=query_string, headers=auth_header).json
+    query_string["cursor"] = first_page["next_cursor"]
+    last_page = client.get(url, query_string=query_string, headers=auth_header).json
+    assert last_page["next_cursor"] is None
+    assert sorted(work["id"] for work in first_page["items"] + last_page["items"]) == sorted(work_ids)
+
+    for sort_order in ("asc", "desc"):
+        query_string = {"size": 2, "sort_key": "simple_title", "sort_order": sort_order, "cursor": ""}
+        titles = []
+        while True:
+            response = client.get(url, query_string=query_string, headers=auth_header)
+            assert response.status_code == HTTPStatus.OK
+            assert response.json["total"] == 5
+            titles += [work["simple_title"] for work in response.json["items"]]
+            if not response.json["next_cursor"]:
+                break
+            query_string["cursor"] = response.json["next_cursor"]
+        assert titles == sorted((f"Work {index}" for index in range(5)), reverse=sort_order == "desc")
+
+    query_string = {"size": 2, "cursor": "", "approximate_total": "true"}
+    response = client.get(url, query_string=query_string, headers=auth_header)
+    assert response.status_code == HTTPStatus.OK
+    assert isinstance(response.json["total"], int)
+    assert len(response.json["items"]) == 2
+
+    # The expanding parameters of the list filters are sent to the planner along with the others
+    work = WorkModel.find_by_id(work_ids[0])
+    query_string = {
+        "size": 2,
+        "cursor": "",
+        "approximate_total": "true",
+        "work_types[]": [work.work_type_id],
+        "teams[]": [work.eao_team_id, work.eao_team_id + 1],
+    }
+    response = client.get(url, query_string=query_string, headers=auth_header)
+    assert response.status_code == HTTPStatus.OK
+    assert isinstance(response.json["total"], int)
+    assert len(response.json["items"]) == 2
+
+    # The search text matches every word of the project names
+    project_name = TestProjectInfo.project1.value["name"]
+    query_string = {"size": 2, "cursor": "", "text": f"{project_name} 3", "approximate_total": "true"}
+    response = client.get(url, query_string=query_string, headers=auth_header)
+    assert response.status_code == HTTPStatus.OK
+    assert [work["id"] for work in response.json["items"]] == [work_ids[3]]
+
+    response = client.get(url, query_string={"sort_key": "report_description"}, headers=auth_header)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    response = client.get(url, query_string={"size": 2, "cursor": "not a cursor"}, headers=auth_header)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_work_dashboard_keyset_pagination_null_tail(client, auth_header):
+    """Test the works with no sort value follow the others on the pages in both directions"""
+    work_ids = _create_dashboard_works(client, auth_header, 5)
+    for work_id in work_ids[1:3]:
+        work = WorkModel.find_by_id(work_id)
+        work.simple_title = None
+        work.save()
+    url = urljoin(API_BASE_URL, "works/dashboard")
+    for sort_order in ("asc", "desc"):
+        query_string = {"size": 2, "sort_key": "simple_title", "sort_order": sort_order, "cursor": ""}
+        items = []
+        while True:
+            response = client.get(url, query_string=query_string, headers=auth_header)
+            assert response.status_code == HTTPStatus.OK
+            items += response.json["items"]
+            if not response.json["next_cursor"]:
+                break
+            query_string["cursor"] = response.json["next_cursor"]
+        titles = ["Work 0", "Work 3", "Work 4"]
+        assert [work["simple_title"] for work in items] == sorted(titles, reverse=sort_order == "desc") + [None, None]
+        null_ids = [work_ids[1], work_ids[2]]
+        assert [work["id"] for work in items[3:]] == sorted(null_ids, reverse=sort_order == "desc")
+
+
+def test_work_dashboard_work_states(client, auth_header):
+    """Test the dashboard lists the ending states of inactive works along with the other active states"""
+    work_ids = _create_dashboard_works(client, auth_header, 3)
+    closed_work = WorkModel.find_by_id(work_ids[0])
+    closed_work.work_state = WorkStateEnum.CLOSED
+    closed_work.is_active = False
+    closed_work.save()
+    suspended_work = WorkModel.find_by_id(work_ids[1])
+    suspended_work.work_state = WorkStateEnum.SUSPENDED
+    suspended_work.is_active = False
+    suspended_work.save()
+
+    url = urljoin(API_BASE_URL, "works/dashboard")
+    query_string = {"work_states[]": [WorkStateEnum.CLOSED.value, WorkStateEnum.IN_PROGRESS.value]}
+    response = client.get(url, query_string=query_string, headers=auth_header)
+    assert response.status_code == HTTPStatus.OK
+    assert sorted(work["id"] for work in response.json["items"]) == [work_ids[0], work_ids[2]]
+    assert response.json["total"] == 2
+
+
 def test_work_resources(client, auth_header):
     """Test work resources"""
     payload = prepare_work_payload()
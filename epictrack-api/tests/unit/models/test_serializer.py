@@ -0,0 +1,87 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test suite of the compiled serializers."""
+
+from api.models import PhaseCode, db
+from api.models.ministry import Ministry
+from api.models.serializer import compile_serializer
+from api.services.code import CodeService
+from tests.utilities.factory_utils import factory_work_model
+from tests.utilities.helpers import count_queries
+
+
+def _walk_as_dict(obj, recursive=True):
+    """Serialize the row the way as_dict did before it was compiled, walking the mapper on each call"""
+    mapper = obj.__mapper__
+    result = {c: getattr(obj, c) for c in dict(mapper.columns).keys()}
+    if recursive:
+        for rel in mapper.relationships:
+            relational_data = getattr(obj, rel.key, None)
+            result[rel.key] = relational_data.as_dict() if relational_data else None
+    return result
+
+
+def _phase_code_as_dict(phase):
+    """Serialize the phase the way its hand written as_dict did"""
+    return {
+        "id": phase.id,
+        "name": phase.name,
+        "sort_order": phase.sort_order,
+        "number_of_days": phase.number_of_days,
+        "legislated": phase.legislated,
+        "work_type": {
+            "id": phase.work_type.id,
+            "name": phase.work_type.name,
+            "sort_order": phase.work_type.sort_order,
+            "report_title": phase.work_type.report_title,
+        },
+        "ea_act": {"id": phase.ea_act.id, "name": phase.ea_act.name},
+        "color": phase.color,
+    }
+
+
+def test_code_values_are_loaded_up_front(session):
+    """Assert the code values are serialized as before without loading their relationships row by row."""
+    db.session.expire_all()
+    phases = PhaseCode.query.filter_by(is_active=True, is_deleted=False).order_by(PhaseCode.sort_order, PhaseCode.id)
+    with count_queries(db.engine) as lazy_statements:
+        expected = [_phase_code_as_dict(phase) for phase in phases]
+    db.session.expire_all()
+    with count_queries(db.engine) as statements:
+        codes = CodeService.find_code_values_by_type("phase_codes")["codes"]
+    assert codes == expected
+    # The phases, their work types and their acts
+    assert len(statements) == 3
+    assert len(statements) < len(lazy_statements)
+
+    ministry = Ministry.query.first()
+    assert ministry.as_dict()["combined"] == f"{ministry.name}-{ministry.abbreviation}"
+
+
+def test_serializer_projects_columns(session):
+    """Assert only the requested columns and nested columns are emitted."""
+    phase = PhaseCode.query.first()
+    serializer = compile_serializer(PhaseCode, ("id", "work_type.name", "name"))
+    assert serializer.dump(phase) == {"id": phase.id, "work_type": {"name": phase.work_type.name}, "name": phase.name}
+    assert compile_serializer(PhaseCode, ("id", "work_type.name", "name")) is serializer
+
+
+def test_serializer_matches_mapper_walk(session):
+    """Assert the compiled serializer gives the same dicts as walking the mapper, over code tables and works."""
+    works = [factory_work_model() for _ in range(10)]
+    for work in works:
+        assert work.as_dict(recursive=False) == _walk_as_dict(work, recursive=False)
+        assert work.as_dict() == _walk_as_dict(work)
+    for phase in PhaseCode.query.all():
+        assert phase.as_dict() == _phase_code_as_dict(phase)
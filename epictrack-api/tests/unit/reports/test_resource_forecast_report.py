@@ -0,0 +1,169 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test suite for the resource forecast report."""
+import random
+from calendar import monthrange
+from datetime import date, datetime, timedelta, timezone
+from urllib.parse import urljoin
+
+from flask import g
+
+from api.models import Event, EventConfiguration, StaffWorkRole, WorkPhase
+from api.models.event_template import EventTemplateVisibilityEnum
+from api.models.event_type import EventTypeEnum
+from api.models.phase_code import PhaseVisibilityEnum
+from api.reports.resource_forecast_report import EAResourceForeCastReport
+from api.utils.color_utils import color_with_opacity
+from tests.utilities.factory_scenarios import TestJwtClaims, TestRoleEnum, TestStaffInfo, TestWorkInfo
+from tests.utilities.factory_utils import factory_auth_header, factory_project_model, factory_staff_model
+from tests.utilities.helpers import count_queries
+
+
+API_BASE_URL = "/api/v1/"
+WORK_COUNT = 500
+MONTH_COUNT = 24
+PHASE_COLORS = ["#54858d", "#da6d65", "#043673", "#4d95d0", "#e7a913", "#6a54a3"]
+
+
+def _month_ends(start: date, count: int):
+    """Return the last day of count months from start"""
+    months = []
+    year, month = start.year, start.month
+    for _ in range(count):
+        months.append(date(year, month, monthrange(year, month)[1]))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def _start_events(work_ids, first_day: date):
+    """Return the start events of the phases of the works ordered by date"""
+    rand = random.Random(42)
+    events = []
+    for work_id in work_ids:
+        start_date = datetime.combine(first_day, datetime.min.time(), tzinfo=timezone.utc)
+        start_date += timedelta(days=rand.randint(-120, 240))
+        for phase in range(rand.randint(0, 15)):
+            events.append({
+                "work_id": work_id,
+                "start_date": start_date,
+                "event_phase": f"Phase {phase}",
+                "phase_color": PHASE_COLORS[phase % len(PHASE_COLORS)],
+            })
+            start_date += timedelta(days=rand.randint(0, 90))
+    return sorted(events, key=lambda x: x["start_date"])
+
+
+def _expected_month_labels(report, works, start_events):
+    """Compute the month labels one work and one month at a time"""
+    expected = {}
+    for work_id in works:
+        work_events = [event for event in start_events if event["work_id"] == work_id]
+        work = {}
+        for index, month in enumerate(report.months[1:]):
+            month_events = sorted(
+                [x for x in work_events if x["start_date"].date() <= month],
+                key=lambda x: x["start_date"],
+            )
+            label = report.month_labels[index]
+            if month_events:
+                work[label] = month_events[-1]["event_phase"]
+                work[f"{label}_color"] = color_with_opacity(month_events[-1]["phase_color"], 50)
+            else:
+                work[label] = ""
+                work[f"{label}_color"] = "#FFFFFF"
+        expected[work_id] = work
+    return expected
+
+
+def test_month_labels_many_works():
+    """Assert the month grid of 500 works over 24 months matches the per month lookup."""
+    report = EAResourceForeCastReport(None, 50)
+    first_day = date(2024, 1, 1)
+    report.months = _month_ends(first_day - timedelta(days=1), MONTH_COUNT + 1)
+    report.month_labels = [f"{month:%b %Y}" for month in report.months[1:]]
+    work_ids = list(range(1, WORK_COUNT + 1))
+    works = {work_id: [{"work_id": work_id}] for work_id in work_ids}
+    start_events = _start_events(work_ids, first_day)
+
+    expected = _expected_month_labels(report, works, start_events)
+    result = report._update_month_labels(works, start_events)  # pylint: disable=protected-access
+
+    assert list(result.keys()) == work_ids
+    for work_id in work_ids:
+        work = dict(result[work_id][0])
+        assert work.pop("work_id") == work_id
+        assert work == expected[work_id]
+
+
+def test_team_members_and_referral_timings_bulk(client, jwt, session):
+    """Assert the team members and referral dates of all the works are fetched with one query each."""
+    staff_user = TestJwtClaims.staff_admin_role
+    headers = factory_auth_header(jwt=jwt, claims=staff_user)
+    g.token_info = staff_user
+    work_ids = [_create_work(client, headers, index) for index in range(3)]
+    last_names = ["Zed", "Adams", "Moore"]
+    for work_id in work_ids:
+        for last_name in last_names:
+            _add_team_member(session, work_id, last_name, TestRoleEnum.OFFICER_ANALYST.value)
+    cairt_lead = _add_team_member(session, work_ids[0], "Lead", TestRoleEnum.FN_CAIRT.value)
+    session.flush()
+    report = EAResourceForeCastReport(None, 50)
+
+    with count_queries(session.get_bind()) as statements:
+        team_members = report._get_works_team_members(work_ids)  # pylint: disable=protected-access
+        referral_timings = report._get_referral_timings(work_ids)  # pylint: disable=protected-access
+    assert len(statements) == 2
+
+    first_name = TestStaffInfo.staff1.value["first_name"]
+    for work_id in work_ids:
+        staffs, _, _, _ = team_members[work_id]
+        assert staffs == [f"{last_name}, {first_name}" for last_name in sorted(last_names)]
+        assert referral_timings[work_id] == _find_referral_date(work_id)
+    assert team_members[work_ids[0]][1] == cairt_lead.full_name
+    assert team_members[work_ids[1]][1] == ""
+
+
+def _create_work(client, headers, index):
+    """Create an assessment work with its phases and events"""
+    staff = factory_staff_model()
+    work_data = dict(TestWorkInfo.assessment_work.value)
+    work_data["simple_title"] = f"{work_data['simple_title']}{index}"
+    work_data["project_id"] = factory_project_model().id
+    work_data["responsible_epd_id"] = staff.id
+    work_data["work_lead_id"] = staff.id
+    work_data["decision_by_id"] = staff.id
+    return client.post(urljoin(API_BASE_URL, "works"), json=work_data, headers=headers).json["id"]
+
+
+def _add_team_member(session, work_id, last_name, role_id):
+    """Add a staff with the given last name and role to the work"""
+    staff = factory_staff_model({**TestStaffInfo.staff1.value, "last_name": last_name})
+    session.add(StaffWorkRole(staff_id=staff.id, work_id=work_id, role_id=role_id))
+    return staff
+
+
+def _find_referral_date(work_id):
+    """Return the referral date of the latest open regular phase of the work"""
+    referrals = [
+        event
+        for event in Event.query.join(EventConfiguration).join(WorkPhase).filter(WorkPhase.work_id == work_id)
+        if event.event_configuration.event_type_id == EventTypeEnum.REFERRAL.value
+        and event.event_configuration.visibility == EventTemplateVisibilityEnum.MANDATORY
+        and event.event_configuration.work_phase.visibility == PhaseVisibilityEnum.REGULAR
+        and event.event_configuration.work_phase.is_active
+        and not event.event_configuration.work_phase.is_completed
+    ]
+    assert referrals
+    latest = max(referrals, key=lambda x: x.event_configuration.work_phase.sort_order)
+    return latest.actual_date or latest.anticipated_date
@@ -0,0 +1,79 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test suite to ensure the hot query paths are served by indexes."""
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from urllib.parse import urljoin
+
+from flask import g
+
+from api.models.event_configuration import EventPositionEnum
+from api.models.history import versioned_session
+from api.schemas.response import EventResponseSchema
+from api.services import ReportService
+from api.services.event import EventService
+from api.services.work_phase import WorkPhase
+from api.utils.index_advisor import capture_statements, find_table_scans
+from tests.utilities.factory_scenarios import TestJwtClaims, TestWorkInfo
+from tests.utilities.factory_utils import (
+    factory_auth_header, factory_project_model, factory_staff_model, factory_staff_work_role_model)
+
+
+API_BASE_URL = '/api/v1/'
+
+
+def test_hot_paths_use_indexes(client, jwt, session):
+    """Assert the queries of the work, milestone, report and insight paths do not scan the hot tables."""
+    # The history rows are written, and their open row closed, by the versioned session
+    versioned_session(session)
+    staff_user = TestJwtClaims.staff_admin_role
+    headers = factory_auth_header(jwt=jwt, claims=staff_user)
+    g.token_info = staff_user
+    staff = factory_staff_model()
+    work_data = dict(TestWorkInfo.assessment_work.value)
+    work_data.update(
+        project_id=factory_project_model().id,
+        responsible_epd_id=staff.id,
+        work_lead_id=staff.id,
+        decision_by_id=staff.id,
+    )
+    work_id = client.post(urljoin(API_BASE_URL, 'works'), json=work_data, headers=headers).json['id']
+    factory_staff_work_role_model(work_id)
+    work_phase_id = WorkPhase.find_by_params({'work_id': work_id})[0].id
+    start_event = next(
+        event
+        for event in EventService.find_events(work_id, work_phase_id)
+        if event.event_position == EventPositionEnum.START.value
+    )
+    event_data = EventResponseSchema().dump(start_event)
+    event_data['anticipated_date'] = (start_event.anticipated_date + timedelta(days=7)).isoformat()
+
+    with capture_statements(session.get_bind()) as statements:
+        client.get(urljoin(API_BASE_URL, f'works/{work_id}'), headers=headers)
+        client.get(urljoin(API_BASE_URL, f'works/{work_id}/phases'), headers=headers)
+        client.get(urljoin(API_BASE_URL, f'works/{work_id}/staff-roles'), headers=headers)
+        client.get(urljoin(API_BASE_URL, 'works/dashboard'), headers=headers)
+        client.get(urljoin(API_BASE_URL, f'milestones/workphases/{work_phase_id}/events'), headers=headers)
+        url = urljoin(API_BASE_URL, f'milestones/events/{start_event.id}?push_events=true')
+        response = client.put(url, json=event_data, headers=headers)
+        client.get(urljoin(API_BASE_URL, f'work/{work_id}/statuses'), headers=headers)
+        client.get(urljoin(API_BASE_URL, f'work/{work_id}/issues'), headers=headers)
+        client.get(urljoin(API_BASE_URL, 'insights/works?group_by=lead'), headers=headers)
+        for report_type in ('ea_resource_forecast', '30-60-90', 'ea_anticipated_schedule'):
+            ReportService.generate_report(report_type, datetime.now(), color_intensity=50)
+    assert statements
+    assert response.status_code == HTTPStatus.OK
+
+    scans = find_table_scans(session.connection(), statements)
+    assert not scans, "\n".join(str(scan) for scan in scans)
@@ -0,0 +1,53 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the start_at compiler.
+
+Test-Suite to ensure that the start_at expressions evaluate as integer arithmetic over the number of days.
+"""
+import pytest
+
+from api.exceptions import UnprocessableEntityError
+from api.utils.start_at import compile_start_at, start_at_days
+
+
+TEST_START_AT_DATA = [
+    ["0", 10, 0],
+    ["-7", 10, -7],
+    ["number_of_days-2", 10, 8],
+    [" number_of_days - 2 ", 3, 1],
+    ["2*(number_of_days+1)-3", 10, 19],
+    ["-number_of_days", 10, -10],
+    ["number_of_days*3+1", 0, 1],
+]
+
+
+@pytest.mark.parametrize("expression,number_of_days,days", TEST_START_AT_DATA)
+def test_start_at(expression, number_of_days, days):
+    """Assert that the compiled expression gives the days of the arithmetic."""
+    assert compile_start_at(expression).days(number_of_days) == days
+
+
+@pytest.mark.parametrize(
+    "expression", ["", "1+", "(1", "1 2", "x", "number_of_days*number_of_days", "__import__('os')"]
+)
+def test_invalid_start_at(expression):
+    """Assert that the expressions out of the grammar are rejected."""
+    with pytest.raises(UnprocessableEntityError):
+        compile_start_at(expression)
+
+
+def test_start_at_days():
+    """Assert that many expressions evaluate at once for the same number of days."""
+    assert start_at_days(["5", "number_of_days-2", "2*number_of_days"], 10).tolist() == [5, 8, 20]
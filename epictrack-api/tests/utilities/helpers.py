@@ -1,6 +1,9 @@
 """Helper functions to generate unit test payloads"""
+from contextlib import contextmanager
 from copy import copy
 
+from sqlalchemy import event
+
 from tests.utilities.factory_scenarios import TestWorkInfo
 from tests.utilities.factory_utils import factory_project_model, factory_staff_model
 
@@ -17,3 +20,18 @@ def prepare_work_payload(work_data: dict = TestWorkInfo.work1.value):
     payload["work_lead_id"] = work_lead.id
     payload["decision_by_id"] = decision_maker.id
     return payload
+
+
+@contextmanager
+def count_queries(engine):
+    """Count the SQL statements executed on the given engine within the block"""
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, *args):  # pylint: disable=unused-argument
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)